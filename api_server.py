@@ -0,0 +1,154 @@
+"""HTTP API for queueing resume analyses, for ATS and other integrations.
+
+Example:
+    python api_server.py --port 8000 --workers 4 --rpm 60
+    curl -F resume=@resume.pdf -F jd="$(cat sample/JD.txt)" http://127.0.0.1:8000/jobs
+    curl http://127.0.0.1:8000/jobs/<job_id>/result
+
+POST /jobs (multipart form: ``resume`` file, ``jd`` text, optional ``mode``
+and ``webhook_url``) answers 202 with a job ID straight away; workers run the
+analysis in the background. GET /jobs/<id> reports the job's status,
+GET /jobs/<id>/result answers 202 until the result is ready, and
+GET /health reports queue counts. A result's ``analysis`` has the schema of
+``parse_gemini_response``.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import uvicorn
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from jobfitai import analyze
+from utils.analysis import ANALYSIS_MODES
+from utils.analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+from utils.extraction_engine import SUPPORTED_EXTENSIONS
+from utils.gemini_client import configure_gemini
+from utils.job_queue import DEFAULT_QUEUE_PATH, JobQueue, JobWorkers, check_webhook_url, webhook_hosts_from_env
+from utils.retry import RateLimiter
+
+# Larger uploads are rejected before they reach the queue
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+def make_analyze_fn(cache=None, rate_limiter=None, max_retries=5, model_caller=None):
+    """``analyze_fn`` for ``JobWorkers``: run the headless pipeline on an uploaded file."""
+    def analyze_job(name, data, jd, mode):
+        upload = io.BytesIO(data)
+        upload.name = name
+        result = analyze(upload, jd, name=name, mode=mode, cache=cache, rate_limiter=rate_limiter,
+                         max_retries=max_retries, model_caller=model_caller)
+        return result.to_dict()
+
+    return analyze_job
+
+def _error(status_code, message):
+    return JSONResponse({"error": message}, status_code=status_code)
+
+def _job_view(job, request):
+    view = {key: job[key] for key in ("id", "status", "name", "mode", "error", "webhook_status",
+                                      "created_at", "started_at", "finished_at")}
+    view["result_url"] = str(request.url_for("job_result", job_id=job["id"]))
+    return view
+
+def create_app(queue, workers=None, webhook_hosts=None):
+    """The ASGI app over ``queue``; ``workers`` (a ``JobWorkers``) are started and stopped with it.
+
+    ``webhook_url`` values are checked with ``check_webhook_url`` against
+    ``webhook_hosts``.
+    """
+    async def submit_job(request):
+        form = await request.form()
+        upload = form.get("resume")
+        jd = form.get("jd")
+        mode = form.get("mode") or "full"
+        webhook_url = form.get("webhook_url") or None
+        if upload is None or not hasattr(upload, "read"):
+            return _error(400, "Attach the resume as a file in the 'resume' field")
+        if not isinstance(jd, str) or not jd.strip():
+            return _error(400, "Send the job description text in the 'jd' field")
+        if mode not in ANALYSIS_MODES:
+            return _error(400, f"mode must be one of: {', '.join(ANALYSIS_MODES)}")
+        if webhook_url is not None:
+            try:
+                # Resolving the host may block
+                await run_in_threadpool(check_webhook_url, webhook_url, webhook_hosts)
+            except ValueError as e:
+                return _error(400, str(e))
+        if not (upload.filename or "").lower().endswith(SUPPORTED_EXTENSIONS):
+            return _error(415, "Unsupported file format. Please upload PDF or Word documents.")
+        data = await upload.read()
+        if len(data) > MAX_UPLOAD_BYTES:
+            return _error(413, f"Resume is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+        job_id = await run_in_threadpool(queue.submit, upload.filename, data, jd, mode, webhook_url)
+        job = await run_in_threadpool(queue.get, job_id)
+        return JSONResponse(_job_view(job, request), status_code=202)
+
+    async def job_status(request):
+        job = await run_in_threadpool(queue.get, request.path_params["job_id"])
+        if job is None:
+            return _error(404, "Unknown job")
+        return JSONResponse(_job_view(job, request))
+
+    async def job_result(request):
+        job = await run_in_threadpool(queue.get, request.path_params["job_id"])
+        if job is None:
+            return _error(404, "Unknown job")
+        if job["status"] == "failed":
+            return _error(500, job["error"])
+        if job["status"] != "done":
+            return JSONResponse({"id": job["id"], "status": job["status"]}, status_code=202)
+        return JSONResponse(dict(job["result"], id=job["id"], status=job["status"]))
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "jobs": await run_in_threadpool(queue.stats)})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        if workers is not None:
+            workers.start()
+        yield
+        if workers is not None:
+            await run_in_threadpool(workers.stop, 5)
+
+    return Starlette(
+        routes=[
+            Route("/jobs", submit_job, methods=["POST"]),
+            Route("/jobs/{job_id}", job_status, methods=["GET"]),
+            Route("/jobs/{job_id}/result", job_result, methods=["GET"], name="job_result"),
+            Route("/health", health, methods=["GET"])
+        ],
+        lifespan=lifespan
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent analyses (default: 4)")
+    parser.add_argument("--rpm", type=int, default=None, help="Maximum model requests per minute")
+    parser.add_argument("--retries", type=int, default=5, help="Retries on rate-limit/5xx errors")
+    parser.add_argument("--queue", default=os.getenv("JOBFITAI_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                        help="SQLite file holding the job queue")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    configure_gemini()
+
+    cache = None if args.no_cache else AnalysisCache(os.getenv("JOBFITAI_CACHE_PATH", DEFAULT_CACHE_PATH))
+    queue = JobQueue(args.queue)
+    webhook_hosts = webhook_hosts_from_env()
+    workers = JobWorkers(queue, make_analyze_fn(cache, RateLimiter(args.rpm), args.retries), workers=args.workers,
+                         webhook_hosts=webhook_hosts)
+    uvicorn.run(create_app(queue, workers, webhook_hosts), host=args.host, port=args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
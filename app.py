@@ -1,51 +1,475 @@
 import streamlit as st
-import google.generativeai as genai
+import io
 import os
 import json
-from dotenv import load_dotenv
-from utils.file_processors import read_file_text
-from utils.prompt_templates import create_analysis_prompt
+from collections import namedtuple
+from jobfitai import call_model, extract, match_jds, parse
+from utils.file_processors import read_file_bytes, hash_file_bytes
+from utils.prompt_templates import create_analysis_prompt, PROMPT_VERSION
 from utils.visualizations import (
     create_match_gauge,
-    create_skills_pie,
-    create_improvement_radar
+    get_insight_figures
 )
-from utils.response_parser import parse_gemini_response
+from utils.analysis_cache import AnalysisCache, make_cache_key, DEFAULT_CACHE_PATH
+from utils.analysis import ANALYSIS_MODES, analysis_flight_stats, analyze_resume_text, make_model_caller
+from utils.jd_profile import get_jd_profile
+from utils.candidate_index import CandidateIndex, DEFAULT_INDEX_PATH
+from utils.jd_library import DEFAULT_LIBRARY_PATH, JDLibrary
+from utils.result_model import Analysis, Importance, load_section
+from utils.prescorer import DEFAULT_PRESCORE_THRESHOLD, prescore_resume, should_escalate
+from utils.batch import screen_resumes, write_results_csv, RESULT_COLUMNS
+from utils.gemini_client import get_client, stream_response, GENERATION_CONFIG
+from utils.stream_parser import IncrementalSectionParser
+from utils.section_planner import plan_sections, run_section_plan
+from utils.incremental import Snapshot, plan_reanalysis, reanalyze
+from utils.model_routing import DEFAULT_POLICY, make_router
+from utils.response_parser import REQUIRED_KEYS
+from utils.retry import RateLimiter
+from utils.startup import initialize, read_asset, warm_up
+from utils.text_compaction import compact_inputs, compact_jd
+from utils import tracing
+from utils.tracing import PhaseMetrics, Trace, debug_enabled, default_sinks
 
-# Load environment variables and configure Gemini AI
-load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+# pandas, Plotly, the document parsers and the Gemini SDK are imported where
+# they are first used, so the first page is drawn without waiting for them
+initialize()
+
+def _pandas():
+    """pandas, imported by the first table drawn rather than on page load."""
+    import pandas
+    return pandas
 
 def get_gemini_response(input):
     try:
-        model = genai.GenerativeModel('gemini-pro')
-        generation_config = genai.types.GenerationConfig(
-            temperature=0,
-            top_p=1,
-            top_k=1,
-            max_output_tokens=2048
-        )
-        
-        # Add a safety prefix to ensure JSON-only response
-        safety_prefix = "Respond ONLY with valid JSON. No other text, explanations, or formatting."
-        full_prompt = safety_prefix + "\n" + input
-        
-        response = model.generate_content(
-            full_prompt,
-            generation_config=generation_config
-        )
-        
-        if not response.text:
-            raise ValueError("Empty response received from Gemini")
-            
-        return response.text.strip()
+        return call_model(input)
     except Exception as e:
         st.error(f"Error in Gemini response: {str(e)}")
         return None
 
+@st.cache_resource
+def get_analysis_cache():
+    return AnalysisCache(os.getenv("JOBFITAI_CACHE_PATH", DEFAULT_CACHE_PATH))
+
+@st.cache_resource
+def get_candidate_index():
+    return CandidateIndex(os.getenv("JOBFITAI_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+@st.cache_resource
+def get_jd_library():
+    return JDLibrary(os.getenv("JOBFITAI_JD_LIBRARY_PATH", DEFAULT_LIBRARY_PATH))
+
+@st.cache_resource
+def get_model_router():
+    """Process-wide tiered router, so its per-tier counters cover every session."""
+    return make_router(call_model)
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide phase metrics across every session's traces."""
+    return PhaseMetrics()
+
+def is_debug_mode():
+    return debug_enabled() or st.query_params.get("debug") == "1"
+
+def new_trace(name):
+    trace = Trace(name, sinks=default_sinks() + [get_metrics()])
+    st.session_state.setdefault('traces', {})[name] = trace
+    return trace
+
+def get_resume_extraction(uploaded_file):
+    """Extract an upload once per session; reruns reuse it until the file changes."""
+    if uploaded_file is None:
+        st.session_state.pop('resume_extraction', None)
+        st.session_state.pop('resume_file_id', None)
+        st.session_state.pop('resume_preview', None)
+        return None
+    extraction = st.session_state.get('resume_extraction')
+    # An upload keeps its file_id across reruns, so its bytes are read and hashed once
+    if extraction is not None and st.session_state.get('resume_file_id') == uploaded_file.file_id:
+        return extraction
+    data = read_file_bytes(uploaded_file)
+    content_hash = hash_file_bytes(data)
+    if extraction is None or extraction.content_hash != content_hash:
+        with new_trace("upload").activate():
+            with tracing.span("upload", file_bytes=len(data)):
+                # Replacing the entry drops the previous file's text from the session
+                extraction = extract(uploaded_file, data=data)
+        st.session_state['resume_extraction'] = extraction
+    st.session_state['resume_file_id'] = uploaded_file.file_id
+    return extraction
+
+# key: the (content_hash, job description) pair the rest was computed from;
+# compacted: compact_inputs' (resume, jd) results; prescore and provisional:
+# the offline keyword match and its typed stand-in Analysis
+ResumePreview = namedtuple("ResumePreview", ["key", "compacted", "prescore", "provisional"])
+
+def get_resume_preview(extraction, jd):
+    """Compact and pre-score the upload against the JD once per pair; reruns reuse the result."""
+    key = (extraction.content_hash, jd)
+    preview = st.session_state.get('resume_preview')
+    if preview is None or preview.key != key:
+        prescore, provisional = prescore_resume(extraction.text, jd)
+        preview = ResumePreview(key, compact_inputs(extraction.text, jd), prescore, Analysis.from_dict(provisional))
+        st.session_state['resume_preview'] = preview
+    return preview
+
+def show_parse_diagnostics(response, parsed, debug=False):
+    """Show the errors and warnings ``parse`` reported, plus the raw and cleaned text in debug mode."""
+    if debug:
+        with st.expander("Debug Information"):
+            st.text("Raw Response:")
+            st.code(response, language='json')
+        if parsed.cleaned is not None:
+            with st.expander("Cleaned Response"):
+                st.code(parsed.cleaned, language='json')
+    for warning in parsed.warnings:
+        st.warning(warning)
+    for error in parsed.errors:
+        st.error(error)
+
+def render_trace_panel():
+    """Per-phase timings of the last upload and analysis, with JSON lines / Prometheus export."""
+    traces = list(st.session_state.get('traces', {}).values())
+    if not traces:
+        return
+    with st.expander("🛠️ Trace"):
+        rows = []
+        for trace in traces:
+            for record in trace.spans:
+                rows.append(dict(trace=trace.name, span=record["span"], seconds=record["seconds"],
+                                 error=record.get("error", ""), **record["attributes"]))
+        pd = _pandas()
+        st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
+        for trace in traces:
+            totals = trace.phase_totals()
+            if totals:
+                st.caption(f"{trace.name} time per phase: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in totals.items()))
+            if trace.counters:
+                st.caption(f"{trace.name}: " + ", ".join(f"{name}={value}" for name, value in trace.counters.items()))
+        flights = get_client().flights.stats()
+        st.caption(f"Model calls (all sessions): {flights['executed']} sent, "
+                   f"{flights['deduplicated']} deduplicated, {flights['in_flight']} in flight")
+        analyses = analysis_flight_stats()
+        st.caption(f"Analyses (all sessions): {analyses['executed']} run, "
+                   f"{analyses['deduplicated']} shared, {analyses['abandoned']} abandoned, {analyses['in_flight']} in flight")
+        routing = get_model_router().stats()
+        for tier, totals in routing["tiers"].items():
+            st.caption(f"Tiered routing, {tier} tier (all sessions): {totals['calls']} calls, {totals['errors']} failed, "
+                       f"{totals['mean_seconds']:.2f}s mean, {totals['input_tokens']:,} + {totals['output_tokens']:,} tokens, "
+                       f"${totals['cost']:.4f}")
+        if routing["routes"]:
+            st.caption("Tiered routes (all sessions): " + ", ".join(f"{route}={n}" for route, n in routing["routes"].items()))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("⬇️ Trace (JSON lines)", "".join(trace.to_jsonl() for trace in traces),
+                               file_name="trace.jsonl", mime="application/x-ndjson")
+        with col2:
+            st.download_button("⬇️ Metrics (Prometheus)", get_metrics().to_prometheus(),
+                               file_name="metrics.prom", mime="text/plain")
+
+IMPORTANCE_ICONS = {Importance.HIGH: "🔴", Importance.MEDIUM: "🟡", Importance.LOW: "🟢"}
+
+# Longer keyword lists are paged, so a large analysis stays a handful of elements per rerun
+KEYWORDS_PER_PAGE = 15
+
+def render_lines(lines, bullet="- "):
+    """Render a list as one markdown element rather than one element per item."""
+    if lines:
+        st.markdown("\n".join(f"{bullet}{line}" for line in lines) if bullet else "  \n".join(lines))
+
+def _turn_page(key, step):
+    st.session_state[key] = st.session_state.get(key, 0) + step
+
+def paginate(items, key, per_page=KEYWORDS_PER_PAGE):
+    """The current page of ``items``, with previous/next buttons when there is more than one page."""
+    pages = -(-len(items) // per_page)
+    if pages <= 1:
+        return items
+    # Clamped, since a new analysis may have fewer pages than the last one
+    page = min(max(st.session_state.get(key, 0), 0), pages - 1)
+    st.session_state[key] = page
+    previous_col, label_col, next_col = st.columns([1, 2, 1])
+    previous_col.button("‹ Previous", key=f"{key}_previous", disabled=page == 0,
+                        on_click=_turn_page, args=(key, -1))
+    label_col.caption(f"{page * per_page + 1}–{min(len(items), (page + 1) * per_page)} of {len(items)}")
+    next_col.button("Next ›", key=f"{key}_next", disabled=page == pages - 1,
+                    on_click=_turn_page, args=(key, 1))
+    return items[page * per_page:(page + 1) * per_page]
+
+# The section renderers take the typed values of utils.result_model
+def render_industry_context(industry_context):
+    st.markdown("### 🏢 Industry Context")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Domain:**", industry_context.domain or "N/A")
+    with col2:
+        st.write("**Role Type:**", industry_context.role_type or "N/A")
+
+def render_match_score(jd_match, key="match_gauge"):
+    st.markdown("### 📊 Match Analysis")
+    with tracing.span("chart_build", chart="match_gauge"):
+        match_fig = create_match_gauge(jd_match)
+    st.plotly_chart(match_fig, width="stretch", key=key)
+
+def render_profile_summary(profile_summary):
+    st.markdown("### 📋 Profile Summary")
+    st.write(profile_summary or "No profile summary available")
+
+def render_keywords_analysis(keywords_analysis, key="keywords"):
+    st.markdown("### 🔑 Keyword Analysis")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### Missing Keywords")
+        missing = paginate(keywords_analysis.missing, f"{key}_missing_page")
+        render_lines([f"{IMPORTANCE_ICONS[kw.importance]} **{kw.keyword}** ({kw.category})" for kw in missing], bullet="")
+
+    with col2:
+        st.markdown("#### Present Keywords")
+        present = paginate(keywords_analysis.present, f"{key}_present_page")
+        render_lines([f"✅ **{kw.keyword}** - {kw.match_context}" for kw in present], bullet="")
+
+# Sections shown on the Resume Analysis tab, in schema (and therefore stream) order
+ANALYSIS_TAB_SECTIONS = {
+    "Industry_Context": render_industry_context,
+    "JD_Match": render_match_score,
+    "Profile_Summary": render_profile_summary,
+    "Keywords_Analysis": render_keywords_analysis
+}
+
+def render_section(key, value, placeholders):
+    """Render one typed section; raw sections from a stream go through ``load_section`` first."""
+    with tracing.span("render", section=key):
+        with placeholders[key].container():
+            ANALYSIS_TAB_SECTIONS[key](value)
+
+def render_analysis_sections(analysis, placeholders, skip=()):
+    for key in ANALYSIS_TAB_SECTIONS:
+        if key not in skip:
+            render_section(key, analysis.section(key), placeholders)
+
+def stream_gemini_analysis(prompt, placeholders):
+    """Stream the analysis, rendering each section as soon as its JSON object is complete.
+
+    Returns the full response text (or None on failure) and the set of
+    sections already rendered from the stream.
+    """
+    parser = IncrementalSectionParser()
+    rendered = set()
+    try:
+        for chunk in stream_response(prompt):
+            for key, value in parser.feed(chunk):
+                if key in ANALYSIS_TAB_SECTIONS:
+                    render_section(key, load_section(key, value), placeholders)
+                    rendered.add(key)
+    except Exception as e:
+        st.error(f"Error in Gemini response: {str(e)}")
+        return None, rendered
+    return parser.text.strip() or None, rendered
+
+def run_sectioned_analysis(text, jd, cache, placeholders):
+    """Run the section plan concurrently, rendering each group's sections as it lands."""
+    rendered = set()
+
+    def render_group(group, result, error):
+        if error is not None:
+            st.warning(f"Could not generate {', '.join(group['sections'])}: {error}")
+        for key, value in result.items():
+            if key in ANALYSIS_TAB_SECTIONS:
+                render_section(key, load_section(key, value), placeholders)
+                rendered.add(key)
+
+    analysis, errors = run_section_plan(text, jd, cache=cache, on_group=render_group)
+    if len(errors) == len(plan_sections()):
+        return None, rendered
+    return analysis, rendered
+
+@st.fragment
+def render_analysis_tab():
+    """The last analysis on the Resume Analysis tab; paging its keywords reruns only this fragment."""
+    analysis = st.session_state['analysis']
+    for key, render in ANALYSIS_TAB_SECTIONS.items():
+        with tracing.span("render", section=key):
+            render(analysis.section(key))
+
+@st.fragment
+def render_insights_tab():
+    analysis = st.session_state['analysis']
+    with tracing.span("chart_build", chart="insights"):
+        figures = get_insight_figures(analysis)
+    match_analysis = analysis.match_analysis
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown("### 🎯 Match Analysis")
+        st.write(match_analysis.reasoning or "No analysis available")
+
+        st.markdown("### 💪 Strength Areas")
+        if match_analysis.strength_areas:
+            render_lines(match_analysis.strength_areas)
+        else:
+            st.info("No specific strengths identified")
+
+    with col2:
+        st.markdown("### 🔄 Areas for Improvement")
+        if match_analysis.improvement_areas:
+            render_lines(match_analysis.improvement_areas)
+
+            # Create and display improvement areas chart
+            improvement_fig = figures.get("improvement_radar")
+            if improvement_fig:
+                st.plotly_chart(improvement_fig, width="stretch")
+        else:
+            st.info("No specific improvement areas identified")
+
+    # Skills Analysis Section with enhanced error handling
+    st.markdown("### 💪 Skills Analysis")
+    required_skills = analysis.role_analysis.required_skills
+    present_skills = analysis.role_analysis.present_skills
+
+    if required_skills and present_skills:
+        skills_fig = figures.get("skills_pie")
+        if skills_fig:
+            st.plotly_chart(skills_fig, width="stretch")
+
+            # Add skills comparison table
+            st.markdown("#### Skills Breakdown")
+            breakdown = []
+            for skill in required_skills:
+                match = figures.skill_matches.get(skill)
+                if match and match.lower() not in skill.lower():
+                    breakdown.append(f"✅ {skill} ({match})")
+                elif match:
+                    breakdown.append(f"✅ {skill}")
+                else:
+                    breakdown.append(f"❌ {skill}")
+            cols = st.columns(2)
+            with cols[0]:
+                st.markdown("**Required Skills**")
+                render_lines(breakdown, bullet="")
+            with cols[1]:
+                st.markdown("**Present Skills**")
+                render_lines([f"✓ {skill}" for skill in present_skills], bullet="")
+    else:
+        st.info("Unable to generate skills analysis due to insufficient data")
+
+    # Resume Enhancement Section
+    st.markdown("### 📝 Resume Enhancement Tips")
+    enhancement = analysis.resume_enhancement
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Industry Alignment")
+        render_lines(enhancement.industry_alignment)
+
+        st.markdown("#### Keyword Placement")
+        render_lines(enhancement.keyword_placement)
+
+    with col2:
+        st.markdown("#### Strategic Tips")
+        render_lines(enhancement.strategic_tips)
+
+        st.markdown("#### Format Suggestions")
+        render_lines(enhancement.format_suggestions)
+
+@st.fragment
+def render_interview_prep_tab():
+    interview_prep = st.session_state['analysis'].interview_prep
+
+    st.markdown("### 🎯 Interview Preparation")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown("#### Industry Knowledge")
+        render_lines(interview_prep.industry_knowledge)
+
+        st.markdown("#### Technical Topics")
+        render_lines(interview_prep.technical_topics)
+
+    with col2:
+        st.markdown("#### Common Questions")
+        render_lines(interview_prep.common_questions)
+
+        st.markdown("#### Practice Tips")
+        render_lines(interview_prep.practice_tips)
+
+    st.markdown("### 📚 Study Resources")
+    render_lines(interview_prep.study_resources)
+
+@st.fragment
+def render_industry_tab():
+    analysis = st.session_state['analysis']
+
+    st.markdown("### 📈 Industry-Specific Metrics")
+    metrics = analysis.industry_metrics
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("#### 🎯 Key Performance Indicators")
+        render_lines(metrics.kpis)
+
+    with col2:
+        st.markdown("#### 📜 Recommended Certifications")
+        render_lines(metrics.certifications)
+
+    with col3:
+        st.markdown("#### 🛠️ Tools & Software")
+        render_lines(metrics.tools)
+
+    st.markdown("### 🚀 Career Growth Opportunities")
+    render_lines(analysis.role_analysis.career_growth)
+
+    st.markdown("### 🌐 Industry Insights")
+    render_lines(analysis.role_analysis.industry_insights)
+
+GENERATION_MODES = ["⚡ Streamed", "🧩 Parallel sections", "⏳ Single request", "🪜 Tiered"]
+
+# Sections each result tab shows; a tiered analysis generates the ones it left
+# pending with the full model when their tab is opened
+TAB_SECTIONS = {
+    "📄 Resume Analysis": tuple(ANALYSIS_TAB_SECTIONS),
+    "📊 Insights": ("Match_Analysis", "Role_Analysis", "Resume_Enhancement"),
+    "🎯 Interview Prep": ("Interview_Prep",),
+    "🏢 Industry Focus": ("Industry_Specific_Metrics", "Role_Analysis")
+}
+
+def describe_route(routed):
+    if routed.first_pass_score is None:
+        return "✨ Analysis Complete! The first pass failed, so the full model analyzed your resume"
+    if routed.pending:
+        return (f"✨ Analysis Complete! The first pass scored a clear-cut {routed.first_pass_score:.0f}% match; "
+                "the full model fills in the other tabs when you open them")
+    return (f"✨ Analysis Complete! The first pass scored {routed.first_pass_score:.0f}%, too close to call, "
+            "so the full model analyzed your resume")
+
+def complete_routed_sections(sections):
+    """Generate the sections a tiered analysis left pending, once a tab that shows them is opened."""
+    routed = st.session_state.get('routed')
+    source = st.session_state.get('analysis_source')
+    if routed is None or source is None or not set(sections).intersection(routed.pending):
+        return
+    try:
+        with new_trace("escalation").activate(), st.spinner("🔄 Generating this tab with the full model..."):
+            routed = get_model_router().complete(routed, source.text, source.jd, sections)
+    except Exception as e:
+        st.error(f"Error in Gemini response: {str(e)}")
+        return
+    st.session_state['routed'] = routed
+    st.session_state['analysis'] = Analysis.from_dict(routed.analysis)
+    st.session_state['analysis_source'] = source._replace(
+        analysis={key: value for key, value in routed.analysis.items() if key not in routed.pending}
+    )
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "css", "style.css")
+
 def load_css():
-    with open('static/styles.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    # Read once per process; the style element still has to be sent on every rerun
+    css = read_asset(CSS_PATH)
+    if css:
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
 
 # Page Configuration
 st.set_page_config(
@@ -62,7 +486,9 @@ st.title("🎯 JobFitAI")
 st.markdown("### Your AI Career Optimization Companion")
 
 # Create main tabs
-tab1, tab2, tab3, tab4 = st.tabs(["📄 Resume Analysis", "📊 Insights", "🎯 Interview Prep", "🏢 Industry Focus"])
+# Switching tabs reruns the script, so the result tabs build their content only while open
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["📄 Resume Analysis", "📊 Insights", "🎯 Interview Prep", "🏢 Industry Focus", "📦 Batch Screening", "🔎 Candidate Search", "🧭 Job Matches"],
+                                                   key="main_tabs", on_change="rerun")
 
 with tab1:
     col1, col2 = st.columns([1, 1])
@@ -77,225 +503,339 @@ with tab1:
     with col2:
         jd = st.text_area("Paste the Job Description", height=200)
 
-    if uploaded_file:
+    extraction = get_resume_extraction(uploaded_file)
+    preview = get_resume_preview(extraction, jd) if extraction and jd else None
+    compacted = preview.compacted if preview else None
+
+    if extraction:
         with st.expander("📄 Resume Preview"):
-            resume_text = read_file_text(uploaded_file)
-            st.text(resume_text)
+            pages = extraction.page_count if extraction.page_count is not None else "n/a"
+            st.caption(f"Pages: {pages} · Extracted in {extraction.extraction_time:.2f}s")
+            if compacted:
+                resume_tokens, jd_tokens = compacted
+                st.caption(
+                    f"Prompt input: resume {resume_tokens.tokens_before:,} → {resume_tokens.tokens_after:,} tokens, "
+                    f"job description {jd_tokens.tokens_before:,} → {jd_tokens.tokens_after:,} tokens"
+                )
+                if resume_tokens.dropped_sections:
+                    st.info("To fit the token budget, these sections are left out of the analysis: "
+                            + ", ".join(resume_tokens.dropped_sections))
+            if extraction.truncated:
+                st.warning("This document is very long; only the first part was extracted for analysis.")
+            st.text(extraction.text)
+
+    if preview:
+        with st.expander(f"⚡ Instant keyword match: {preview.prescore['score']:.0f}% (offline estimate)"):
+            if not should_escalate(preview.prescore):
+                st.warning("Very little overlap with the job description; the full AI analysis may not be worth running.")
+            render_match_score(preview.provisional.jd_match, key="provisional_match_gauge")
+            render_keywords_analysis(preview.provisional.keywords, key="provisional_keywords")
 
     analyze_button = st.button("🔍 Analyze Resume")
+    generation_mode = st.radio("Generation mode", GENERATION_MODES, horizontal=True)
+    if generation_mode == "🪜 Tiered":
+        routing_band = st.slider(
+            "Escalate match scores between",
+            0, 100, tuple(int(bound) for bound in DEFAULT_POLICY.ambiguous_band),
+            help="A fast model (or the offline keyword scorer) scores the resume first; scores in this range "
+                 "are too close to call and get the full analysis from the larger model"
+        )
+    previous = st.session_state.get('analysis_source')
+    incremental = previous is not None and st.checkbox(
+        "♻️ Only re-analyze what changed",
+        value=True,
+        help="Compare the resume and job description with the last analysis and re-request only the sections the edits affect"
+    )
 
     if analyze_button and uploaded_file and jd:
-        with st.spinner("🔄 Analyzing your resume... Please wait..."):
-            try:
-                text = read_file_text(uploaded_file)
-                response = get_gemini_response(create_analysis_prompt(text, jd))
-                
-                if response:
-                    analysis = parse_gemini_response(response)
-                    
+        status = st.empty()
+        placeholders = {key: st.empty() for key in ANALYSIS_TAB_SECTIONS}
+        try:
+            with new_trace("analysis").activate():
+                # The model sees the compacted text; the candidate index keeps the full resume
+                text, jd_text = compacted[0].text, compacted[1].text
+                cache = get_analysis_cache()
+                cache_key = make_cache_key(text, jd_text, PROMPT_VERSION, GENERATION_CONFIG)
+                analysis = cache.get(cache_key)
+                cached = analysis is not None
+                response = None
+                parse_failed = False
+                rendered = set()
+                plan = None
+                routed = None
+
+                if analysis is None and incremental:
+                    plan = plan_reanalysis(previous, text, jd_text)
+                    if len(plan.sections) < len(REQUIRED_KEYS):
+                        try:
+                            with st.spinner(f"🔄 Re-analyzing {len(plan.sections)} of {len(REQUIRED_KEYS)} sections..."):
+                                analysis, plan = reanalyze(previous, text, jd_text, call_model=call_model, plan=plan)
+                            cache.set(cache_key, Analysis.from_dict(analysis))
+                        except Exception as e:
+                            st.warning(f"Could not update the previous analysis, running a full one instead: {str(e)}")
+                            plan = None
+                    else:
+                        plan = None
+
+                if analysis is None:
+                    with tracing.span("prompt_build") as attributes:
+                        prompt = create_analysis_prompt(text, jd_text)
+                        attributes["prompt_chars"] = len(prompt)
+                    if generation_mode == "⚡ Streamed":
+                        status.info("🔄 Analyzing your resume... results appear below as they are generated")
+                        response, rendered = stream_gemini_analysis(prompt, placeholders)
+                    elif generation_mode == "🧩 Parallel sections":
+                        status.info("🔄 Analyzing sections in parallel... results appear below as they complete")
+                        analysis, rendered = run_sectioned_analysis(text, jd_text, cache, placeholders)
+                    elif generation_mode == "🪜 Tiered":
+                        with st.spinner("🔄 Scoring your resume with a quick first pass..."):
+                            router = get_model_router()
+                            routed = router.analyze(text, jd_text, DEFAULT_POLICY._replace(ambiguous_band=routing_band))
+                            # This tab is open, so its own sections are not left pending
+                            routed = router.complete(routed, text, jd_text, TAB_SECTIONS["📄 Resume Analysis"])
+                        analysis = routed.analysis
+                        if not routed.pending:
+                            cache.set(cache_key, Analysis.from_dict(analysis))
+                    else:
+                        with st.spinner("🔄 Analyzing your resume... Please wait..."):
+                            response = get_gemini_response(prompt)
+                    if response:
+                        # Validated straight into the typed model; no default response is built
+                        parsed = parse(response, debug=is_debug_mode(), typed=True)
+                        show_parse_diagnostics(response, parsed, debug=is_debug_mode())
+                        analysis = parsed.analysis
+                        parse_failed = bool(parsed.errors)
+                        # Fallback structures mean parsing failed; retry those next time
+                        if not parse_failed:
+                            cache.set(cache_key, analysis)
+
+                if analysis or response:
                     if analysis:
-                        st.session_state['analysis'] = analysis
-                        st.success("✨ Analysis Complete!")
-                        
-                        # Display Industry Context
-                        st.markdown("### 🏢 Industry Context")
-                        industry_context = analysis.get("Industry_Context", {})
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write("**Domain:**", industry_context.get("Domain", "N/A"))
-                        with col2:
-                            st.write("**Role Type:**", industry_context.get("Role_Type", "N/A"))
-                        
-                        # Display Match Score
-                        st.markdown("### 📊 Match Analysis")
-                        match_fig = create_match_gauge(analysis.get("JD_Match", "0%"))
-                        st.plotly_chart(match_fig, use_container_width=True)
-                        
-                        # Display Profile Summary
-                        st.markdown("### 📋 Profile Summary")
-                        st.write(analysis.get("Profile_Summary", "No profile summary available"))
-                        
-                        # Display Keyword Analysis
-                        st.markdown("### 🔑 Keyword Analysis")
-                        keywords_analysis = analysis.get("Keywords_Analysis", {})
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.markdown("#### Missing Keywords")
-                            missing_keywords = keywords_analysis.get("Missing_Keywords", [])
-                            for kw in missing_keywords:
-                                importance_color = {
-                                    "high": "🔴",
-                                    "medium": "🟡",
-                                    "low": "🟢"
-                                }.get(kw.get("importance", "medium"), "⚪")
-                                st.markdown(f"{importance_color} **{kw['keyword']}** ({kw['category']})")
-
-                        with col2:
-                            st.markdown("#### Present Keywords")
-                            present_keywords = keywords_analysis.get("Present_Keywords", [])
-                            for kw in present_keywords:
-                                st.markdown(f"✅ **{kw['keyword']}** - {kw['match_context']}")
+                        # The session keeps only the validated, compact form
+                        result = Analysis.from_dict(analysis)
+                        st.session_state['analysis'] = result
+                        if routed is not None:
+                            st.session_state['routed'] = routed
+                        else:
+                            st.session_state.pop('routed', None)
+                        if not parse_failed:
+                            get_candidate_index().add(uploaded_file.name, extraction.text, result, jd=jd)
+                            # Pending sections are defaults, so a later re-analysis requests them
+                            pending = routed.pending if routed is not None else ()
+                            st.session_state['analysis_source'] = Snapshot(
+                                text, jd_text, {key: value for key, value in result.to_dict().items() if key not in pending}
+                            )
+                        if cached:
+                            status.success("⚡ Loaded a cached analysis for this resume and job description")
+                        elif plan is not None:
+                            updated = ", ".join(plan.sections) or "no sections"
+                            status.success(f"♻️ Re-analyzed only what changed ({updated}); the rest is carried over")
+                        elif routed is not None:
+                            status.success(describe_route(routed))
+                        else:
+                            status.success("✨ Analysis Complete!")
+                        render_analysis_sections(result, placeholders, skip=rendered)
                     else:
-                        st.error("Failed to parse the analysis response")
+                        status.error("Failed to parse the analysis response")
                 else:
-                    st.error("Failed to get response from Gemini")
-                    
-            except Exception as e:
-                st.error(f"❌ An error occurred: {str(e)}")
-                st.error("Please try again with a different resume or job description")
+                    status.error("Failed to get response from Gemini")
+
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
+            st.error("Please try again with a different resume or job description")
+    elif 'analysis' in st.session_state and tab1.open:
+        render_analysis_tab()
+
+    if is_debug_mode():
+        render_trace_panel()
 
 with tab2:
-    if 'analysis' in st.session_state:
-        analysis = st.session_state['analysis']
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown("### 🎯 Match Analysis")
-            match_analysis = analysis.get("Match_Analysis", {})
-            st.write(match_analysis.get("Reasoning", "No analysis available"))
-            
-            st.markdown("### 💪 Strength Areas")
-            strengths = match_analysis.get("Strength_Areas", [])
-            if strengths:
-                for strength in strengths:
-                    st.markdown(f"- {strength}")
-            else:
-                st.info("No specific strengths identified")
-            
-        with col2:
-            st.markdown("### 🔄 Areas for Improvement")
-            improvement_areas = match_analysis.get("Improvement_Areas", [])
-            if improvement_areas:
-                for area in improvement_areas:
-                    st.markdown(f"- {area}")
-                
-                # Create and display improvement areas chart
-                improvement_fig = create_improvement_radar(improvement_areas)
-                if improvement_fig:
-                    st.plotly_chart(improvement_fig, use_container_width=True)
+    if 'analysis' in st.session_state and tab2.open:
+        complete_routed_sections(TAB_SECTIONS["📊 Insights"])
+        render_insights_tab()
+
+with tab3:
+    if 'analysis' in st.session_state and tab3.open:
+        complete_routed_sections(TAB_SECTIONS["🎯 Interview Prep"])
+        render_interview_prep_tab()
+
+with tab4:
+    if 'analysis' in st.session_state and tab4.open:
+        complete_routed_sections(TAB_SECTIONS["🏢 Industry Focus"])
+        render_industry_tab()
+
+with tab5:
+    st.markdown("### 📦 Batch Screening")
+    st.write("Rank many resumes against a single job description.")
+
+    batch_files = st.file_uploader(
+        "Upload Resumes",
+        type=["pdf", "docx", "doc"],
+        accept_multiple_files=True,
+        key="batch_files"
+    )
+    batch_jd = st.text_area("Paste the Job Description", height=200, key="batch_jd")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        batch_workers = st.slider("Concurrent analyses", min_value=1, max_value=16, value=4)
+    with col2:
+        batch_rpm = st.number_input("Max requests per minute (0 = unlimited)", min_value=0, value=60, step=10)
+    with col3:
+        batch_mode = st.selectbox(
+            "Analysis mode",
+            ANALYSIS_MODES,
+            index=ANALYSIS_MODES.index("jd_profile"),
+            help="jd_profile analyzes the job description once and reuses it for every resume"
+        )
+    batch_threshold = st.number_input(
+        "Pre-screen threshold (0 = analyze every resume)",
+        min_value=0.0,
+        max_value=100.0,
+        value=DEFAULT_PRESCORE_THRESHOLD,
+        help="Resumes whose offline keyword match is below this score skip the AI analysis"
+    )
+
+    screen_button = st.button("🚀 Screen Resumes")
+
+    if screen_button and batch_files and batch_jd:
+        cache = get_analysis_cache()
+        rate_limiter = RateLimiter(batch_rpm or None)
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+
+        jd_profile = None
+        if batch_mode == "jd_profile":
+            status.text("Profiling the job description...")
+            try:
+                jd_profile = get_jd_profile(compact_jd(batch_jd).text, make_model_caller(rate_limiter), cache)
+            except Exception as e:
+                st.error(f"❌ Could not analyze the job description: {str(e)}")
+                st.stop()
+
+        def analyze(text, jd_text):
+            return analyze_resume_text(text, jd_text, cache=cache, rate_limiter=rate_limiter,
+                                       mode=batch_mode, jd_profile=jd_profile)
+
+        def report(done, total, row):
+            progress_bar.progress(done / total)
+            status.text(f"Screened {done}/{total}: {row['name']}")
+
+        rows = screen_resumes(
+            [(f.name, f) for f in batch_files],
+            batch_jd,
+            analyze,
+            max_workers=batch_workers,
+            on_progress=report,
+            prescore_threshold=batch_threshold or None
+        )
+        st.session_state['batch_results'] = rows
+        index = get_candidate_index()
+        for row in rows:
+            if row["status"] == "ok":
+                index.add(row["name"], row["text"], row["analysis"], jd=batch_jd)
+        status.text(f"✨ Screened {len(rows)} resumes")
+
+    if 'batch_results' in st.session_state:
+        rows = st.session_state['batch_results']
+        failed = [row for row in rows if row["status"] == "error"]
+        if failed:
+            st.warning(f"{len(failed)} resume(s) could not be analyzed")
+        screened_out = [row for row in rows if row["status"] == "below_threshold"]
+        if screened_out:
+            st.info(f"{len(screened_out)} resume(s) were below the pre-screen threshold and skipped the AI analysis")
+
+        pd = _pandas()
+        st.dataframe(pd.DataFrame(rows, columns=RESULT_COLUMNS), width="stretch", hide_index=True)
+
+        buffer = io.StringIO()
+        write_results_csv(rows, buffer)
+        st.download_button("⬇️ Download CSV", buffer.getvalue(), file_name="batch_screening.csv", mime="text/csv")
+
+with tab6:
+    st.markdown("### 🔎 Candidate Search")
+    index = get_candidate_index()
+    st.write(f"Search the skills of {len(index)} previously analyzed candidates.")
+
+    search_mode = st.radio("Search mode", ["Boolean", "Ranked"], horizontal=True)
+    if search_mode == "Boolean":
+        query = st.text_input("Query", placeholder='kubernetes AND (cka OR ckad) NOT "machine learning"')
+    else:
+        query = st.text_input("Skills (comma separated)", placeholder="python, kubernetes, terraform")
+
+    if query:
+        try:
+            if search_mode == "Boolean":
+                matches = index.summaries(index.search(query))
+                matches.sort(key=lambda match: -match["jd_match"])
             else:
-                st.info("No specific improvement areas identified")
+                ranked = index.rank([skill for skill in query.split(",") if skill.strip()])
+                scores = {candidate_id: (score, skills) for candidate_id, score, skills in ranked}
+                matches = index.summaries([candidate_id for candidate_id, _, _ in ranked])
+                for match in matches:
+                    match["score"], match["matched"] = scores[match["id"]]
+        except ValueError as e:
+            st.error(f"Invalid query: {str(e)}")
+            matches = []
 
-        # Skills Analysis Section with enhanced error handling
-        st.markdown("### 💪 Skills Analysis")
-        role_analysis = analysis.get("Role_Analysis", {})
-        required_skills = role_analysis.get("Required_Skills", [])
-        present_skills = role_analysis.get("Present_Skills", [])
-        
-        if required_skills and present_skills:
-            skills_fig = create_skills_pie(required_skills, present_skills)
-            if skills_fig:
-                st.plotly_chart(skills_fig, use_container_width=True)
-                
-                # Add skills comparison table
-                st.markdown("#### Skills Breakdown")
-                cols = st.columns(2)
-                with cols[0]:
-                    st.markdown("**Required Skills**")
-                    for skill in required_skills:
-                        if skill in present_skills:
-                            st.markdown(f"✅ {skill}")
-                        else:
-                            st.markdown(f"❌ {skill}")
-                with cols[1]:
-                    st.markdown("**Present Skills**")
-                    for skill in present_skills:
-                        st.markdown(f"✓ {skill}")
+        if matches:
+            pd = _pandas()
+            table = pd.DataFrame(matches)
+            table["indexed_at"] = pd.to_datetime(table["indexed_at"], unit="s")
+            table["skills"] = table["skills"].apply(", ".join)
+            if "matched" in table:
+                table["matched"] = table["matched"].apply(", ".join)
+            st.dataframe(table.drop(columns=["id"]), width="stretch", hide_index=True)
         else:
-            st.info("Unable to generate skills analysis due to insufficient data")
+            st.info("No candidates match this query")
 
-        # Resume Enhancement Section
-        st.markdown("### 📝 Resume Enhancement Tips")
-        enhancement = analysis.get("Resume_Enhancement", {})
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### Industry Alignment")
-            alignments = enhancement.get("Industry_Alignment", [])
-            if alignments:
-                for tip in alignments:
-                    st.markdown(f"- {tip}")
-            
-            st.markdown("#### Keyword Placement")
-            placements = enhancement.get("Keyword_Placement", [])
-            if placements:
-                for suggestion in placements:
-                    st.markdown(f"- {suggestion}")
-            
-        with col2:
-            st.markdown("#### Strategic Tips")
-            tips = enhancement.get("Strategic_Tips", [])
-            if tips:
-                for tip in tips:
-                    st.markdown(f"- {tip}")
-            
-            st.markdown("#### Format Suggestions")
-            formats = enhancement.get("Format_Suggestions", [])
-            if formats:
-                for suggestion in formats:
-                    st.markdown(f"- {suggestion}")
+with tab7:
+    st.markdown("### 🧭 Job Matches")
+    library = get_jd_library()
+    st.write(f"Rank {len(library)} stored job descriptions against the resume uploaded in Resume Analysis. "
+             "Ranking is local and instant; only the shortlist you choose goes to the AI analysis.")
 
-with tab3:
-    if 'analysis' in st.session_state:
-        analysis = st.session_state['analysis']
-        interview_prep = analysis.get("Interview_Prep", {})
-        
-        st.markdown("### 🎯 Interview Preparation")
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown("#### Industry Knowledge")
-            for knowledge in interview_prep.get("Industry_Knowledge", []):
-                st.markdown(f"- {knowledge}")
-                
-            st.markdown("#### Technical Topics")
-            for topic in interview_prep.get("Technical_Topics", []):
-                st.markdown(f"- {topic}")
-                
-        with col2:
-            st.markdown("#### Common Questions")
-            for question in interview_prep.get("Common_Questions", []):
-                st.markdown(f"- {question}")
-                
-            st.markdown("#### Practice Tips")
-            for tip in interview_prep.get("Practice_Tips", []):
-                st.markdown(f"- {tip}")
-        
-        st.markdown("### 📚 Study Resources")
-        for resource in interview_prep.get("Study_Resources", []):
-            st.markdown(f"- {resource}")
+    with st.expander("➕ Add job descriptions"):
+        library_files = st.file_uploader("Job description text files", type=["txt", "md"],
+                                         accept_multiple_files=True, key="jd_library_files")
+        if st.button("Add to library") and library_files:
+            ids = library.add_many(
+                (os.path.splitext(f.name)[0], f.getvalue().decode("utf-8", errors="replace")) for f in library_files
+            )
+            st.success(f"Added {len(ids)} job descriptions; {len(library)} in the library")
 
-with tab4:
-    if 'analysis' in st.session_state:
-        analysis = st.session_state['analysis']
-        
-        st.markdown("### 📈 Industry-Specific Metrics")
-        metrics = analysis.get("Industry_Specific_Metrics", {})
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("#### 🎯 Key Performance Indicators")
-            for kpi in metrics.get("Key_Performance_Indicators", []):
-                st.markdown(f"- {kpi}")
-                
-        with col2:
-            st.markdown("#### 📜 Recommended Certifications")
-            for cert in metrics.get("Certifications", []):
-                st.markdown(f"- {cert}")
-                
-        with col3:
-            st.markdown("#### 🛠️ Tools & Software")
-            for tool in metrics.get("Tools_And_Software", []):
-                st.markdown(f"- {tool}")
-        
-        st.markdown("### 🚀 Career Growth Opportunities")
-        for path in analysis.get("Role_Analysis", {}).get("Career_Growth", []):
-            st.markdown(f"- {path}")
-            
-        st.markdown("### 🌐 Industry Insights")
-        for insight in analysis.get("Role_Analysis", {}).get("Industry_Insights", []):
-            st.markdown(f"- {insight}")
\ No newline at end of file
+    if not extraction:
+        st.info("Upload a resume in the Resume Analysis tab to find matching jobs.")
+    elif len(library) == 0:
+        st.info("Add job descriptions to the library to find matching jobs.")
+    else:
+        match_col1, match_col2 = st.columns(2)
+        with match_col1:
+            match_top_k = st.slider("Job descriptions to list", 5, 50, 10)
+        with match_col2:
+            match_analyze = st.number_input("Analyze the best", 0, 10, 3,
+                                            help="Run the full AI analysis on this many of the best matches")
+        analyze_matches = st.button("🔍 Analyze shortlist")
+
+        try:
+            with st.spinner("🔄 Analyzing the best matches..." if analyze_matches else "Ranking..."):
+                matches = match_jds(extraction.text, library, top_k=match_top_k,
+                                    analyze_top=match_analyze if analyze_matches else 0,
+                                    cache=get_analysis_cache())
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
+            matches = []
+
+        rows = []
+        for match, result in matches:
+            row = {"id": match.jd_id, "job": match.title, "similarity": match.similarity}
+            if result is not None:
+                row["jd_match"] = result.score["jd_match"] if result.ok else None
+                row["top_missing"] = result.score["top_missing"] if result.ok else result.errors[0].message
+            rows.append(row)
+        if rows:
+            pd = _pandas()
+            st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
+
+# The page is on screen; load what the first analysis will need in the background
+warm_up(then=get_client)
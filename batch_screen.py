@@ -0,0 +1,166 @@
+"""Screen a folder of resumes against one job description from the command line.
+
+Example:
+    python batch_screen.py resumes/ --jd sample/JD.txt --workers 8 --rpm 60 -o ranked.csv
+    python batch_screen.py --corpus corpus/resumes.jsonl --jd sample/JD.txt -o ranked.csv
+"""
+import argparse
+import importlib.util
+import os
+import re
+import sys
+
+from dotenv import load_dotenv
+
+from utils.analysis import ANALYSIS_MODES, analyze_resume_text, make_model_caller
+from utils.analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+from utils.batch import screen_resumes, write_results_csv
+from utils.candidate_index import CandidateIndex, DEFAULT_INDEX_PATH
+from utils.extraction_engine import iter_corpus
+from utils.gemini_client import configure_gemini
+from utils.jd_profile import get_jd_profile
+from utils.prescorer import DEFAULT_PRESCORE_THRESHOLD
+from utils.retry import RateLimiter
+from utils.text_compaction import DEFAULT_RESUME_TOKEN_BUDGET, compact_jd
+from utils.tracing import JsonlSink, Trace
+from utils.visualizations import FIGURE_NAMES, get_insight_figures
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+def collect_resumes(paths):
+    resumes = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for filename in sorted(files):
+                    if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                        resumes.append((filename, os.path.join(root, filename)))
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            resumes.append((os.path.basename(path), path))
+    return resumes
+
+def write_charts(rows, directory, format="svg"):
+    """Save each screened candidate's charts in ``directory``.
+
+    Images need no Plotly JS; ``format="json"`` saves the Plotly figure JSON
+    for pages that draw it with plotly.js themselves.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for row in rows:
+        if row["status"] != "ok":
+            continue
+        figures = get_insight_figures(row["analysis"])
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.splitext(os.path.basename(row["name"]))[0])
+        for name in FIGURE_NAMES:
+            if format == "json":
+                image = figures.to_json(name)
+                image = image.encode("utf-8") if image is not None else None
+            else:
+                image = figures.to_image(name, format)
+            if image is not None:
+                with open(os.path.join(directory, f"{row['rank']:03d}_{stem}_{name}.{format}"), "wb") as f:
+                    f.write(image)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank many resumes against one job description.")
+    parser.add_argument("resumes", nargs="*", help="Resume files or directories containing them")
+    parser.add_argument("--corpus", help="Screen pre-extracted texts from an ingest_resumes.py corpus")
+    parser.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent analyses (default: 4)")
+    parser.add_argument("--rpm", type=int, default=None, help="Maximum model requests per minute")
+    parser.add_argument("--retries", type=int, default=5, help="Retries on rate-limit/5xx errors")
+    parser.add_argument("--mode", choices=ANALYSIS_MODES, default="full",
+                        help="full: one call per resume; sectioned: parallel per-section calls; "
+                             "jd_profile: analyze the JD once and send resumes with a compact profile; "
+                             "tiered: a fast model first, the full model only for ambiguous matches")
+    parser.add_argument("--prescore-threshold", type=float, default=None,
+                        help=f"Skip the model for resumes whose offline keyword score is below this "
+                             f"(e.g. {DEFAULT_PRESCORE_THRESHOLD:g})")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_RESUME_TOKEN_BUDGET,
+                        help=f"Fit each resume into this many prompt tokens, dropping the sections least "
+                             f"relevant to the JD first (default: {DEFAULT_RESUME_TOKEN_BUDGET}; 0 = no limit)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+    parser.add_argument("--index", action="store_true",
+                        help="Add completed analyses to the searchable candidate index")
+    parser.add_argument("--trace", help="Append per-phase timing spans to this JSON lines file")
+    parser.add_argument("--metrics", help="Write per-phase metrics in Prometheus text format to this file")
+    parser.add_argument("--charts", help="Save each candidate's charts as static images in this directory")
+    parser.add_argument("--chart-format", choices=["svg", "png", "json"], default="svg",
+                        help="Format for --charts: svg, png (needs the kaleido package) or Plotly json (default: svg)")
+    parser.add_argument("-o", "--output", help="Write the ranked table to this CSV file")
+    args = parser.parse_args(argv)
+
+    if args.charts and args.chart_format == "png" and importlib.util.find_spec("kaleido") is None:
+        parser.error(f"--chart-format {args.chart_format} needs the kaleido package (pip install kaleido)")
+
+    load_dotenv()
+    configure_gemini()
+
+    with open(args.jd, encoding="utf-8") as f:
+        jd = f.read()
+
+    extract_fn = None
+    if args.corpus:
+        resumes = [(record["id"], record["text"]) for record in iter_corpus(args.corpus)]
+        extract_fn = str
+    else:
+        resumes = collect_resumes(args.resumes)
+    if not resumes:
+        parser.error("No PDF or Word resumes found")
+
+    cache = None if args.no_cache else AnalysisCache(os.getenv("JOBFITAI_CACHE_PATH", DEFAULT_CACHE_PATH))
+    rate_limiter = RateLimiter(args.rpm)
+
+    trace = Trace("batch", sinks=[JsonlSink(args.trace)] if args.trace else [])
+
+    jd_profile = None
+    if args.mode == "jd_profile":
+        # Computed once up front so the workers never race to build it
+        with trace.activate():
+            jd_profile = get_jd_profile(compact_jd(jd).text, make_model_caller(rate_limiter, args.retries), cache)
+
+    def analyze(text, jd_text):
+        return analyze_resume_text(text, jd_text, cache=cache, rate_limiter=rate_limiter,
+                                   max_retries=args.retries, mode=args.mode, jd_profile=jd_profile,
+                                   token_budget=args.token_budget)
+
+    def report(done, total, row):
+        if row["status"] == "error":
+            detail = f"error: {row['error']}"
+        elif row["status"] == "below_threshold":
+            detail = f"pre-screened out at {row['prescore']:.0f}%"
+        else:
+            detail = f"{row['jd_match']:.0f}%"
+        print(f"[{done}/{total}] {row['name']}: {detail}", file=sys.stderr)
+
+    options = {"extract_fn": extract_fn} if extract_fn else {}
+    with trace.activate():
+        rows = screen_resumes(resumes, jd, analyze, max_workers=args.workers, on_progress=report,
+                              prescore_threshold=args.prescore_threshold, **options)
+
+    if args.trace and trace.counters:
+        JsonlSink(args.trace)({"trace_id": trace.trace_id, "trace": trace.name, "counters": trace.counters})
+
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(trace.to_prometheus())
+
+    if args.index:
+        index = CandidateIndex(os.getenv("JOBFITAI_INDEX_PATH", DEFAULT_INDEX_PATH))
+        for row in rows:
+            if row["status"] == "ok":
+                index.add(row["name"], row["text"], row["analysis"], jd=jd)
+
+    if args.charts:
+        write_charts(rows, args.charts, args.chart_format)
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_results_csv(rows, f)
+    else:
+        write_results_csv(rows, sys.stdout)
+
+    return 0 if any(row["status"] != "error" for row in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Rerun cost of the Streamlit app holding a large analysis: time and elements sent to the browser.
+
+Runs the app headless with Streamlit's AppTest, no API key needed:
+    python benchmarks/bench_app_render.py --scale 25 --runs 10
+    python benchmarks/bench_app_render.py --app path/to/older/app.py   # compare another version
+
+The recorded analysis is scaled up (every list repeated ``--scale`` times)
+and put in the session, then the app is rerun with each result tab
+selected. Payload is the serialized size of every element the rerun
+produced.
+"""
+import argparse
+import contextlib
+import copy
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.stub_model import DEFAULT_RECORDING, load_recorded_analysis
+from utils.result_model import Analysis
+
+TABS = ["📄 Resume Analysis", "📊 Insights", "🎯 Interview Prep", "🏢 Industry Focus"]
+
+def scale_analysis(analysis, scale):
+    """Repeat every list in the analysis ``scale`` times, numbering the copies."""
+    def grow(value):
+        if isinstance(value, dict):
+            return {key: grow(item) for key, item in value.items()}
+        if isinstance(value, list):
+            grown = []
+            for copy_number in range(scale):
+                for item in value:
+                    item = copy.deepcopy(item)
+                    if isinstance(item, dict) and "keyword" in item:
+                        item["keyword"] = f"{item['keyword']} {copy_number}"
+                    elif isinstance(item, str):
+                        item = f"{item} ({copy_number})"
+                    grown.append(item)
+            return grown
+        return value
+    return grow(analysis)
+
+@contextlib.contextmanager
+def app_workdir():
+    """Run the app from a scratch directory, so its caches and indexes stay out of the checkout.
+
+    Nothing here calls the model, but the app builds a client, so it gets the
+    recorded fake model. Older versions of app.py read static/styles.css,
+    which is provided too.
+    """
+    os.environ.setdefault("JOBFITAI_FAKE_MODEL", DEFAULT_RECORDING)
+    workdir = tempfile.mkdtemp(prefix="jobfitai-app-")
+    shutil.copytree(os.path.join(ROOT, "static"), os.path.join(workdir, "static"))
+    shutil.copy(os.path.join(ROOT, "static", "css", "style.css"), os.path.join(workdir, "static", "styles.css"))
+    os.chdir(workdir)
+    try:
+        yield workdir
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def payload(app):
+    """Elements in the rendered tree and their serialized size in bytes."""
+    elements = [node for node in app._tree if not hasattr(node, "children") and node.proto is not None]
+    return len(elements), sum(node.proto.ByteSize() for node in elements)
+
+def measure(app_path, analysis, tab, runs):
+    app = AppTest.from_file(app_path, default_timeout=120)
+    app.session_state["analysis"] = analysis
+    app.session_state["main_tabs"] = tab
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - started) * 1000)
+    elements, size = payload(app)
+    return statistics.median(timings), elements, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--scale", type=int, default=25, help="Times every list in the analysis is repeated")
+    parser.add_argument("--runs", type=int, default=10, help="Timed reruns per tab")
+    args = parser.parse_args()
+
+    analysis = Analysis.from_dict(scale_analysis(load_recorded_analysis(), args.scale))
+    print(f"{len(analysis.keywords.missing)} missing and {len(analysis.keywords.present)} present keywords, "
+          f"median of {args.runs} reruns")
+
+    app_path = os.path.abspath(args.app)
+    with app_workdir():
+        print(f"  {'selected tab':<22}{'rerun ms':>10}{'elements':>10}{'payload KB':>12}")
+        for tab in TABS:
+            milliseconds, elements, size = measure(app_path, analysis, tab, args.runs)
+            print(f"  {tab:<22}{milliseconds:>10.1f}{elements:>10}{size / 1024:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Prompt size before and after resume/JD compaction on a synthetic corpus.
+
+Resumes are shaped like PyPDF2 output (running headers, page footers,
+whitespace runs, hyphenation breaks, repeated blocks), plus real PyPDF2
+extractions of generated PDFs:
+    python benchmarks/bench_compaction.py --resumes 40 --budget 3000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_docs import extracted_resume_text, make_pdf
+from utils.file_processors import extract_document
+from utils.prompt_templates import create_analysis_prompt, estimate_tokens
+from utils.text_compaction import compact_inputs
+
+JD = """Senior Data Engineer
+
+We are looking for a data engineer to build batch and streaming pipelines.
+Requirements: Python, SQL, Spark, Airflow, Kafka, AWS and Terraform.
+Experience with Kubernetes, Docker and CI/CD is a plus.
+Requirements: Python, SQL, Spark, Airflow, Kafka, AWS and Terraform.
+
+Equal opportunity employer.    We value diversity.
+"""
+
+def build_corpus(count, seed=0):
+    corpus = []
+    for i in range(count):
+        if i % 4 == 3:
+            data = make_pdf(1 + i % 5, seed=seed + i)
+            corpus.append(extract_document(f"resume_{i}.pdf", data=data).text)
+        else:
+            corpus.append(extracted_resume_text(1 + i % 4, seed=seed + i))
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=3000, help="Resume token budget")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.resumes)
+    before, after, dropped = [], [], 0
+    started = time.perf_counter()
+    for text in corpus:
+        resume, jd = compact_inputs(text, JD, resume_budget=args.budget)
+        before.append(estimate_tokens(create_analysis_prompt(text, JD)))
+        after.append(estimate_tokens(create_analysis_prompt(resume.text, jd.text)))
+        dropped += len(resume.dropped_sections)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(corpus)} resumes, resume budget {args.budget} tokens")
+    print(f"prompt tokens  mean {statistics.mean(before):8.0f} -> {statistics.mean(after):8.0f} "
+          f"({1 - statistics.mean(after) / statistics.mean(before):.0%} smaller)")
+    print(f"prompt tokens  max  {max(before):8.0f} -> {max(after):8.0f}")
+    print(f"sections dropped to fit the budget: {dropped}")
+    print(f"compaction time: {elapsed / len(corpus) * 1000:.1f} ms per resume")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark: legacy concatenating extraction vs. the streaming extractors.
+
+Run from the repository root:
+    python benchmarks/bench_extraction.py --repeat 5
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+import PyPDF2 as pdf
+
+from benchmarks.synthetic_docs import make_docx, make_pdf
+from utils.file_processors import input_pdf_text, input_word_text
+
+PAGE_COUNTS = [1, 10, 100]
+
+def legacy_pdf_text(uploaded_file):
+    reader = pdf.PdfReader(uploaded_file)
+    text = ""
+    for page in range(len(reader.pages)):
+        page = reader.pages[page]
+        text += str(page.extract_text())
+    return text
+
+def legacy_word_text(uploaded_file):
+    doc = docx.Document(uploaded_file)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+def time_call(fn, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = fn(io.BytesIO(data))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(text)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("pdf", make_pdf, legacy_pdf_text, lambda f: input_pdf_text(f, max_pages=None, max_chars=None)),
+        ("pdf (limits)", make_pdf, None, input_pdf_text),
+        ("docx", make_docx, legacy_word_text, lambda f: input_word_text(f, max_chars=None)),
+        ("docx (limits)", make_docx, None, input_word_text),
+    ]
+    print(f"{'format':<14}{'pages':>6}{'legacy ms':>12}{'stream ms':>12}{'chars':>10}")
+    for label, make, legacy, streaming in cases:
+        for pages in PAGE_COUNTS:
+            data = make(pages)
+            legacy_ms = f"{time_call(legacy, data, args.repeat)[0] * 1000:.1f}" if legacy else "-"
+            stream_s, chars = time_call(streaming, data, args.repeat)
+            print(f"{label:<14}{pages:>6}{legacy_ms:>12}{stream_s * 1000:>12.1f}{chars:>10}")
+
+if __name__ == "__main__":
+    main()
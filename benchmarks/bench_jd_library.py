@@ -0,0 +1,103 @@
+"""Reverse matching: build a JD library and time ranking it for one resume.
+
+Runs offline on synthetic requisitions, no API key needed:
+    python benchmarks/bench_jd_library.py --jds 3000 --queries 200
+
+Reports how long adding, reopening (memory-mapped) and searching the
+library take, and how often a resume written for a requisition ranks that
+requisition in the top k.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_docs import SKILLS, resume_lines
+from utils.jd_library import JDLibrary, embed_text
+
+ROLES = [
+    "Data Engineer", "Backend Engineer", "Frontend Engineer", "Platform Engineer", "ML Engineer",
+    "Data Analyst", "Project Manager", "Salesforce Administrator", "DevOps Engineer", "Java Developer"
+]
+LEVELS = ["Junior", "", "Senior", "Staff", "Lead"]
+DOMAINS = [
+    "payments", "logistics", "healthcare", "retail", "insurance", "adtech", "gaming", "energy",
+    "travel", "telecom", "education", "security", "media", "banking", "manufacturing"
+]
+EXTRA_SKILLS = [
+    "Snowflake", "dbt", "Redshift", "GraphQL", "Redis", "PostgreSQL", "MongoDB", "Elasticsearch",
+    "Azure", "GCP", "Ansible", "Jenkins", "Grafana", "Prometheus", "Pandas", "Scikit-learn",
+    "Power BI", "Looker", "Jira", "Confluence", "Rust", "Scala", "C++", "Node.js", "Vue", "Angular"
+]
+
+def make_jd(seed):
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS + EXTRA_SKILLS, rng.randint(6, 10))
+    role = f"{rng.choice(LEVELS)} {rng.choice(ROLES)}".strip()
+    domain = rng.choice(DOMAINS)
+    text = (f"{role} ({domain}). Join our {domain} team to design and operate production systems.\n"
+            f"Requirements: {rng.randint(2, 10)}+ years with {', '.join(skills[:4])}.\n"
+            f"Nice to have: {', '.join(skills[4:])}.\n"
+            f"You will own {domain} services end to end, mentor engineers and partner with product.")
+    return f"{role} #{seed}", text, skills
+
+def make_resume(jd_skills, seed):
+    """A resume that leans on the requisition's skills, padded with unrelated experience."""
+    rng = random.Random(seed)
+    lines = [f"Experienced engineer skilled in {', '.join(rng.sample(jd_skills, min(5, len(jd_skills))))}."]
+    lines += resume_lines(20, seed)
+    lines.append("SKILLS")
+    lines.append(", ".join(jd_skills + rng.sample(SKILLS, 3)))
+    return "\n".join(lines)
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, default=3000, help="Requisitions in the library")
+    parser.add_argument("--queries", type=int, default=200, help="Resumes to rank the library for")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    jds = [make_jd(seed) for seed in range(args.jds)]
+    with tempfile.TemporaryDirectory(prefix="jobfitai-jds-") as path:
+        started = time.perf_counter()
+        JDLibrary(path).add_many((title, text) for title, text, _ in jds)
+        added = time.perf_counter() - started
+
+        started = time.perf_counter()
+        library = JDLibrary(path)
+        opened = time.perf_counter() - started
+
+        rng = random.Random(0)
+        targets = [rng.randrange(args.jds) for _ in range(args.queries)]
+        resumes = [make_resume(jds[target][2], seed) for seed, target in enumerate(targets)]
+
+        embed_ms = []
+        search_ms = []
+        hits = 0
+        for target, resume in zip(targets, resumes):
+            started = time.perf_counter()
+            embed_text(resume)
+            embed_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            matches = library.search(resume, args.top)
+            search_ms.append((time.perf_counter() - started) * 1000)
+            hits += any(match.jd_id == target for match in matches)
+
+    print(f"{args.jds} job descriptions, {args.queries} resumes")
+    print(f"  add         {added:.2f} s ({added / args.jds * 1000:.2f} ms per JD)")
+    print(f"  reopen      {opened * 1000:.1f} ms")
+    print(f"  embed       p50 {percentile(embed_ms, 0.5):.2f} ms   p99 {percentile(embed_ms, 0.99):.2f} ms")
+    print(f"  search      p50 {percentile(search_ms, 0.5):.2f} ms   p99 {percentile(search_ms, 0.99):.2f} ms "
+          f"(embedding included)")
+    print(f"  recall@{args.top}   {hits / args.queries:.1%} of resumes rank their own requisition in the top {args.top}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Token and latency savings of JD profiling for one requisition screened against many resumes.
+
+Uses the offline stub model, so no API key is needed:
+    python benchmarks/bench_jd_profile.py --resumes 300 --workers 8 --speedup 50
+Reported latencies are rescaled back to real (un-sped-up) seconds.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_model import StubModel
+from benchmarks.synthetic_docs import resume_lines
+from utils.jd_profile import analyze_with_jd_profile, get_jd_profile
+from utils.prompt_templates import create_analysis_prompt
+from utils.response_parser import parse_response_text
+
+JD = """Senior Data Engineer. You will design, build and operate batch and streaming data pipelines on AWS.
+Requirements: 5+ years of Python and SQL, Airflow orchestration, Kafka or Kinesis streaming, Terraform,
+dbt, Redshift or Snowflake, data quality tooling, CI/CD. AWS certification is a plus.
+Responsibilities: own ingestion SLAs, mentor engineers, partner with analytics on data modelling."""
+
+def run(label, analyze, resumes, workers, speedup):
+    latencies = []
+
+    def timed(text):
+        started = time.perf_counter()
+        analyze(text)
+        latencies.append((time.perf_counter() - started) * speedup)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(timed, resumes))
+    wall = (time.perf_counter() - started) * speedup
+    return label, latencies, wall
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--speedup", type=float, default=50.0)
+    args = parser.parse_args()
+
+    resumes = ["\n".join(resume_lines(60, seed=i)) for i in range(args.resumes)]
+
+    full_model = StubModel(speedup=args.speedup)
+    full = run("full prompt", lambda text: parse_response_text(full_model(create_analysis_prompt(text, JD))),
+               resumes, args.workers, args.speedup)
+
+    profiled_model = StubModel(speedup=args.speedup)
+    profile_started = time.perf_counter()
+    profile = get_jd_profile(JD, profiled_model)
+    profile_seconds = (time.perf_counter() - profile_started) * args.speedup
+    profiled = run("jd profile", lambda text: analyze_with_jd_profile(text, JD, profiled_model, profile=profile),
+                   resumes, args.workers, args.speedup)
+
+    print(f"{args.resumes} resumes, {args.workers} workers (one-off JD profile: {profile_seconds:.1f}s)")
+    print(f"{'mode':<12}{'calls':>7}{'input tok':>12}{'output tok':>12}{'p50 s':>8}{'p99 s':>8}{'wall s':>9}")
+    for (label, latencies, wall), model in ((full, full_model), (profiled, profiled_model)):
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{label:<12}{model.calls:>7}{model.input_tokens:>12}{model.output_tokens:>12}"
+              f"{statistics.median(latencies):>8.2f}{p99:>8.2f}{wall:>9.1f}")
+    saved_in = 1 - profiled_model.input_tokens / full_model.input_tokens
+    saved_out = 1 - profiled_model.output_tokens / full_model.output_tokens
+    print(f"input tokens saved: {saved_in:.0%}, output tokens saved: {saved_out:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""End-to-end pipeline benchmark over a synthetic corpus, with a recorded-response model stub.
+
+Runs extraction, prompt building, the model call (a FakeModel replaying the
+recorded analysis behind the shared client, with configurable latency and
+jitter), parsing and the three chart builders for every document, at
+several concurrency levels. No API key is needed:
+    python benchmarks/bench_pipeline.py --latency 0.5 --jitter 0.2 --concurrency 1 4 16
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/pipeline_20260101-120000.json
+
+Reports per-stage latency percentiles, throughput per concurrency level and
+peak RSS, and saves them as JSON (benchmarks/results/ by default) so a later
+run can be compared against it with --compare.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_docs import make_docx, make_pdf
+from jobfitai import call_model
+from utils.fake_model import FakeModel
+from utils.file_processors import read_file_text
+from utils.gemini_client import configure_gemini
+from utils.prompt_templates import create_analysis_prompt
+from utils.response_parser import parse_gemini_response
+from utils.text_compaction import compact_inputs
+from utils.visualizations import create_improvement_radar, create_match_gauge, create_skills_pie
+
+DEFAULT_RECORDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings", "analysis_response.json")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+STAGES = ["extract", "prompt_build", "model_call", "parse", "chart_build"]
+PERCENTILES = [50, 90, 99]
+
+# A metric that gets this much worse than the baseline is flagged by --compare,
+# unless the stage timing moved by less than MIN_REGRESSION_MS (timer noise)
+REGRESSION_THRESHOLD = 0.20
+MIN_REGRESSION_MS = 1.0
+
+JD = """Senior Python Engineer. Build data pipelines and APIs with Python, SQL, AWS and Docker.
+Experience with Airflow, Kafka and Terraform is a plus. Mentor engineers and own services end to end."""
+
+def build_corpus(page_counts, docs_per_size):
+    """Synthetic PDF and Word resumes of each size, as ``(name, bytes)`` pairs."""
+    corpus = []
+    for pages in page_counts:
+        for i in range(docs_per_size):
+            seed = pages * 1000 + i
+            corpus.append((f"resume_{pages}p_{i}.pdf", make_pdf(pages, seed=seed)))
+            corpus.append((f"resume_{pages}p_{i}.docx", make_docx(pages, seed=seed)))
+    return corpus
+
+def run_pipeline(name, data):
+    """Run one document through every stage and return the seconds spent in each."""
+    timings = {}
+
+    started = time.perf_counter()
+    upload = io.BytesIO(data)
+    upload.name = name
+    text = read_file_text(upload)
+    timings["extract"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resume, jd = compact_inputs(text, JD)
+    prompt = create_analysis_prompt(resume.text, jd.text)
+    timings["prompt_build"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    response = call_model(prompt)
+    timings["model_call"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analysis = parse_gemini_response(response).analysis
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    role = analysis.get("Role_Analysis", {})
+    create_match_gauge(analysis.get("JD_Match", "0%"))
+    create_skills_pie(role.get("Required_Skills", []), role.get("Present_Skills", []))
+    create_improvement_radar(analysis.get("Match_Analysis", {}).get("Improvement_Areas", []))
+    timings["chart_build"] = time.perf_counter() - started
+    return timings
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_level(corpus, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        runs = list(executor.map(lambda doc: run_pipeline(*doc), corpus))
+    elapsed = time.perf_counter() - started
+    stages = {}
+    for stage in STAGES:
+        values = [run[stage] * 1000 for run in runs]
+        stages[stage] = {f"p{p}_ms": round(percentile(values, p / 100), 3) for p in PERCENTILES}
+    return {
+        "concurrency": concurrency,
+        "documents": len(corpus),
+        "seconds": round(elapsed, 3),
+        "docs_per_second": round(len(corpus) / elapsed, 3),
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print each metric's change from ``baseline`` and return the regressions beyond ``threshold``."""
+    regressions = []
+    baseline_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline['timestamp']}):")
+    for level in report["levels"]:
+        before = baseline_levels.get(level["concurrency"])
+        if before is None:
+            continue
+        metrics = [("docs_per_second", before["docs_per_second"], level["docs_per_second"], True)]
+        for stage in STAGES:
+            for key in level["stages"][stage]:
+                old = before["stages"].get(stage, {}).get(key)
+                if old is not None:
+                    metrics.append((f"{stage} {key}", old, level["stages"][stage][key], False))
+        for label, old, new, higher_is_better in metrics:
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            noise = not higher_is_better and abs(new - old) < MIN_REGRESSION_MS
+            flag = "  REGRESSION" if worse > threshold and not noise else ""
+            print(f"  c={level['concurrency']:<3} {label:<24}{old:>12.3f} -> {new:<12.3f}{change:+7.1%}{flag}")
+            if flag:
+                regressions.append((level["concurrency"], label, change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10], help="Document sizes in pages")
+    parser.add_argument("--docs-per-size", type=int, default=3, help="PDFs (and as many DOCX) per size")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--recording", default=DEFAULT_RECORDING, help="Recorded response the stub replays")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per stubbed model call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative +/- jitter of the stub's latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results JSON file (default: benchmarks/results/pipeline_<time>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown --compare treats as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    # A tenth of the time goes to the first chunk, the rest is spread over the others
+    template = FakeModel.from_recording(args.recording)
+    chunk_count = max(1, len(template.chunks) - 1)
+    model = FakeModel(template.chunks, first_chunk_delay=args.latency * 0.1,
+                      chunk_delay=args.latency * 0.9 / chunk_count, jitter=args.jitter, seed=args.seed)
+    configure_gemini(model=model)
+
+    corpus = build_corpus(args.pages, args.docs_per_size)
+    print(f"{len(corpus)} documents, {args.latency:.2f}s ± {args.jitter:.0%} per model call")
+
+    levels = []
+    for concurrency in args.concurrency:
+        level = run_level(corpus, concurrency)
+        levels.append(level)
+        print(f"\nconcurrency {concurrency}: {level['docs_per_second']:.2f} docs/s, peak RSS {level['peak_rss_mb']} MB")
+        print(f"  {'stage':<14}" + "".join(f"{f'p{p} ms':>12}" for p in PERCENTILES))
+        for stage in STAGES:
+            print(f"  {stage:<14}" + "".join(f"{level['stages'][stage][f'p{p}_ms']:>12.2f}" for p in PERCENTILES))
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "timestamp": now.isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "pages": args.pages,
+            "docs_per_size": args.docs_per_size,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "seed": args.seed,
+            "model_calls": model.calls
+        },
+        "levels": levels,
+        "peak_rss_mb": peak_rss_mb()
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{now.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Response parsing: legacy clean_json_string vs. the single-pass repair parser.
+
+Runs every case in the malformed-response corpus through both parsers and
+reports how many sections each recovers and how fast:
+    python benchmarks/bench_response_parser.py --repeat 200
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.response_parser import parse_response_sections
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings", "malformed_responses.jsonl")
+
+def legacy_parse(response):
+    """The parser this replaced: slice, blanket replaces, trailing-comma regexes."""
+    json_str = response[response.find('{'):response.rindex('}') + 1]
+    json_str = json_str.replace('\\"', '"')
+    json_str = json_str.replace('\\n', ' ')
+    json_str = re.sub(r',\s*}', '}', json_str)
+    json_str = re.sub(r',\s*]', ']', json_str)
+    return json.loads(json_str)
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def recovered_sections(parse, case):
+    try:
+        parsed = parse(case["response"])
+    except Exception:
+        return 0
+    return sum(1 for key in case["expected_sections"] if key in parsed)
+
+def time_parser(parse, cases, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for case in cases:
+            try:
+                parse(case["response"])
+            except Exception:
+                pass
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    parsers = [("legacy", legacy_parse), ("repair", parse_response_sections)]
+
+    print(f"{'case':<28}{'expected':>9}" + "".join(f"{name:>9}" for name, _ in parsers))
+    totals = {name: 0 for name, _ in parsers}
+    expected_total = 0
+    for case in cases:
+        expected = len(case["expected_sections"])
+        expected_total += expected
+        row = f"{case['case']:<28}{expected:>9}"
+        for name, parse in parsers:
+            recovered = recovered_sections(parse, case)
+            totals[name] += recovered
+            row += f"{recovered:>9}"
+        print(row)
+
+    total_bytes = sum(len(case["response"]) for case in cases) * args.repeat
+    print()
+    for name, parse in parsers:
+        elapsed = time_parser(parse, cases, args.repeat)
+        print(
+            f"{name:<8} recovered {totals[name]}/{expected_total} sections "
+            f"({totals[name] / expected_total:.0%}), "
+            f"{elapsed / (len(cases) * args.repeat) * 1000:.3f} ms/response, "
+            f"{total_bytes / elapsed / 1e6:.1f} MB/s"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Nested analysis dicts vs. the typed Analysis model: memory, serialized size and ranking cost.
+
+Run from the repository root:
+    python benchmarks/bench_result_model.py --count 1000
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_model import load_recorded_analysis
+from utils.response_parser import parse_match_score
+from utils.result_model import Analysis, Importance
+
+def variants(recorded, count):
+    """Distinct copies of the recorded analysis, so nothing is shared between them."""
+    analyses = []
+    for i in range(count):
+        analysis = copy.deepcopy(recorded)
+        analysis["JD_Match"] = f"{i % 100}%"
+        analysis["Profile_Summary"] += f" ({i})"
+        analyses.append(analysis)
+    return analyses
+
+def measure_memory(build):
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, size
+
+def rank_dicts(analyses):
+    """Ranking fields the way batch screening walked the dicts before."""
+    rows = []
+    for analysis in analyses:
+        keywords = analysis.get("Keywords_Analysis", {})
+        missing = keywords.get("Missing_Keywords", []) or []
+        high = [kw for kw in missing if str(kw.get("importance", "")).lower() == "high"]
+        rows.append((-parse_match_score(analysis.get("JD_Match", "0%")), len(high)))
+    return sorted(rows)
+
+def rank_models(analyses):
+    return sorted(
+        (-analysis.jd_match, sum(kw.importance is Importance.HIGH for kw in analysis.keywords.missing))
+        for analysis in analyses
+    )
+
+def timed(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    recorded = load_recorded_analysis()
+    texts = [json.dumps(analysis) for analysis in variants(recorded, args.count)]
+
+    dicts, dict_bytes = measure_memory(lambda: [json.loads(text) for text in texts])
+    models, model_bytes = measure_memory(lambda: [Analysis.from_dict(json.loads(text)) for text in texts])
+
+    parse_seconds = timed(lambda: [Analysis.from_dict(analysis) for analysis in dicts], repeat=3)
+    print(f"{args.count} analyses")
+    print(f"  memory      dicts {dict_bytes / args.count / 1024:7.1f} KB each   "
+          f"Analysis {model_bytes / args.count / 1024:7.1f} KB each")
+    print(f"  validation  {parse_seconds / args.count * 1e6:.1f} us per analysis (one pass at parse time)")
+
+    sample = models[0]
+    print(f"  serialized  indented JSON {len(json.dumps(recorded, indent=4)):,} B   "
+          f"compact JSON {len(sample.to_json()):,} B   zlib {len(sample.to_bytes()):,} B")
+
+    dict_rank = timed(rank_dicts, dicts)
+    model_rank = timed(rank_models, models)
+    print(f"  ranking     dicts {dict_rank * 1000:.2f} ms   Analysis {model_rank * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
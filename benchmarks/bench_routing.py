@@ -0,0 +1,117 @@
+"""Latency and cost of tiered model routing against sending every resume to the full model.
+
+Uses offline stub models with different latency profiles, so no API key is needed:
+    python benchmarks/bench_routing.py --resumes 200 --open-rate 0.3 --speedup 50
+Reported stub model latencies are rescaled back to real (un-sped-up)
+seconds; the local pre-scorer's are measured as they are.
+
+The fast stub answers with a JD match spread evenly over 0-99% (derived from
+the prompt), so the share of resumes escalated follows the ambiguous band.
+A share ``--open-rate`` of users then opens Interview Prep and Industry
+Focus, which the full model generates on demand.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_jd_profile import JD
+from benchmarks.stub_model import StubModel
+from benchmarks.synthetic_docs import resume_lines
+from utils.model_routing import (
+    DEFAULT_POLICY, FAST_TIER_COSTS, FULL_TIER_COSTS, LOCAL_TIER, ModelRouter, Tier
+)
+from utils.prompt_templates import create_analysis_prompt
+from utils.response_parser import parse_response_text
+
+ON_DEMAND_SECTIONS = ["Interview_Prep", "Industry_Specific_Metrics"]
+
+class SpreadScoreStub(StubModel):
+    """``StubModel`` whose JD match varies with the prompt, evenly over 0-99%."""
+
+    def __call__(self, prompt):
+        response = json.loads(super().__call__(prompt))
+        if "JD_Match" in response:
+            response["JD_Match"] = f"{zlib.crc32(prompt.encode('utf-8')) % 100}%"
+        return json.dumps(response, indent=4)
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+def stub_seconds(router):
+    return sum(totals["seconds"] for tier, totals in router.stats()["tiers"].items() if tier != LOCAL_TIER)
+
+def run(router, resumes, open_rate, speedup, seed):
+    """Route every resume, then complete the on-demand tabs for a share of them; returns first-result latencies."""
+    rng = random.Random(seed)
+    latencies = []
+    for text in resumes:
+        waited = stub_seconds(router)
+        started = time.perf_counter()
+        routed = router.analyze(text, JD)
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed + (stub_seconds(router) - waited) * (speedup - 1))
+        if rng.random() < open_rate:
+            router.complete(routed, text, JD, ON_DEMAND_SECTIONS)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--open-rate", type=float, default=0.3,
+                        help="Share of users who open Interview Prep and Industry Focus")
+    parser.add_argument("--band", type=float, nargs=2, default=list(DEFAULT_POLICY.ambiguous_band),
+                        metavar=("LOW", "HIGH"), help="Ambiguous JD match band that escalates")
+    parser.add_argument("--speedup", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    resumes = ["\n".join(resume_lines(60, seed=i)) for i in range(args.resumes)]
+    policy = DEFAULT_POLICY._replace(ambiguous_band=tuple(args.band))
+
+    def full_tier():
+        return Tier("full", StubModel(speedup=args.speedup), *FULL_TIER_COSTS)
+
+    # Full only: one full analysis per resume, every tab generated up front
+    full_model = StubModel(speedup=args.speedup)
+    latencies = []
+    for text in resumes:
+        started = time.perf_counter()
+        parse_response_text(full_model(create_analysis_prompt(text, JD)))
+        latencies.append((time.perf_counter() - started) * args.speedup)
+    full_cost = (full_model.input_tokens * FULL_TIER_COSTS[0] + full_model.output_tokens * FULL_TIER_COSTS[1]) / 1000
+    scenarios = [("full only", latencies, {"tiers": {"full": {
+        "calls": full_model.calls, "mean_seconds": statistics.mean(latencies) / args.speedup,
+        "input_tokens": full_model.input_tokens, "output_tokens": full_model.output_tokens, "cost": full_cost
+    }}, "routes": {}})]
+
+    fast_stub = SpreadScoreStub(first_token_latency=0.25, per_token_latency=0.003, speedup=args.speedup)
+    for label, fast in [("tiered", Tier("fast", fast_stub, *FAST_TIER_COSTS)),
+                        ("tiered, local", Tier(LOCAL_TIER, None, 0.0, 0.0))]:
+        router = ModelRouter(fast, full_tier(), policy)
+        scenarios.append((label, run(router, resumes, args.open_rate, args.speedup, args.seed), router.stats()))
+
+    print(f"{args.resumes} resumes, ambiguous band {args.band[0]:g}-{args.band[1]:g}%, "
+          f"{args.open_rate:.0%} open the on-demand tabs")
+    print(f"{'scenario':<15}{'tier':<7}{'calls':>7}{'mean s':>8}{'input tok':>11}{'output tok':>12}{'cost $':>9}")
+    for label, latencies, stats in scenarios:
+        for tier, totals in stats["tiers"].items():
+            mean_seconds = totals["mean_seconds"] * (1 if tier == LOCAL_TIER else args.speedup)
+            print(f"{label:<15}{tier:<7}{totals['calls']:>7}{mean_seconds:>8.3f}"
+                  f"{totals['input_tokens']:>11}{totals['output_tokens']:>12}{totals['cost']:>9.4f}")
+    print()
+    print(f"{'scenario':<15}{'first result p50 s':>19}{'p99 s':>8}{'total $':>9}  routes")
+    for label, latencies, stats in scenarios:
+        cost = sum(totals["cost"] for totals in stats["tiers"].values())
+        routes = ", ".join(f"{route}={count}" for route, count in stats["routes"].items()) or "-"
+        print(f"{label:<15}{percentile(latencies, 0.5):>19.2f}{percentile(latencies, 0.99):>8.2f}{cost:>9.4f}  {routes}")
+
+if __name__ == "__main__":
+    main()
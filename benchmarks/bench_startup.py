@@ -0,0 +1,101 @@
+"""Cold start of the Streamlit app: time to first paint and per-rerun overhead.
+
+Runs the app headless with Streamlit's AppTest, no API key needed:
+    python benchmarks/bench_startup.py --processes 5
+    python benchmarks/bench_startup.py --app path/to/older/app.py   # compare another version
+
+``--app`` swaps only the script; to compare whole versions (their utils
+import differently too), run this file from a checkout of each.
+
+Each sample is a fresh Python process that has already imported Streamlit
+(as the server has), so first paint is the first script run: importing the
+app's own dependencies, one-time setup and rendering the empty page. It
+also reports which heavy modules the page imported itself and which were
+left to a background warm-up, and, once that has finished, the median of
+the reruns that follow.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEAVY_MODULES = ["google.generativeai", "pandas", "plotly.express", "PyPDF2", "docx"]
+
+class ImportRecorder:
+    """Meta path hook noting the thread that first imports each heavy module; it loads nothing itself."""
+
+    def __init__(self):
+        self.threads = {}
+
+    def find_spec(self, name, path=None, target=None):
+        if name in HEAVY_MODULES and name not in self.threads:
+            self.threads[name] = threading.current_thread()
+        return None
+
+def sample(app_path, reruns):
+    """First run and rerun times of ``app_path`` in this process, which must not have run it yet."""
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.bench_app_render import app_workdir
+
+    recorder = ImportRecorder()
+    sys.meta_path.insert(0, recorder)
+    with app_workdir():
+        app = AppTest.from_file(app_path, default_timeout=120)
+        page_threads = set(threading.enumerate())
+        started = time.perf_counter()
+        app.run()
+        first_paint = (time.perf_counter() - started) * 1000
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        # Threads the script started (a warm-up) finish before reruns are timed
+        background = [thread for thread in threading.enumerate()
+                      if thread not in page_threads and thread.daemon]
+        for thread in background:
+            thread.join()
+        page = [name for name, thread in recorder.threads.items() if thread not in background]
+        deferred = [name for name, thread in recorder.threads.items() if thread in background]
+        timings = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            app.run()
+            timings.append((time.perf_counter() - started) * 1000)
+    return {"first_paint": first_paint, "rerun": statistics.median(timings), "page": page, "deferred": deferred}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--processes", type=int, default=5, help="Fresh processes to sample")
+    parser.add_argument("--reruns", type=int, default=10, help="Timed reruns per process")
+    parser.add_argument("--sample", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    app_path = os.path.abspath(args.app)
+    if args.sample:
+        print(json.dumps(sample(app_path, args.reruns)))
+        return
+
+    samples = []
+    for _ in range(args.processes):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--sample", "--app", app_path, "--reruns", str(args.reruns)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{os.path.relpath(app_path, ROOT)}, median of {args.processes} fresh processes")
+    print(f"  first paint   {statistics.median(s['first_paint'] for s in samples):8.1f} ms")
+    print(f"  rerun         {statistics.median(s['rerun'] for s in samples):8.1f} ms")
+    for label, key in [("imported by the page", "page"), ("warmed up after it", "deferred")]:
+        names = [name for name in HEAVY_MODULES if any(name in s[key] for s in samples)]
+        print(f"  {label:<22}{', '.join(names) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Time-to-first-insight: blocking generation vs. streamed section rendering.
+
+Replays a recorded response through FakeModel, so no API key is needed:
+    python benchmarks/bench_streaming.py --speedup 10
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fake_model import FakeModel
+from utils.stream_parser import IncrementalSectionParser
+
+DEFAULT_RECORDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings", "analysis_response.json")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", default=DEFAULT_RECORDING)
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide recorded delays by this factor")
+    args = parser.parse_args()
+
+    template = FakeModel.from_recording(args.recording)
+    model = FakeModel(
+        template.chunks,
+        chunk_delay=template.chunk_delay / args.speedup,
+        first_chunk_delay=template.first_chunk_delay / args.speedup
+    )
+
+    started = time.perf_counter()
+    model.generate_content("prompt").text
+    blocking = time.perf_counter() - started
+
+    started = time.perf_counter()
+    section_parser = IncrementalSectionParser()
+    section_times = []
+    for chunk in model.generate_content("prompt", stream=True):
+        for key, _ in section_parser.feed(chunk.text):
+            section_times.append((key, time.perf_counter() - started))
+
+    print(f"blocking generation: {blocking:.2f}s until anything can be shown")
+    for key, elapsed in section_times:
+        print(f"  streamed {key:<28} ready at {elapsed:.2f}s")
+    if section_times:
+        print(f"time to first insight: {section_times[0][1]:.2f}s ({blocking / section_times[0][1]:.1f}x sooner)")
+
+if __name__ == "__main__":
+    main()
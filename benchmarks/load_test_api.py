@@ -0,0 +1,146 @@
+"""Load test for the HTTP API: throughput and p50/p99 latency against a stubbed model.
+
+By default the API runs in-process with StubModel answering instead of
+Gemini, so no API key is needed:
+    python benchmarks/load_test_api.py --jobs 200 --concurrency 32 --workers 8 --speedup 20
+To load an API that is already running (e.g. one pointed at stub_server.py):
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8000 --jobs 100
+
+Each job is a distinct synthetic resume, so nothing is served from the
+analysis cache or coalesced.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from api_server import create_app, make_analyze_fn
+from benchmarks.stub_model import StubModel
+from benchmarks.synthetic_docs import make_pdf
+from utils.job_queue import JobQueue, JobWorkers
+
+JD = """Senior Python Engineer. Build data pipelines and APIs with Python, SQL, AWS and Docker.
+Experience with Airflow, Kafka and Terraform is a plus. Mentor engineers and own services end to end."""
+
+POLL_SECONDS = 0.05
+
+def encode_multipart(fields, files):
+    """Encode form ``fields`` and ``files`` ({field: (filename, bytes)}) as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8"))
+    for name, (filename, data) in files.items():
+        header = (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                  "Content-Type: application/octet-stream\r\n\r\n")
+        parts.append(header.encode("utf-8") + data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+def _request(url, data=None, content_type=None):
+    request = urllib.request.Request(url, data=data, method="POST" if data is not None else "GET")
+    if content_type:
+        request.add_header("Content-Type", content_type)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+def run_job(base_url, name, data, mode):
+    """Submit one resume and poll until its result is ready; returns the timings in seconds."""
+    body, content_type = encode_multipart({"jd": JD, "mode": mode}, {"resume": (name, data)})
+    started = time.perf_counter()
+    status, job = _request(f"{base_url}/jobs", body, content_type)
+    submitted = time.perf_counter() - started
+    if status != 202:
+        raise RuntimeError(f"Submit failed with {status}: {job}")
+    while True:
+        status, result = _request(job["result_url"])
+        if status != 202:
+            break
+        time.sleep(POLL_SECONDS)
+    ok = status == 200 and not result.get("errors")
+    return {"submit": submitted, "total": time.perf_counter() - started, "ok": ok}
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+def start_server(workers, speedup, jitter):
+    """Serve the API in this process on a free port, answering from StubModel."""
+    queue = JobQueue(os.path.join(tempfile.mkdtemp(prefix="jobfitai-load-"), "jobs.sqlite3"))
+    model = StubModel(speedup=speedup, jitter=jitter)
+    pool = JobWorkers(queue, make_analyze_fn(model_caller=model), workers=workers, poll_seconds=0.2)
+    server = uvicorn.Server(uvicorn.Config(create_app(queue, pool), host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}", model
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load an already running API instead of starting one")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients submitting and polling at once")
+    parser.add_argument("--workers", type=int, default=8, help="Analysis workers of the in-process API")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic resume")
+    parser.add_argument("--mode", default="full")
+    parser.add_argument("--speedup", type=float, default=20.0, help="Divide the stub's latency by this")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative +/- jitter of the stub's latency")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    server = model = None
+    base_url = args.url
+    if base_url is None:
+        server, thread, base_url, model = start_server(args.workers, args.speedup, args.jitter)
+
+    resumes = [(f"candidate_{i:04d}.pdf", make_pdf(args.pages, seed=i)) for i in range(args.jobs)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        timings = list(executor.map(lambda resume: run_job(base_url, resume[0], resume[1], args.mode), resumes))
+    elapsed = time.perf_counter() - started
+
+    totals = [timing["total"] for timing in timings]
+    submits = [timing["submit"] for timing in timings]
+    report = {
+        "jobs": args.jobs,
+        "failed": sum(not timing["ok"] for timing in timings),
+        "concurrency": args.concurrency,
+        "workers": None if args.url else args.workers,
+        "seconds": round(elapsed, 3),
+        "jobs_per_second": round(args.jobs / elapsed, 2),
+        "submit_p50_ms": round(percentile(submits, 0.5) * 1000, 1),
+        "submit_p99_ms": round(percentile(submits, 0.99) * 1000, 1),
+        "latency_p50_s": round(percentile(totals, 0.5), 3),
+        "latency_p99_s": round(percentile(totals, 0.99), 3),
+        "latency_mean_s": round(statistics.mean(totals), 3),
+        "model_calls": model.calls if model else None
+    }
+    for key, value in report.items():
+        print(f"{key:>16}: {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if server is not None:
+        server.should_exit = True
+        thread.join(10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Deterministic stand-in for the Gemini call used by the offline benchmarks.
+
+The stub reads the JSON schema embedded in a prompt, answers it from a
+recorded analysis (restricted to exactly the requested keys), and sleeps for
+a latency proportional to the output size, mimicking token-by-token decoding.
+"""
+import json
+import os
+import random
+import threading
+import time
+
+from utils.prompt_templates import estimate_tokens
+
+DEFAULT_RECORDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings", "analysis_response.json")
+SCHEMA_MARKER = "exact format shown below"
+
+def load_recorded_analysis(path=DEFAULT_RECORDING):
+    with open(path, encoding="utf-8") as f:
+        recording = json.load(f)
+    text = "".join(recording["chunks"])
+    return json.loads(text[text.index("{"):text.rindex("}") + 1])
+
+def _extract_schema(prompt):
+    start = prompt.index("{", prompt.index(SCHEMA_MARKER))
+    depth = 0
+    for i in range(start, len(prompt)):
+        if prompt[i] == "{":
+            depth += 1
+        elif prompt[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return json.loads(prompt[start:i + 1])
+    raise ValueError("Prompt has no complete JSON schema")
+
+def _answer(schema, recorded):
+    if isinstance(schema, dict) and isinstance(recorded, dict):
+        return {key: _answer(value, recorded.get(key, value)) for key, value in schema.items()}
+    return recorded
+
+class StubModel:
+    """``call_model(prompt)`` replacement with first-token latency plus per-output-token cost."""
+
+    def __init__(self, recorded_analysis=None, first_token_latency=0.8, per_token_latency=0.012,
+                 jitter=0.0, speedup=1.0, seed=0):
+        self.recorded = recorded_analysis or load_recorded_analysis()
+        self.first_token_latency = first_token_latency
+        self.per_token_latency = per_token_latency
+        self.jitter = jitter
+        self.speedup = speedup
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        response = json.dumps(_answer(_extract_schema(prompt), self.recorded), indent=4)
+        output_tokens = estimate_tokens(response)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += estimate_tokens(prompt)
+            self.output_tokens += output_tokens
+            jitter = self._random.uniform(-self.jitter, self.jitter)
+        latency = (self.first_token_latency + self.per_token_latency * output_tokens) * (1 + jitter)
+        time.sleep(max(0.0, latency) / self.speedup)
+        return response
@@ -0,0 +1,135 @@
+"""Local HTTP server speaking the Gemini REST API, for testing without an API key.
+
+Answers generateContent and streamGenerateContent from the recorded analysis
+(see stub_model.py) and can inject rate-limit / server errors to exercise
+the client's retries. Point the app or the CLIs at it with:
+    python benchmarks/stub_server.py --port 8765 --fail-rate 0.2 --speedup 20
+    JOBFITAI_API_ENDPOINT=http://127.0.0.1:8765 python batch_screen.py resumes/ --jd JD.txt
+
+GET /stats reports requests, injected failures and distinct client
+connections, which shows whether the client is reusing connections.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_model import StubModel
+from utils.fake_model import split_into_chunks
+
+INJECTED_ERRORS = [
+    (429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."),
+    (503, "UNAVAILABLE", "The model is overloaded. Please try again later.")
+]
+
+def _candidate(text, finish_reason=None):
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    return {"candidates": [candidate]}
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, model, fail_rate=0.0, seed=0):
+        super().__init__(address, StubHandler)
+        self.model = model
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "failures": 0, "connections": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.stats["connections"] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.startswith("/stats"):
+            with self.server.lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.server.lock:
+            self.server.stats["requests"] += 1
+            fail = self.server.random.random() < self.server.fail_rate
+            if fail:
+                self.server.stats["failures"] += 1
+                code, status, message = self.server.random.choice(INJECTED_ERRORS)
+        if fail:
+            self._send_json(code, {"error": {"code": code, "message": message, "status": status}})
+            return
+
+        prompt = "".join(
+            part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])
+        )
+        try:
+            text = self.server.model(prompt)
+        except ValueError as e:
+            self._send_json(400, {"error": {"code": 400, "message": str(e), "status": "INVALID_ARGUMENT"}})
+            return
+
+        if ":streamGenerateContent" not in self.path:
+            self._send_json(200, _candidate(text, "STOP"))
+            return
+
+        # Streamed responses are one JSON array, sent element by element
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = split_into_chunks(text)
+        for i, chunk in enumerate(chunks):
+            element = json.dumps(_candidate(chunk, "STOP" if i == len(chunks) - 1 else None))
+            self._write_chunk((("[" if i == 0 else ",\r\n") + element).encode("utf-8"))
+        self._write_chunk(b"]")
+        self._write_chunk(b"")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 429/503")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide the simulated generation latency by this")
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), StubModel(speedup=args.speedup), fail_rate=args.fail_rate)
+    print(f"Serving the Gemini REST API stub on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Synthetic resume documents for benchmarks.
+
+PDFs are written by hand (Helvetica text pages) so no PDF authoring library is
+needed; DOCX files are built with python-docx.
+"""
+import io
+import random
+
+SKILLS = [
+    "Python", "SQL", "Kubernetes", "Docker", "AWS", "Terraform", "React", "TypeScript",
+    "Spark", "Airflow", "Machine Learning", "PyTorch", "Tableau", "Excel", "Salesforce",
+    "Project Management", "Agile", "Scrum", "CI/CD", "Linux", "Go", "Java", "Kafka"
+]
+VERBS = ["Led", "Built", "Designed", "Migrated", "Automated", "Optimised", "Delivered", "Owned"]
+
+def resume_lines(line_count, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(line_count):
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        lines.append(f"{rng.choice(VERBS)} initiative {i} using {skills}, improving throughput by {rng.randint(5, 60)}%.")
+    return lines
+
+def _hyphenate(line, rng):
+    """Break a long line mid-word the way PDF text extraction often does."""
+    words = line.split(" ")
+    candidates = [i for i, word in enumerate(words) if len(word) > 7 and word.isalpha()]
+    if not candidates or rng.random() < 0.5:
+        return [line]
+    i = rng.choice(candidates)
+    cut = len(words[i]) // 2
+    return [" ".join(words[:i] + [words[i][:cut] + "-"]), " ".join([words[i][cut:]] + words[i + 1:])]
+
+def extracted_resume_text(page_count, seed=0, name="Jordan Avery"):
+    """Text shaped like PyPDF2 output of a multi-page resume.
+
+    Pages are separated by form feeds and carry a running header and page
+    footer; lines have whitespace runs and mid-word hyphenation breaks, and
+    the skills block is repeated, as in exported templates.
+    """
+    rng = random.Random(seed)
+    sections = [
+        ("PROFESSIONAL SUMMARY", [f"Engineer with {rng.randint(4, 15)} years of experience across "
+                                  f"{', '.join(rng.sample(SKILLS, 4))} and delivery leadership."]),
+        ("EXPERIENCE", resume_lines(page_count * 22, seed)),
+        ("PROJECTS", resume_lines(page_count * 6, seed + 1)),
+        ("SKILLS", [", ".join(rng.sample(SKILLS, 8)), ", ".join(rng.sample(SKILLS, 8))]),
+        ("EDUCATION", ["BSc Computer Science, State University, 2012"]),
+        ("INTERESTS", ["Trail running, photography, chess, community volunteering"]),
+        ("REFERENCES", ["References available upon request."])
+    ]
+    body = []
+    for heading, lines in sections:
+        body.append(heading)
+        for line in lines:
+            padded = line.replace(", ", ",   ") if rng.random() < 0.3 else line
+            body.extend(_hyphenate(padded, rng))
+        if heading == "SKILLS":
+            body.extend(lines)
+        body.append("")
+    per_page = max(1, -(-len(body) // page_count))
+    pages = []
+    for page in range(page_count):
+        lines = body[page * per_page:(page + 1) * per_page]
+        header = f"{name}  |  {name.split()[0].lower()}@example.com  |  +1 555 0100"
+        pages.append("\n".join([header] + lines + [f"Page {page + 1} of {page_count}"]))
+    return "\f".join(pages)
+
+def _escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(page_count, lines_per_page=45, seed=0):
+    """Return the bytes of a text PDF with ``page_count`` pages."""
+    lines = resume_lines(page_count * lines_per_page, seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    page_ids = []
+    for page in range(page_count):
+        page_lines = lines[page * lines_per_page:(page + 1) * lines_per_page]
+        stream = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td", f"(Candidate Resume - Page {page + 1}) Tj", "T*"]
+        stream += [f"({_escape_pdf_text(line)}) Tj T*" for line in page_lines]
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % page_count
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def make_docx(page_count, lines_per_page=45, seed=0):
+    """Return the bytes of a Word resume roughly ``page_count`` pages long, with a table and header."""
+    import docx
+
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Candidate Resume - Confidential"
+    doc.add_heading("Experience", level=1)
+    for line in resume_lines(page_count * lines_per_page, seed):
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "Skills"
+    table.rows[0].cells[1].text = ", ".join(SKILLS)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
@@ -0,0 +1,41 @@
+"""Bulk-extract resumes from folders or zip archives into a JSONL corpus.
+
+Example:
+    python ingest_resumes.py resumes/ archive.zip -o corpus/resumes.jsonl --workers 8 --timeout 20
+"""
+import argparse
+import json
+import sys
+
+from utils.extraction_engine import DEFAULT_TIMEOUT_SECONDS, ingest_documents
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract resume text in parallel into a reusable corpus.")
+    parser.add_argument("paths", nargs="+", help="Resume files, directories or .zip archives")
+    parser.add_argument("-o", "--output", required=True, help="Corpus JSONL file (appended to)")
+    parser.add_argument("--errors", help="Error report JSONL (default: <output>.errors.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="Per-document extraction timeout in seconds")
+    args = parser.parse_args(argv)
+
+    def report_progress(done, total, doc_id):
+        if done % 50 == 0 or done == total:
+            print(f"[{done}/{total}] {doc_id}", file=sys.stderr)
+
+    report = ingest_documents(
+        args.paths,
+        args.output,
+        errors_path=args.errors,
+        max_workers=args.workers,
+        timeout=args.timeout,
+        on_progress=report_progress
+    )
+    errors = report.pop("errors")
+    print(json.dumps(report, indent=2))
+    for error in errors[:20]:
+        print(f"FAILED {error['id']}: {error['error']} {error['message']}", file=sys.stderr)
+    return 1 if report["failed"] and not report["written"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
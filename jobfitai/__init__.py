@@ -0,0 +1,33 @@
+"""Headless JobFitAI: the resume analysis pipeline without any UI.
+
+    from jobfitai import analyze
+    result = analyze("resume.pdf", jd_text)
+    if result.ok:
+        print(result.score["jd_match"])
+    else:
+        print(result.errors)
+
+The stages (``extract``, ``build_prompt``, ``call_model``, ``parse``,
+``score``) can also be called one by one. The model is the shared Gemini
+client configured from the environment (see ``utils.gemini_client``);
+``python -m jobfitai`` runs the same pipeline from the command line.
+``Analysis.from_dict(result.analysis)`` gives the typed, validated form.
+``match_jds`` turns it around: it ranks a ``JDLibrary`` of stored job
+descriptions for one resume and analyzes only the best matches.
+"""
+from jobfitai.engine import (
+    STAGES,
+    AnalysisError,
+    AnalysisResult,
+    analyze,
+    analyze_text,
+    build_prompt,
+    call_model,
+    extract,
+    match_jds,
+    parse,
+    score
+)
+from utils.jd_library import JDLibrary, JDMatch
+from utils.response_parser import parse_analysis
+from utils.result_model import Analysis, Importance
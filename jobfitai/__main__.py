@@ -0,0 +1,61 @@
+"""Analyze resumes against a job description from the command line, without the web app.
+
+Example:
+    python -m jobfitai resume.pdf --jd sample/JD.txt
+    python -m jobfitai a.pdf b.docx --jd sample/JD.txt --json > results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from jobfitai.engine import analyze
+from utils.analysis import ANALYSIS_MODES
+from utils.analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+from utils.gemini_client import configure_gemini
+from utils.text_compaction import DEFAULT_RESUME_TOKEN_BUDGET
+
+def format_result(result):
+    if not result.ok:
+        return f"{result.name}: failed at {result.errors[0].stage}: {result.errors[0].message}"
+    summary = result.score
+    line = (f"{result.name}: {summary['jd_match']:.0f}% match, {summary['present_keywords']} keywords present, "
+            f"{summary['missing_keywords']} missing ({result.seconds:.2f}s)")
+    if summary["top_missing"]:
+        line += f"\n  top missing: {summary['top_missing']}"
+    for warning in result.warnings:
+        line += f"\n  warning: {warning}"
+    return line
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jobfitai", description=__doc__.splitlines()[0])
+    parser.add_argument("resumes", nargs="+", help="PDF or Word resumes")
+    parser.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--mode", choices=ANALYSIS_MODES, default="full", help="Analysis mode (default: full)")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_RESUME_TOKEN_BUDGET,
+                        help="Compact each resume to about this many tokens before prompting")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+    parser.add_argument("--json", action="store_true", help="Print one JSON result per line, with the full analysis")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    configure_gemini()
+
+    with open(args.jd, encoding="utf-8") as f:
+        jd = f.read()
+    cache = None if args.no_cache else AnalysisCache(os.getenv("JOBFITAI_CACHE_PATH", DEFAULT_CACHE_PATH))
+
+    failures = 0
+    for path in args.resumes:
+        result = analyze(path, jd, mode=args.mode, cache=cache, token_budget=args.token_budget)
+        failures += not result.ok
+        if args.json:
+            print(json.dumps(result.to_dict(), ensure_ascii=False))
+        else:
+            print(format_result(result))
+    return 1 if failures == len(args.resumes) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import contextvars
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import tracing
+from utils.analysis import ANALYSIS_MODES, analyze_resume_text, make_model_caller
+from utils.batch import summarize_analysis
+from utils.file_processors import extract_document
+from utils.gemini_client import generate_response
+from utils.prompt_templates import create_analysis_prompt
+from utils.response_parser import ResponseParseError, parse_gemini_response
+from utils.text_compaction import DEFAULT_RESUME_TOKEN_BUDGET, compact_inputs
+
+# Pipeline stages, in order; failures name the stage they happened in
+STAGES = ["extract", "prompt_build", "model_call", "parse", "score"]
+
+SCORE_FIELDS = ["jd_match", "present_keywords", "missing_keywords", "missing_high_priority", "top_missing"]
+
+AnalysisError = namedtuple("AnalysisError", ["stage", "message"])
+
+class AnalysisResult(namedtuple("AnalysisResult", ["name", "analysis", "score", "errors", "warnings", "seconds"])):
+    """Outcome of one resume analysis.
+
+    ``analysis`` is the parsed response in the ``parse_gemini_response``
+    schema and ``score`` the ranked-table summary (``SCORE_FIELDS``); both
+    are None when the analysis failed, and ``errors`` holds
+    ``AnalysisError`` values instead of raising.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def to_dict(self):
+        result = self._asdict()
+        result["errors"] = [error._asdict() for error in self.errors]
+        return result
+
+class _ModelCallFailed(Exception):
+    pass
+
+def extract(source, data=None):
+    """Extract a resume's text from a file path or file-like object with a ``name``."""
+    return extract_document(source, data=data)
+
+def build_prompt(text, jd, token_budget=DEFAULT_RESUME_TOKEN_BUDGET):
+    """Compact the resume and JD to the token budget and build the full analysis prompt."""
+    resume, jd_result = compact_inputs(text, jd, resume_budget=token_budget)
+    with tracing.span("prompt_build") as attributes:
+        prompt = create_analysis_prompt(resume.text, jd_result.text)
+        attributes["prompt_chars"] = len(prompt)
+    return prompt
+
+def call_model(prompt, max_retries=None, rate_limiter=None):
+    """Send a prompt to the shared model client and return the response text."""
+    return generate_response(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+
+def parse(response, debug=False, typed=False):
+    """Parse a response into a ``ParsedResponse`` (analysis, errors, warnings), never raising.
+
+    With ``typed`` the analysis is a validated ``Analysis`` rather than a
+    response-schema dict.
+    """
+    return parse_gemini_response(response, debug=debug, typed=typed)
+
+def score(analysis, name=""):
+    """Summary numbers for ranking: JD match and keyword counts."""
+    row = summarize_analysis(name, analysis, 0.0)
+    return {field: row[field] for field in SCORE_FIELDS}
+
+def analyze_text(text, jd, name="", mode="full", cache=None, token_budget=DEFAULT_RESUME_TOKEN_BUDGET,
+                 rate_limiter=None, max_retries=5, model_caller=None, warnings=None):
+    """Analyze already extracted resume text against a JD; returns an ``AnalysisResult``.
+
+    Runs compaction, prompt building, the model call and parsing through
+    ``analyze_resume_text`` (so ``cache`` and the analysis modes work as in
+    the app and batch CLI), then scores the result. Nothing is raised:
+    failures come back in ``errors``. ``model_caller(prompt)`` replaces the
+    shared Gemini client.
+    """
+    started = time.perf_counter()
+    warnings = list(warnings or [])
+    if mode not in ANALYSIS_MODES:
+        error = AnalysisError("prompt_build", f"Unknown analysis mode: {mode}")
+        return AnalysisResult(name, None, None, [error], warnings, 0.0)
+
+    model_caller = model_caller or make_model_caller(rate_limiter, max_retries)
+    model_failures = []
+
+    def guarded_call(prompt):
+        try:
+            return model_caller(prompt)
+        except Exception as e:
+            model_failures.append(e)
+            raise _ModelCallFailed(str(e)) from e
+
+    def failed(stage, error):
+        return AnalysisResult(name, None, None, [AnalysisError(stage, str(error))], warnings,
+                              round(time.perf_counter() - started, 3))
+
+    try:
+        analysis = analyze_resume_text(text, jd, cache=cache, mode=mode, token_budget=token_budget,
+                                       call_model=guarded_call)
+    except _ModelCallFailed as e:
+        return failed("model_call", e)
+    except ResponseParseError as e:
+        return failed("parse", e)
+    except Exception as e:
+        # Sectioned runs report "all sections failed" after their model calls failed
+        return failed("model_call" if model_failures else "prompt_build", e)
+
+    try:
+        summary = score(analysis, name)
+    except Exception as e:
+        return failed("score", e)
+    return AnalysisResult(name, analysis, summary, [], warnings, round(time.perf_counter() - started, 3))
+
+def analyze(source, jd, name=None, **options):
+    """Extract a resume file and analyze it against a JD; returns an ``AnalysisResult``.
+
+    ``source`` is a path or a file-like object with a ``name``; ``options``
+    are passed to ``analyze_text``. Nothing is raised: an unreadable file
+    comes back as an ``extract`` error.
+    """
+    if name is None:
+        name = os.path.basename(str(getattr(source, "name", source)))
+    started = time.perf_counter()
+    try:
+        extraction = extract(source)
+    except Exception as e:
+        error = AnalysisError("extract", str(e))
+        return AnalysisResult(name, None, None, [error], [], round(time.perf_counter() - started, 3))
+    if not extraction.text.strip():
+        error = AnalysisError("extract", "No text could be extracted from the document")
+        return AnalysisResult(name, None, None, [error], [], round(time.perf_counter() - started, 3))
+
+    warnings = ["Only the first part of this very long document was analyzed"] if extraction.truncated else []
+    result = analyze_text(extraction.text, jd, name=name, warnings=warnings, **options)
+    return result._replace(seconds=round(time.perf_counter() - started, 3))
+
+def match_jds(text, library, top_k=10, analyze_top=3, max_workers=4, **options):
+    """Rank a ``JDLibrary``'s job descriptions for one resume text and fully analyze the shortlist.
+
+    The ``top_k`` most similar JDs come from the library's local embeddings,
+    without any model call; only the best ``analyze_top`` of them go through
+    ``analyze_text`` (with ``options``). Returns ``(JDMatch, AnalysisResult)``
+    pairs, best first; JDs that were not analyzed have ``None`` as result.
+    """
+    with tracing.span("jd_search", library_size=len(library)):
+        matches = library.search(text, top_k)
+    shortlist = matches[:max(0, analyze_top)]
+
+    def run(match):
+        return analyze_text(text, library.get(match.jd_id)["text"], name=match.title, **options)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # Each analysis runs in the caller's context so it records into the active trace
+        results = list(executor.map(lambda match: contextvars.copy_context().run(run, match), shortlist))
+    return list(zip(matches, results + [None] * (len(matches) - len(shortlist))))
@@ -0,0 +1,106 @@
+"""Find the stored job descriptions that best fit one resume.
+
+Example:
+    python match_jds.py add requisitions/            # .txt/.md files, or a .jsonl of {"title", "text"}
+    python match_jds.py search resume.pdf --top 20 --analyze 3
+    python match_jds.py remove 42
+
+Search ranks every JD in the library by local embedding similarity (no API
+key or model call needed); --analyze runs the full AI analysis on only the
+best few.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from jobfitai.engine import extract, match_jds
+from utils.analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+from utils.gemini_client import configure_gemini
+from utils.jd_library import DEFAULT_LIBRARY_PATH, JDLibrary
+from utils.retry import RateLimiter
+
+JD_EXTENSIONS = ('.txt', '.md')
+
+def iter_jd_files(paths):
+    """``(title, text)`` for each JD text file, or each record of a JSON lines file."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                yield from iter_jd_files(os.path.join(root, filename) for filename in sorted(files)
+                                         if filename.lower().endswith(JD_EXTENSIONS + ('.jsonl',)))
+        elif path.lower().endswith('.jsonl'):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record.get("title") or record["text"].strip().split("\n")[0][:80], record["text"]
+        elif path.lower().endswith(JD_EXTENSIONS):
+            with open(path, encoding="utf-8") as f:
+                yield os.path.splitext(os.path.basename(path))[0], f.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library", default=os.getenv("JOBFITAI_JD_LIBRARY_PATH", DEFAULT_LIBRARY_PATH),
+                        help="Directory holding the JD library")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add job descriptions to the library")
+    add.add_argument("paths", nargs="+", help="JD text files, directories of them, or JSON lines files")
+
+    remove = commands.add_parser("remove", help="Leave JDs (e.g. closed requisitions) out of searches")
+    remove.add_argument("ids", nargs="+", type=int)
+
+    search = commands.add_parser("search", help="Rank the library's JDs for one resume")
+    search.add_argument("resume", help="PDF or Word resume")
+    search.add_argument("--top", type=int, default=10, help="JDs to list (default: 10)")
+    search.add_argument("--analyze", type=int, default=0, help="Run the full AI analysis on the best N")
+    search.add_argument("--workers", type=int, default=4, help="Concurrent analyses (default: 4)")
+    search.add_argument("--rpm", type=int, default=None, help="Maximum model requests per minute")
+    search.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+    search.add_argument("--json", action="store_true", help="Print one JSON object per JD")
+    args = parser.parse_args(argv)
+
+    library = JDLibrary(args.library)
+    if args.command == "add":
+        started = time.perf_counter()
+        ids = library.add_many(iter_jd_files(args.paths))
+        print(f"Added {len(ids)} job descriptions in {time.perf_counter() - started:.2f}s; "
+              f"{len(library)} in the library", file=sys.stderr)
+        return 0 if ids else 1
+    if args.command == "remove":
+        for jd_id in args.ids:
+            library.remove(jd_id)
+        return 0
+
+    text = extract(args.resume).text
+    if not text.strip():
+        parser.error(f"No text could be extracted from {args.resume}")
+    options = {}
+    if args.analyze:
+        load_dotenv()
+        configure_gemini()
+        cache = None if args.no_cache else AnalysisCache(os.getenv("JOBFITAI_CACHE_PATH", DEFAULT_CACHE_PATH))
+        options = {"cache": cache, "rate_limiter": RateLimiter(args.rpm)}
+
+    started = time.perf_counter()
+    matches = match_jds(text, library, top_k=args.top, analyze_top=args.analyze, max_workers=args.workers, **options)
+    analyzed = f" and analyzed the best {min(args.analyze, len(matches))}" if args.analyze else ""
+    print(f"Ranked {len(library)} job descriptions{analyzed} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    for rank, (match, result) in enumerate(matches, 1):
+        if args.json:
+            print(json.dumps(dict(match._asdict(), rank=rank, result=result.to_dict() if result else None),
+                             ensure_ascii=False))
+            continue
+        line = f"{rank:>3}. [{match.jd_id}] {match.title}  similarity {match.similarity:.3f}"
+        if result is not None:
+            line += (f"  → {result.score['jd_match']:.0f}% match" if result.ok
+                     else f"  → failed at {result.errors[0].stage}: {result.errors[0].message}")
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+
+import pytest
+
+from utils import analysis
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+RESUME = "Data engineer with Python, SQL, Spark and Airflow experience building batch pipelines."
+JD = "We are hiring a data engineer who knows Python, SQL and Spark."
+
+@pytest.fixture
+def response_text():
+    with open(RECORDING, encoding="utf-8") as f:
+        return "".join(json.load(f)["chunks"])
+
+def run_concurrently(count, fn):
+    started = threading.Barrier(count)
+    results = [None] * count
+
+    def target(i):
+        started.wait(5)
+        results[i] = fn()
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+def slow_model(response_text, calls, release):
+    def call_model(prompt, **kwargs):
+        calls.append(prompt)
+        release.wait(5)
+        return response_text
+    return call_model
+
+def test_shared_client_calls_are_coalesced(monkeypatch, response_text):
+    calls = []
+    release = threading.Event()
+    monkeypatch.setattr(analysis, "generate_response", slow_model(response_text, calls, release))
+    threading.Timer(0.2, release.set).start()
+
+    results = run_concurrently(3, lambda: analysis.analyze_resume_text(RESUME, JD))
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    # Each waiter has its own copy
+    assert results[0] is not results[1]
+
+def test_callers_with_their_own_model_are_not_coalesced(response_text):
+    calls = []
+    release = threading.Event()
+    threading.Timer(0.2, release.set).start()
+
+    def analyze():
+        own_calls = []
+        result = analysis.analyze_resume_text(RESUME, JD, call_model=slow_model(response_text, own_calls, release))
+        calls.append(len(own_calls))
+        return result
+
+    run_concurrently(3, analyze)
+
+    # Every caller's own model saw its own call
+    assert calls == [1, 1, 1]
@@ -0,0 +1,80 @@
+import pytest
+
+from utils import analysis_cache
+from utils.analysis_cache import AnalysisCache, make_cache_key
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(analysis_cache.time, "time", lambda: now[0])
+    return now
+
+def make_cache(tmp_path, **options):
+    return AnalysisCache(str(tmp_path / "cache.sqlite3"), **options)
+
+def test_key_ignores_whitespace_but_not_content():
+    key = make_cache_key("Python  developer\n", "Data role", "v1", {"temperature": 0})
+    assert key == make_cache_key(" Python developer", "Data  role", "v1", {"temperature": 0})
+    assert key != make_cache_key("Python developer", "Data role", "v2", {"temperature": 0})
+    assert key != make_cache_key("Python developer", "Data role", "v1", {"temperature": 1})
+
+def test_round_trip_returns_copies(tmp_path):
+    cache = make_cache(tmp_path)
+    value = {"JD_Match": "80%", "Keywords": ["Python"]}
+    cache.set("key", value)
+    value["Keywords"].append("mutated")
+
+    first = cache.get("key")
+    first["Keywords"].append("mutated again")
+    assert cache.get("key") == {"JD_Match": "80%", "Keywords": ["Python"]}
+    assert (cache.hits, cache.misses) == (2, 0)
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    make_cache(tmp_path).set("key", {"JD_Match": "80%"})
+    cache = make_cache(tmp_path)
+    assert cache.get("key") == {"JD_Match": "80%"}
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("key", {"JD_Match": "80%"})
+    clock[0] += 60
+    assert cache.get("key") is not None
+    clock[0] += 1
+    assert cache.get("key") is None
+    # Expired entries are gone from disk too
+    assert make_cache(tmp_path, ttl_seconds=3600).get("key") is None
+    assert cache.misses == 1
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_memory_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+    assert list(cache._memory) == ["a", "c"]
+    # The evicted entry is still on disk
+    assert cache.get("b") == {"n": 2}
+    assert list(cache._memory) == ["c", "b"]
+
+def test_disk_tier_evicts_least_recently_used_over_size(tmp_path, clock):
+    payload = {"text": "x" * 100}
+    cache = make_cache(tmp_path, max_disk_bytes=250)
+    for key in ["a", "b"]:
+        cache.set(key, payload)
+        clock[0] += 1
+    # Read from disk, by an instance that doesn't hold it in memory
+    make_cache(tmp_path).get("a")
+    clock[0] += 1
+    cache.set("c", payload)
+
+    fresh = make_cache(tmp_path)
+    assert fresh.get("b") is None
+    assert fresh.get("a") == payload
+    assert fresh.get("c") == payload
+
+def test_clear(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("key", {"n": 1})
+    cache.clear()
+    assert cache.get("key") is None
+    assert make_cache(tmp_path).get("key") is None
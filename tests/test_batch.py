@@ -0,0 +1,134 @@
+import io
+import json
+import os
+
+import pytest
+
+from utils.analysis import analyze_resume_text
+from utils.batch import rank_results, screen_resumes, summarize_analysis, write_results_csv
+from utils.fake_model import FakeModel, split_into_chunks
+from utils.gemini_client import GeminiClient
+from utils.response_parser import parse_response_sections
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+JD = "Senior data engineer: Python, Spark, Kafka, Airflow and Terraform on AWS."
+
+# Pre-extracted resume texts and the match score each one's model response gives
+SCORES = {
+    "ana": 88,
+    "ben": 41,
+    "cy": 72,
+    "dee": 65
+}
+
+@pytest.fixture(scope="module")
+def recorded_analysis():
+    with open(RECORDING, encoding="utf-8") as f:
+        return parse_response_sections("".join(json.load(f)["chunks"]))
+
+def resume_text(name):
+    return f"{name.upper()}\nData engineer with Python, Spark, Kafka and Airflow pipelines on AWS."
+
+def model_for(recorded_analysis, score):
+    response = dict(recorded_analysis, JD_Match=f"{score}%")
+    return FakeModel(split_into_chunks(json.dumps(response), 64))
+
+def make_analyze(recorded_analysis, models=None):
+    """``analyze_fn`` that answers each resume from its own FakeModel."""
+    models = models if models is not None else {}
+
+    def analyze(text, jd):
+        name = text.split("\n")[0].lower()
+        model = models.setdefault(name, model_for(recorded_analysis, SCORES[name]))
+        return analyze_resume_text(text, jd, call_model=GeminiClient(model=model, max_retries=0).generate)
+
+    return analyze
+
+def screen(analyze_fn, names, **options):
+    resumes = [(name, resume_text(name)) for name in names]
+    return screen_resumes(resumes, JD, analyze_fn, extract_fn=str, **options)
+
+def test_rows_are_ranked_by_match_score(recorded_analysis):
+    models = {}
+    rows = screen(make_analyze(recorded_analysis, models), SCORES, max_workers=3)
+
+    assert [row["name"] for row in rows] == ["ana", "cy", "dee", "ben"]
+    assert [row["rank"] for row in rows] == [1, 2, 3, 4]
+    assert [row["jd_match"] for row in rows] == [88.0, 72.0, 65.0, 41.0]
+    assert all(row["status"] == "ok" for row in rows)
+    assert all(model.calls == 1 for model in models.values())
+
+class ModelDown(Exception):
+    pass
+
+class FailingModel(FakeModel):
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        raise ModelDown("model unavailable")
+
+def test_failed_documents_rank_last_and_keep_their_error(recorded_analysis):
+    models = {"ben": FailingModel([]), "dee": FakeModel(["Sorry, I can't help with that."])}
+
+    def extract(text):
+        if text.startswith("EVE"):
+            raise ValueError("File is not a valid PDF")
+        return text
+
+    rows = screen_resumes([(name, resume_text(name)) for name in [*SCORES, "eve"]], JD,
+                          make_analyze(recorded_analysis, models), extract_fn=extract)
+
+    assert [row["name"] for row in rows[:2]] == ["ana", "cy"]
+    failed = {row["name"]: row for row in rows[2:]}
+    assert set(failed) == {"ben", "dee", "eve"}
+    assert all(row["status"] == "error" and row["analysis"] is None for row in failed.values())
+    assert "model unavailable" in failed["ben"]["error"]
+    assert failed["eve"]["error"] == "File is not a valid PDF"
+    # One bad document doesn't stop the batch, and every row is ranked
+    assert [row["rank"] for row in rows] == [1, 2, 3, 4, 5]
+
+def test_progress_is_reported_for_every_row(recorded_analysis):
+    progress = []
+    rows = screen(make_analyze(recorded_analysis), SCORES,
+                  on_progress=lambda done, total, row: progress.append((done, total, row["name"])))
+
+    assert [(done, total) for done, total, _ in progress] == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert {name for _, _, name in progress} == {row["name"] for row in rows}
+
+def test_prescreened_resumes_skip_the_model(recorded_analysis):
+    models = {}
+    resumes = [("ana", resume_text("ana")), ("zed", "ZED\nPastry chef and cake decorator.")]
+    rows = screen_resumes(resumes, JD, make_analyze(recorded_analysis, models), extract_fn=str,
+                          prescore_threshold=15)
+
+    assert [(row["name"], row["status"]) for row in rows] == [("ana", "ok"), ("zed", "below_threshold")]
+    assert rows[1]["prescore"] < 15
+    assert "zed" not in models
+
+def row(name, jd_match, missing_high_priority=0, present_keywords=0, status="ok"):
+    return {"name": name, "jd_match": jd_match, "missing_high_priority": missing_high_priority,
+            "present_keywords": present_keywords, "status": status}
+
+def test_rank_results_breaks_ties_on_keyword_gaps():
+    rows = rank_results([
+        row("fewer hits", 70, missing_high_priority=1, present_keywords=3),
+        row("more gaps", 70, missing_high_priority=2, present_keywords=9),
+        row("failed", 0, status="error"),
+        row("more hits", 70, missing_high_priority=1, present_keywords=5),
+        row("screened out", 95, status="below_threshold"),
+        row("best", 80, missing_high_priority=4)
+    ])
+    assert [r["name"] for r in rows] == ["best", "more hits", "fewer hits", "more gaps", "screened out", "failed"]
+    assert [r["rank"] for r in rows] == [1, 2, 3, 4, 5, 6]
+
+def test_summary_and_csv_come_from_the_typed_analysis(recorded_analysis):
+    summary = summarize_analysis("ana.pdf", recorded_analysis, 1.234)
+    assert summary["jd_match"] == 72.0
+    assert summary["present_keywords"] == len(recorded_analysis["Keywords_Analysis"]["Present_Keywords"])
+    assert summary["seconds"] == 1.23
+
+    output = io.StringIO()
+    write_results_csv(rank_results([summary]), output)
+    header, line = output.getvalue().splitlines()
+    assert header.startswith("rank,name,jd_match")
+    assert line.startswith("1,ana.pdf,72.0")
@@ -0,0 +1,82 @@
+import pytest
+
+from utils.candidate_index import CandidateIndex, normalize_skill
+
+CANDIDATES = {
+    "ana": ["Python", "Kubernetes", "CKA"],
+    "ben": ["Java", "Kubernetes", "CKAD"],
+    "cy": ["Python", "Machine Learning", "AWS"],
+    "dee": ["Go", "AWS", "Kubernetes"]
+}
+
+def analysis(skills, jd_match="70%"):
+    return {"JD_Match": jd_match, "Role_Analysis": {"Present_Skills": skills}}
+
+@pytest.fixture
+def index(tmp_path):
+    index = CandidateIndex(str(tmp_path / "candidates.sqlite3"))
+    ids = {name: index.add(name, f"{name} resume", analysis(skills)) for name, skills in CANDIDATES.items()}
+    index.ids = ids
+    return index
+
+def names(index, query):
+    by_id = {candidate_id: name for name, candidate_id in index.ids.items()}
+    return sorted(by_id[candidate_id] for candidate_id in index.search(query))
+
+@pytest.mark.parametrize("query, expected", [
+    ("kubernetes", ["ana", "ben", "dee"]),
+    ("python kubernetes", ["ana"]),
+    ("python AND kubernetes", ["ana"]),
+    ("cka OR ckad", ["ana", "ben"]),
+    # AND binds tighter than OR
+    ("go AND aws OR java", ["ben", "dee"]),
+    ("java OR go AND aws", ["ben", "dee"]),
+    ("(java OR go) AND kubernetes", ["ben", "dee"]),
+    ("kubernetes AND (cka OR ckad) NOT java", ["ana"]),
+    ("NOT kubernetes", ["cy"]),
+    ("NOT NOT python", ["ana", "cy"]),
+    ("NOT (python OR java)", ["dee"]),
+    ("machine learning AND aws", ["cy"]),
+    ('"machine learning" OR go', ["cy", "dee"]),
+    ("ml", ["cy"]),
+    ("amazon web services", ["cy", "dee"]),
+    ("rust", []),
+    ("", [])
+])
+def test_search(index, query, expected):
+    assert names(index, query) == expected
+
+@pytest.mark.parametrize("query", [
+    "python AND",
+    "NOT",
+    "(python OR java",
+    "python)",
+    ")",
+    "OR python",
+    "python AND OR java",
+    "()"
+])
+def test_search_rejects_malformed_queries(index, query):
+    with pytest.raises(ValueError):
+        index.search(query)
+
+def test_index_survives_reopen(index, tmp_path):
+    reopened = CandidateIndex(str(tmp_path / "candidates.sqlite3"))
+    reopened.ids = index.ids
+    assert len(reopened) == len(CANDIDATES)
+    assert names(reopened, "kubernetes NOT go") == ["ana", "ben"]
+
+def test_re_adding_a_candidate_replaces_their_skills(index):
+    index.add("ana", "ana resume", analysis(["Rust"]))
+    assert names(index, "rust") == ["ana"]
+    assert names(index, "python") == ["cy"]
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Python (advanced)", "python"),
+    ("Amazon Web Services", "aws"),
+    ("ReactJS", "react"),
+    ("CI/CD", "ci/cd"),
+    ("Kubernetes - CKA", "kubernetes")
+])
+def test_normalize_skill(raw, expected):
+    assert normalize_skill(raw) == expected
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import signal
+import time
+import zipfile
+
+import pytest
+
+from utils import extraction_engine
+from utils.extraction_engine import ingest_documents, iter_sources
+from utils.file_processors import ExtractionResult
+
+def fake_extract(name, data):
+    """Extracts the file's bytes as text; "slow" files sleep, "stuck" ones also ignore the timer."""
+    if "stuck" in name:
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(30)
+    elif "slow" in name:
+        time.sleep(30)
+    text = data.decode("utf-8")
+    return ExtractionResult(text, 1, 0.0, hashlib.sha256(data).hexdigest(), False)
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    # Pool workers are forked, so they see the patched extractor
+    monkeypatch.setattr(extraction_engine, "extract_document", fake_extract)
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+
+    def write(name, text=None):
+        (folder / name).write_text(text or f"resume of {name}", encoding="utf-8")
+        return folder / name
+
+    write.folder = folder
+    return write
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_iter_sources_walks_folders_and_zips(tmp_path, documents):
+    documents("a.pdf")
+    documents("notes.txt")
+    with zipfile.ZipFile(documents.folder / "batch.zip", "w") as archive:
+        archive.writestr("b.docx", "b")
+        archive.writestr("__MACOSX/b.docx", "b")
+    assert sorted(doc_id for doc_id, _ in iter_sources([str(documents.folder)])) == ["a.pdf", "batch.zip:b.docx"]
+
+def test_ingest_skips_known_ids_and_duplicate_content(tmp_path, documents):
+    documents("a.pdf", "same text")
+    documents("b.pdf", "same text")
+    documents("c.docx")
+    corpus = str(tmp_path / "corpus.jsonl")
+
+    report = ingest_documents([str(documents.folder)], corpus, max_workers=2)
+    assert (report["written"], report["duplicates"], report["failed"]) == (2, 1, 0)
+    report = ingest_documents([str(documents.folder)], corpus, max_workers=2)
+    assert (report["queued"], report["skipped_existing"]) == (1, 2)
+    assert len(read_jsonl(corpus)) == 2
+
+def test_sub_second_timeout_interrupts_the_worker(tmp_path, documents):
+    documents("slow.pdf")
+    documents("ok.pdf")
+    corpus = str(tmp_path / "corpus.jsonl")
+
+    started = time.monotonic()
+    report = ingest_documents([str(documents.folder)], corpus, max_workers=2, timeout=0.3)
+
+    assert time.monotonic() - started < 10
+    assert report["written"] == 1
+    assert [(error["id"], error["error"]) for error in report["errors"]] == [("slow.pdf", "TimeoutError")]
+    assert read_jsonl(str(tmp_path / "corpus.errors.jsonl")) == report["errors"]
+
+def test_worker_the_timer_cannot_stop_is_abandoned(tmp_path, documents, monkeypatch):
+    monkeypatch.setattr(extraction_engine, "TIMEOUT_GRACE_SECONDS", 0.5)
+    documents("a-stuck.pdf")
+    documents("b.pdf")
+    documents("c.pdf")
+    corpus = str(tmp_path / "corpus.jsonl")
+    seen = []
+
+    started = time.monotonic()
+    report = ingest_documents([str(documents.folder)], corpus, max_workers=2, timeout=0.3,
+                              on_progress=lambda done, total, doc_id: seen.append((done, total)))
+
+    assert time.monotonic() - started < 10
+    assert [(error["id"], error["error"]) for error in report["errors"]] == [("a-stuck.pdf", "TimeoutError")]
+    # The documents that shared the recycled pool were retried
+    assert sorted(record["id"] for record in read_jsonl(corpus)) == ["b.pdf", "c.pdf"]
+    assert seen == [(1, 3), (2, 3), (3, 3)]
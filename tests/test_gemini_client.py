@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import gemini_client, retry
+from utils.fake_model import FakeModel
+from utils.gemini_client import GeminiClient
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+class ServerError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} from the model server")
+        self.code = code
+
+class FlakyModel(FakeModel):
+    """FakeModel that raises the given errors, one per call, before answering."""
+
+    def __init__(self, errors, **options):
+        with open(RECORDING, encoding="utf-8") as f:
+            super().__init__(json.load(f)["chunks"], **options)
+        self.errors = list(errors)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        if self.errors:
+            with self._lock:
+                self.calls += 1
+            raise self.errors.pop(0)
+        return super().generate_content(prompt, generation_config, stream)
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff sleeps, each drawn at the top of its jitter range."""
+    recorded = []
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: high)
+    # Only the client's and retry module's clocks are replaced; the fake model still replays in real time
+    clock = SimpleNamespace(sleep=recorded.append, monotonic=time.monotonic, perf_counter=time.perf_counter)
+    monkeypatch.setattr(retry, "time", clock)
+    monkeypatch.setattr(gemini_client, "time", clock)
+    return recorded
+
+def expected_response():
+    with open(RECORDING, encoding="utf-8") as f:
+        return "".join(json.load(f)["chunks"]).strip()
+
+def test_generate_retries_rate_limits_and_server_errors(sleeps):
+    model = FlakyModel([ServerError(429), ServerError(503), ServerError(500)])
+    client = GeminiClient(model=model)
+    assert client.generate("analyze this") == expected_response()
+    assert model.calls == 4
+    # Exponential: 1s, 2s, 4s at most
+    assert sleeps == [1.0, 2.0, 4.0]
+
+def test_generate_async_retries_too(sleeps):
+    model = FlakyModel([ServerError(429), ServerError(502)])
+    client = GeminiClient(model=model)
+    assert asyncio.run(client.generate_async("analyze this")) == expected_response()
+    assert model.calls == 3
+    assert sleeps == [1.0, 2.0]
+
+@pytest.mark.parametrize("run", [
+    lambda client: client.generate("analyze this"),
+    lambda client: asyncio.run(client.generate_async("analyze this"))
+], ids=["sync", "async"])
+def test_gives_up_after_max_retries(sleeps, run):
+    model = FlakyModel([ServerError(503)] * 3)
+    client = GeminiClient(model=model, max_retries=2)
+    with pytest.raises(ServerError):
+        run(client)
+    assert model.calls == 3
+    assert sleeps == [1.0, 2.0]
+
+def test_client_errors_are_not_retried(sleeps):
+    model = FlakyModel([ServerError(400)])
+    with pytest.raises(ServerError):
+        GeminiClient(model=model).generate("analyze this")
+    assert model.calls == 1
+    assert sleeps == []
+
+def test_backoff_is_jittered_and_capped(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: bounds.append((low, high)) or 0.0)
+    for attempt in range(7):
+        retry.backoff_delay(attempt, base_delay=1.0, max_delay=30.0)
+    assert bounds == [(0, 1.0), (0, 2.0), (0, 4.0), (0, 8.0), (0, 16.0), (0, 30.0), (0, 30.0)]
+
+def test_stream_retries_before_the_first_chunk(sleeps):
+    model = FlakyModel([ServerError(503)])
+    chunks = list(GeminiClient(model=model).stream("analyze this"))
+    assert "".join(chunks).strip() == expected_response()
+    assert model.calls == 2
+    assert sleeps == [1.0]
+
+def test_rate_limiter_is_consulted_on_every_attempt(sleeps):
+    class CountingLimiter:
+        waits = 0
+
+        def wait(self):
+            self.waits += 1
+
+    limiter = CountingLimiter()
+    GeminiClient(model=FlakyModel([ServerError(429)])).generate("analyze this", rate_limiter=limiter)
+    assert limiter.waits == 2
+
+def test_generate_response_async_uses_the_shared_client(monkeypatch, sleeps):
+    model = FlakyModel([ServerError(429)])
+    monkeypatch.setattr(gemini_client, "_client", GeminiClient(model=model))
+    assert asyncio.run(gemini_client.generate_response_async("analyze this")) == expected_response()
+    assert model.calls == 2
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from utils.incremental import (
+    AFFECTED_SECTIONS, Snapshot, diff_resume_sections, plan_reanalysis, reanalyze, resume_section_kind
+)
+from utils.response_parser import REQUIRED_KEYS, ResponseParseError
+
+RESUME = """JANE DOE
+jane@example.com | Data Engineer
+
+SUMMARY
+Data engineer with five years of pipeline work.
+
+EXPERIENCE
+Acme Corp, 2019-2024: built Airflow pipelines on AWS.
+
+TECHNICAL SKILLS
+Python, SQL, Spark
+
+EDUCATION
+BSc Computer Science, 2018
+"""
+
+JD = "Senior data engineer: Python, Spark, Kafka."
+
+ANALYSIS = {key: {"from": "previous"} for key in REQUIRED_KEYS}
+
+@pytest.fixture
+def previous():
+    return Snapshot(RESUME, JD, ANALYSIS)
+
+def expected_sections(*kinds):
+    affected = {key for kind in kinds for key in AFFECTED_SECTIONS[kind]}
+    return [key for key in REQUIRED_KEYS if key in affected]
+
+def test_unchanged_inputs_need_nothing(previous):
+    plan = plan_reanalysis(previous, RESUME.replace("\n\n", "\n\n\n"), JD + "  ")
+    assert plan.sections == []
+    assert plan.changed_resume_sections == []
+    assert not plan.jd_changed
+
+def test_jd_change_invalidates_everything(previous):
+    plan = plan_reanalysis(previous, RESUME, JD + " Terraform a plus.")
+    assert plan.sections == REQUIRED_KEYS
+    assert plan.jd_changed
+
+@pytest.mark.parametrize("old, new, kind", [
+    ("Python, SQL, Spark", "Python, SQL, Spark, Kafka", "skills"),
+    ("built Airflow pipelines", "built Airflow and Kafka pipelines", "experience"),
+    ("BSc Computer Science", "MSc Computer Science", "education"),
+    ("five years", "six years", "summary"),
+    ("jane@example.com", "jane.doe@example.com", "header")
+])
+def test_resume_edit_invalidates_only_what_reads_it(previous, old, new, kind):
+    plan = plan_reanalysis(previous, RESUME.replace(old, new), JD)
+    assert plan.sections == expected_sections(kind)
+    assert len(plan.changed_resume_sections) == 1
+    assert not plan.jd_changed
+    assert "Interview_Prep" not in plan.sections
+
+def test_added_section_is_a_change(previous):
+    plan = plan_reanalysis(previous, RESUME + "\nCERTIFICATIONS\nAWS Certified Data Engineer\n", JD)
+    assert plan.changed_resume_sections == ["certifications"]
+    assert plan.sections == expected_sections("education")
+
+def test_unstructured_resume_edit_counts_as_whole_resume():
+    previous = Snapshot("Python developer with SQL.", JD, ANALYSIS)
+    plan = plan_reanalysis(previous, "Python developer with SQL and Spark.", JD)
+    assert plan.sections == expected_sections("other")
+
+def test_missing_previous_sections_are_requested():
+    analysis = {key: value for key, value in ANALYSIS.items() if key != "Interview_Prep"}
+    plan = plan_reanalysis(Snapshot(RESUME, JD, analysis), RESUME, JD)
+    assert plan.sections == ["Interview_Prep"]
+
+@pytest.mark.parametrize("heading, kind", [
+    ("Technical Skills", "skills"),
+    ("Volunteer Experience", "experience"),
+    ("Licenses & Certifications", "education"),
+    ("Professional Profile", "summary"),
+    ("Hobbies", "other")
+])
+def test_resume_section_kind(heading, kind):
+    assert resume_section_kind(heading) == kind
+
+def test_diff_ignores_whitespace():
+    assert diff_resume_sections(RESUME, RESUME.replace("Python, SQL", "Python,   SQL")) == []
+
+def test_reanalyze_merges_only_planned_sections(previous):
+    prompts = []
+
+    def call_model(prompt):
+        prompts.append(prompt)
+        return json.dumps({key: {"from": "new"} for key in expected_sections("skills")})
+
+    analysis, plan = reanalyze(previous, RESUME.replace("Spark", "Spark, Kafka"), JD, call_model)
+    assert len(prompts) == 1
+    assert list(analysis) == REQUIRED_KEYS
+    assert {key for key, value in analysis.items() if value == {"from": "new"}} == set(plan.sections)
+
+def test_reanalyze_without_changes_calls_nothing(previous):
+    analysis, plan = reanalyze(previous, RESUME, JD, call_model=lambda prompt: pytest.fail("called the model"))
+    assert analysis == ANALYSIS
+
+def test_reanalyze_rejects_incomplete_response(previous):
+    with pytest.raises(ResponseParseError):
+        reanalyze(previous, RESUME.replace("Spark", "Spark, Kafka"), JD, call_model=lambda prompt: '{"JD_Match": "80%"}')
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils import jd_library
+from utils.jd_library import JDLibrary, embed_text
+
+JDS = [
+    ("Data Engineer", "Build batch and streaming pipelines with Python, Spark, Kafka and Airflow on AWS."),
+    ("Frontend Developer", "Ship React and TypeScript interfaces with accessible CSS and design systems."),
+    ("ML Engineer", "Train and deploy machine learning models in Python with PyTorch and Kubernetes."),
+    ("Accountant", "Prepare ledgers, reconcile accounts and file quarterly tax returns in Excel.")
+]
+
+RESUME = "Data engineer: Spark and Kafka streaming pipelines, Airflow DAGs, Python on AWS."
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "library")
+
+@pytest.fixture
+def library(path):
+    library = JDLibrary(path)
+    library.add_many(JDS)
+    return library
+
+def titles(matches):
+    return [match.title for match in matches]
+
+def test_embeddings_are_normalized():
+    assert np.linalg.norm(embed_text(RESUME)) == pytest.approx(1.0)
+    assert not embed_text("").any()
+
+def test_search_ranks_the_closest_jd_first(library):
+    matches = library.search(RESUME)
+    assert titles(matches)[0] == "Data Engineer"
+    assert [match.similarity for match in matches] == sorted((match.similarity for match in matches), reverse=True)
+    assert len(library.search(RESUME, top_k=2)) == 2
+    assert library.search(RESUME, top_k=0) == []
+
+def test_search_of_an_empty_library(path):
+    assert JDLibrary(path).search(RESUME) == []
+
+def test_blocks_rank_like_one_matrix_product(library, monkeypatch):
+    expected = library.search(RESUME, top_k=3)
+    monkeypatch.setattr(jd_library, "SEARCH_BLOCK_ROWS", 1)
+    assert library.search(RESUME, top_k=3) == expected
+
+def test_same_text_keeps_its_id_and_takes_the_new_title(library):
+    jd_id = library.add("Senior Data Engineer", "  " + JDS[0][1].replace(" ", "\n  "))
+    assert jd_id == 0
+    assert len(library) == len(JDS)
+    assert library.get(0)["title"] == "Senior Data Engineer"
+    assert titles(library.search(RESUME))[0] == "Senior Data Engineer"
+
+def test_removed_jds_leave_search_until_added_again(library, path):
+    library.remove(0)
+    assert len(library) == len(JDS) - 1
+    assert library.get(0)["active"] is False
+    assert "Data Engineer" not in titles(library.search(RESUME))
+    # Removal is stored, not just held in memory
+    assert "Data Engineer" not in titles(JDLibrary(path).search(RESUME))
+
+    assert library.add("Data Engineer", JDS[0][1]) == 0
+    assert titles(library.search(RESUME))[0] == "Data Engineer"
+
+def test_remove_of_an_unknown_id_is_ignored(library):
+    library.remove(99)
+    assert len(library) == len(JDS)
+    assert library.get(99) is None
+
+def test_reopen_reads_the_same_library(library, path):
+    expected = library.search(RESUME)
+    reopened = JDLibrary(path)
+    assert len(reopened) == len(JDS)
+    assert reopened.search(RESUME) == expected
+
+def vectors_file(path):
+    return os.path.join(path, f"vectors_{jd_library.EMBEDDING_DIM}.f32")
+
+def test_repair_trims_vectors_of_uncommitted_rows(library, path):
+    expected = library.search(RESUME)
+    # A crash after the vectors were appended but before the rows were committed
+    with open(vectors_file(path), "ab") as f:
+        f.write(embed_text("Uncommitted JD about welding").tobytes())
+
+    reopened = JDLibrary(path)
+    assert os.path.getsize(vectors_file(path)) == len(JDS) * jd_library.EMBEDDING_DIM * 4
+    assert reopened.search(RESUME) == expected
+
+def test_repair_rebuilds_missing_vectors(library, path):
+    expected = library.search(RESUME)
+    with open(vectors_file(path), "r+b") as f:
+        f.truncate(jd_library.EMBEDDING_DIM * 4)
+
+    reopened = JDLibrary(path)
+    assert os.path.getsize(vectors_file(path)) == len(JDS) * jd_library.EMBEDDING_DIM * 4
+    assert reopened.search(RESUME) == expected
+
+def test_stale_document_frequencies_are_rebuilt(library, path):
+    expected = library.search(RESUME)
+    doc_freq_path = os.path.join(path, f"doc_freq_{jd_library.EMBEDDING_DIM}.npy")
+    np.save(doc_freq_path, np.zeros(jd_library.EMBEDDING_DIM + 1, dtype=np.int64))
+
+    assert JDLibrary(path).search(RESUME) == expected
+    assert np.load(doc_freq_path)[-1] == len(JDS)
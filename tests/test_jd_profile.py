@@ -0,0 +1,61 @@
+import json
+import os
+import threading
+
+import pytest
+
+from utils.analysis_cache import AnalysisCache
+from utils.jd_profile import get_jd_profile, jd_profile_key
+from utils.prompt_templates import JD_PROFILE_SECTIONS
+from utils.response_parser import ResponseParseError, parse_response_sections
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+JD = "Senior data engineer: Python, Spark, Kafka."
+
+@pytest.fixture
+def profile_response():
+    with open(RECORDING, encoding="utf-8") as f:
+        analysis = parse_response_sections("".join(json.load(f)["chunks"]))
+    return json.dumps({name: analysis[name] for name in JD_PROFILE_SECTIONS})
+
+def test_concurrent_requests_share_one_model_call(profile_response):
+    calls = []
+    release = threading.Event()
+
+    def call_model(prompt):
+        calls.append(prompt)
+        release.wait(5)
+        return profile_response
+
+    started = threading.Barrier(4)
+    profiles = []
+
+    def request():
+        started.wait(5)
+        profiles.append(get_jd_profile(JD, call_model))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.2, release.set).start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(calls) == 1
+    assert len(profiles) == 4
+    assert all(profile == profiles[0] for profile in profiles)
+    assert list(profiles[0]) == JD_PROFILE_SECTIONS
+
+def test_cached_profile_skips_the_model(tmp_path, profile_response):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"))
+    profile = get_jd_profile(JD, lambda prompt: profile_response, cache)
+    assert cache.get(jd_profile_key(JD)) == profile
+    assert get_jd_profile(JD, lambda prompt: pytest.fail("called the model"), cache) == profile
+
+def test_incomplete_profile_is_rejected_and_not_cached(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"))
+    with pytest.raises(ResponseParseError):
+        get_jd_profile(JD, lambda prompt: '{"Industry_Context": {}}', cache)
+    assert cache.get(jd_profile_key(JD)) is None
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from api_server import create_app
+from utils import job_queue
+from utils.job_queue import JobQueue, JobWorkers, check_webhook_url
+
+def fake_resolve(addresses):
+    def getaddrinfo(host, port, *args, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port or 0)) for address in addresses]
+    return getaddrinfo
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "ftp://example.com/hook",
+    "gopher://example.com",
+    "http://",
+    "https:///path-only",
+    "not a url",
+    None,
+    42
+])
+def test_check_webhook_url_rejects_bad_schemes_and_values(url):
+    with pytest.raises(ValueError):
+        check_webhook_url(url)
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "192.168.1.20", "169.254.169.254", "::1", "0.0.0.0"])
+def test_check_webhook_url_rejects_internal_addresses(monkeypatch, address):
+    monkeypatch.setattr(socket, "getaddrinfo", fake_resolve([address]))
+    with pytest.raises(ValueError, match="not a public address"):
+        check_webhook_url("http://hooks.example.com/notify")
+
+def test_check_webhook_url_rejects_host_with_any_internal_address(monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", fake_resolve(["93.184.216.34", "10.1.2.3"]))
+    with pytest.raises(ValueError):
+        check_webhook_url("https://hooks.example.com/notify")
+
+def test_check_webhook_url_accepts_public_host(monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", fake_resolve(["93.184.216.34"]))
+    check_webhook_url("https://hooks.example.com/notify?id=1")
+
+def test_check_webhook_url_allowlist(monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", fake_resolve(["10.0.0.5"]))
+    check_webhook_url("http://ats.internal:8080/hook", allowed_hosts={"ats.internal"})
+    with pytest.raises(ValueError, match="not allowed"):
+        check_webhook_url("https://example.com/hook", allowed_hosts={"ats.internal"})
+
+def test_webhook_hosts_from_env(monkeypatch):
+    monkeypatch.setenv(job_queue.WEBHOOK_HOSTS_ENV, " ATS.example.com, hooks.example.com ,")
+    assert job_queue.webhook_hosts_from_env() == {"ats.example.com", "hooks.example.com"}
+    monkeypatch.delenv(job_queue.WEBHOOK_HOSTS_ENV)
+    assert job_queue.webhook_hosts_from_env() is None
+
+def test_notify_records_rejected_webhook_on_the_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.submit("r.pdf", b"data", "jd", webhook_url="file:///etc/passwd")
+    queue.claim(timeout=0)
+    queue.finish(job_id, result={"ok": True})
+    JobWorkers(queue, analyze_fn=None)._notify(job_id)
+    assert queue.get(job_id)["webhook_status"].startswith("error: webhook_url must be an http or https URL")
+    queue.close()
+
+def post_form(app, fields, files):
+    """POST a multipart form to the ASGI ``app``; returns ``(status, json body)``."""
+    boundary = "testboundary"
+    body = b""
+    for name, value in fields.items():
+        body += f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+    for name, (filename, data) in files.items():
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + b"\r\n"
+    body += f"--{boundary}--\r\n".encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/jobs", "raw_path": b"/jobs", "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode()),
+                    (b"content-length", str(len(body)).encode()), (b"host", b"testserver")],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80)
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    payload = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(payload)
+
+@pytest.mark.parametrize("webhook_url", ["file:///etc/passwd", "http://169.254.169.254/latest/meta-data"])
+def test_submit_job_rejects_unsafe_webhook_url(tmp_path, webhook_url):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    status, body = post_form(create_app(queue), {"jd": "Python engineer", "webhook_url": webhook_url},
+                             {"resume": ("resume.pdf", b"%PDF-1.4")})
+    assert status == 400
+    assert "webhook_url" in body["error"]
+    assert queue.stats()["queued"] == 0
+    queue.close()
+
+def test_submit_job_rejects_file_upload_as_webhook_url(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    status, body = post_form(create_app(queue), {"jd": "Python engineer"},
+                             {"resume": ("resume.pdf", b"%PDF-1.4"), "webhook_url": ("hook.txt", b"http://x")})
+    assert status == 400
+    queue.close()
+
+def test_submit_job_accepts_allowlisted_webhook(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    status, body = post_form(create_app(queue, webhook_hosts={"ats.example.com"}),
+                             {"jd": "Python engineer", "webhook_url": "https://ats.example.com/hook"},
+                             {"resume": ("resume.pdf", b"%PDF-1.4")})
+    assert status == 202
+    assert queue.get(body["id"])["webhook_url"] == "https://ats.example.com/hook"
+    queue.close()
@@ -0,0 +1,176 @@
+import json
+import os
+
+import pytest
+
+from utils.fake_model import FakeModel
+from utils.gemini_client import FAST_MODEL_ENV, GeminiClient
+from utils.model_routing import (
+    DEFAULT_POLICY, FAST_TIER_COSTS, FULL_TIER_COSTS, LOCAL_TIER, ModelRouter, Tier, default_tiers
+)
+from utils.prescorer import prescore_resume
+from utils.prompt_templates import estimate_tokens
+from utils.response_parser import REQUIRED_KEYS, ResponseParseError, get_default_response, parse_response_sections
+from utils.tracing import Trace
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+RESUME = "Data engineer with Python, SQL, Spark and Airflow experience on AWS."
+JD = "Senior data engineer: Python, Spark, Kafka."
+
+PENDING = ("Interview_Prep", "Industry_Specific_Metrics")
+
+class ModelDown(Exception):
+    pass
+
+class FailingModel(FakeModel):
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        with self._lock:
+            self.calls += 1
+        raise ModelDown("model unavailable")
+
+@pytest.fixture(scope="module")
+def full_analysis():
+    with open(RECORDING, encoding="utf-8") as f:
+        return parse_response_sections("".join(json.load(f)["chunks"]))
+
+def fake_tier(name, model, costs):
+    # Retries are the client's business; a failure here should reach the router at once
+    return Tier(name, GeminiClient(model=model, max_retries=0).generate, *costs)
+
+def fast_model(full_analysis, score):
+    first_pass = {key: full_analysis[key] for key in DEFAULT_POLICY.first_pass_sections}
+    first_pass["JD_Match"] = f"{score}%"
+    return FakeModel([json.dumps(first_pass)])
+
+def full_model(full_analysis):
+    return FakeModel([json.dumps(full_analysis)])
+
+def make_router(fast, full):
+    return ModelRouter(fake_tier("fast", fast, FAST_TIER_COSTS), fake_tier("full", full, FULL_TIER_COSTS))
+
+@pytest.mark.parametrize("score", [40, 55, 75])
+def test_ambiguous_scores_escalate_to_the_full_tier(full_analysis, score):
+    fast, full = fast_model(full_analysis, score), full_model(full_analysis)
+    routed = make_router(fast, full).analyze(RESUME, JD)
+
+    assert (fast.calls, full.calls) == (1, 1)
+    assert routed.tier == "full"
+    assert routed.first_pass_score == score
+    assert routed.pending == ()
+    assert routed.analysis == full_analysis
+
+@pytest.mark.parametrize("score", [0, 39, 76, 100])
+def test_clear_scores_stay_on_the_fast_tier(full_analysis, score):
+    fast, full = fast_model(full_analysis, score), full_model(full_analysis)
+    router = make_router(fast, full)
+    routed = router.analyze(RESUME, JD)
+
+    assert (fast.calls, full.calls) == (1, 0)
+    assert routed.tier == "fast"
+    assert routed.pending == PENDING
+    assert list(routed.analysis) == REQUIRED_KEYS
+    assert routed.analysis["JD_Match"] == f"{score}%"
+    # Pending sections hold their defaults until completed
+    for key in PENDING:
+        assert routed.analysis[key] == get_default_response()[key]
+    assert router.stats()["routes"] == {"fast_only": 1}
+
+def test_policy_band_can_be_overridden_per_call(full_analysis):
+    fast, full = fast_model(full_analysis, 80), full_model(full_analysis)
+    routed = make_router(fast, full).analyze(RESUME, JD, DEFAULT_POLICY._replace(ambiguous_band=(70.0, 90.0)))
+    assert routed.tier == "full"
+
+@pytest.mark.parametrize("fast", [
+    FailingModel([]),
+    FakeModel(["I cannot score this resume."]),
+    FakeModel([json.dumps({"Profile_Summary": "no score"})])
+], ids=["model_error", "not_json", "no_jd_match"])
+def test_failed_first_pass_falls_back_to_the_full_tier(full_analysis, fast):
+    full = full_model(full_analysis)
+    router = make_router(fast, full)
+    routed = router.analyze(RESUME, JD)
+
+    assert full.calls == 1
+    assert routed.first_pass_score is None
+    assert routed.tier == "full"
+    assert routed.analysis == full_analysis
+    assert router.stats()["routes"] == {"fast_failed": 1}
+
+def test_full_tier_failure_is_raised(full_analysis):
+    router = make_router(fast_model(full_analysis, 60), FailingModel([]))
+    with pytest.raises(ModelDown):
+        router.analyze(RESUME, JD)
+    assert router.stats()["tiers"]["full"]["errors"] == 1
+
+def test_complete_generates_only_the_requested_pending_sections(full_analysis):
+    fast, full = fast_model(full_analysis, 90), full_model(full_analysis)
+    router = make_router(fast, full)
+    routed = router.analyze(RESUME, JD)
+
+    completed = router.complete(routed, RESUME, JD, ["Interview_Prep", "JD_Match"])
+    assert full.calls == 1
+    assert completed.pending == ("Industry_Specific_Metrics",)
+    assert completed.analysis["Interview_Prep"] == full_analysis["Interview_Prep"]
+    # The fast tier's answer is kept
+    assert completed.analysis["JD_Match"] == "90%"
+    assert routed.pending == PENDING
+
+    # Nothing left to do for these sections
+    assert router.complete(completed, RESUME, JD, ["Interview_Prep"]) is completed
+    assert full.calls == 1
+    assert router.stats()["routes"] == {"fast_only": 1, "on_demand": 1}
+
+def test_complete_rejects_a_response_missing_a_section(full_analysis):
+    partial = {key: value for key, value in full_analysis.items() if key != "Industry_Specific_Metrics"}
+    router = make_router(fast_model(full_analysis, 90), FakeModel([json.dumps(partial)]))
+    routed = router.analyze(RESUME, JD)
+    with pytest.raises(ResponseParseError):
+        router.complete(routed, RESUME, JD, PENDING)
+
+def test_local_tier_scores_with_the_prescorer(full_analysis):
+    full = full_model(full_analysis)
+    router = ModelRouter(Tier(LOCAL_TIER, None, 0.0, 0.0), fake_tier("full", full, FULL_TIER_COSTS))
+    routed = router.analyze(RESUME, JD)
+
+    prescore, _ = prescore_resume(RESUME, JD)
+    assert routed.first_pass_score == pytest.approx(prescore["score"], abs=0.5)
+    low, high = DEFAULT_POLICY.ambiguous_band
+    assert routed.tier == ("full" if low <= routed.first_pass_score <= high else LOCAL_TIER)
+    local = router.stats()["tiers"][LOCAL_TIER]
+    assert (local["calls"], local["input_tokens"], local["cost"]) == (1, 0, 0.0)
+
+def test_per_tier_counters_and_trace(full_analysis):
+    fast, full = fast_model(full_analysis, 60), full_model(full_analysis)
+    router = make_router(fast, full)
+    trace = Trace("routing", sinks=[])
+    with trace.activate():
+        router.analyze(RESUME, JD)
+        router.analyze(RESUME, JD)
+
+    stats = router.stats()
+    assert stats["routes"] == {"ambiguous": 2}
+    for name, model, (input_cost, output_cost) in [("fast", fast, FAST_TIER_COSTS), ("full", full, FULL_TIER_COSTS)]:
+        totals = stats["tiers"][name]
+        assert totals["calls"] == 2
+        assert totals["errors"] == 0
+        assert totals["output_tokens"] == 2 * estimate_tokens("".join(model.chunks))
+        # Each call's cost is rounded to 8 places
+        assert totals["cost"] == pytest.approx(
+            (totals["input_tokens"] * input_cost + totals["output_tokens"] * output_cost) / 1000, abs=1e-7)
+        assert totals["mean_seconds"] == pytest.approx(totals["seconds"] / 2)
+        assert trace.counters[f"tier_{name}_calls"] == 2
+    assert trace.counters["route_ambiguous"] == 2
+    assert [record["attributes"]["tier"] for record in trace.spans if record["span"] == "model_route"] == \
+        ["fast", "full", "fast", "full"]
+
+def test_default_tiers_honour_the_fast_model_setting(monkeypatch):
+    monkeypatch.setenv(FAST_MODEL_ENV, "local")
+    fast, full = default_tiers(full_call_model=lambda prompt: "{}")
+    assert fast == Tier(LOCAL_TIER, None, 0.0, 0.0)
+    assert full.name == "full" and full.call_model("x") == "{}"
+
+    monkeypatch.setenv(FAST_MODEL_ENV, "gemini-1.5-flash")
+    fast, _ = default_tiers()
+    assert fast.name == "fast" and fast.input_cost == FAST_TIER_COSTS[0]
@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from utils.response_parser import REQUIRED_KEYS, parse_response_sections, repair_json
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "benchmarks", "recordings", "malformed_responses.jsonl")
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+CASES = load_corpus()
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case["case"])
+def test_recovers_expected_sections(case):
+    sections = parse_response_sections(case["response"])
+    recovered = [key for key in REQUIRED_KEYS if key in sections]
+    expected = case["expected_sections"]
+    assert recovered[:len(expected)] == expected
+    # Beyond those, only the section the response was cut off in may be kept, partially
+    assert len(recovered) - len(expected) <= int(case["case"].startswith("truncated"))
+
+@pytest.mark.parametrize("case", [case for case in CASES if case["case"].startswith("truncated")],
+                         ids=lambda case: case["case"])
+def test_truncation_keeps_complete_sections_intact(case):
+    clean = parse_response_sections(CASES[0]["response"])
+    sections = parse_response_sections(case["response"])
+    assert {key: sections[key] for key in case["expected_sections"]} == \
+        {key: clean[key] for key in case["expected_sections"]}
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": {"b": "trunc', {}),
+    ('```json\n{', {}),
+    ('{"a": "complete", "b": {"c": "tr', {"a": "complete"}),
+    ('{"a": [1, 2], "b": [3', {"a": [1, 2]}),
+    ('{"a": 1,}', {"a": 1}),
+    ('Here you go: {"a": "say "hi" now"} thanks', {"a": 'say "hi" now'}),
+    ('{"a": "line\nbreak", "b": "bad \\q escape"}', {"a": "line\nbreak", "b": "bad \\q escape"})
+])
+def test_repair_json(text, expected):
+    assert json.loads(repair_json(text)) == expected
+
+def test_repair_json_without_object():
+    with pytest.raises(ValueError):
+        repair_json("I could not analyze this resume.")
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from utils.analysis_cache import AnalysisCache
+from utils.candidate_index import CandidateIndex
+from utils.response_parser import REQUIRED_KEYS, parse_analysis, parse_gemini_response
+from utils.result_model import Analysis, Importance
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+@pytest.fixture
+def response_text():
+    with open(RECORDING, encoding="utf-8") as f:
+        return "".join(json.load(f)["chunks"])
+
+@pytest.mark.parametrize("raw, expected", [
+    ("72%", 72.0),
+    (" 72.5 % ", 72.5),
+    (64, 64.0),
+    ("140%", 100.0),
+    ("-5", 0.0),
+    ("n/a", 0.0),
+    (None, 0.0)
+])
+def test_jd_match_is_parsed_once_into_a_float(raw, expected):
+    assert Analysis.from_dict({"JD_Match": raw}).jd_match == expected
+
+@pytest.mark.parametrize("raw, expected", [
+    ("High", Importance.HIGH),
+    (" critical ", Importance.HIGH),
+    ("nice to have", Importance.LOW),
+    ("Medium", Importance.MEDIUM),
+    ("whatever", Importance.MEDIUM),
+    (None, Importance.MEDIUM)
+])
+def test_keyword_importance_is_coerced(raw, expected):
+    analysis = Analysis.from_dict({"Keywords_Analysis": {"Missing_Keywords": [{"keyword": "Kafka", "importance": raw}]}})
+    assert analysis.keywords.missing[0].importance is expected
+
+def test_sections_are_coerced_to_their_types():
+    analysis = Analysis.from_dict({
+        "Profile_Summary": "  Seasoned engineer  ",
+        "Role_Analysis": {"Present_Skills": "Python", "Required_Skills": ["SQL", "", None, " AWS "]},
+        # A single keyword object instead of a list, and junk entries
+        "Keywords_Analysis": {"Present_Keywords": {"keyword": "Python"}, "Missing_Keywords": ["Kafka", 3]},
+        "Match_Analysis": "not an object"
+    })
+    assert analysis.profile_summary == "Seasoned engineer"
+    assert analysis.role_analysis.present_skills == ("Python",)
+    assert analysis.role_analysis.required_skills == ("SQL", "AWS")
+    assert [kw.keyword for kw in analysis.keywords.present] == ["Python"]
+    assert analysis.keywords.missing == ()
+    assert analysis.match_analysis.score == 0.0
+    assert set(analysis.missing_sections) == set(REQUIRED_KEYS) - {
+        "Profile_Summary", "Role_Analysis", "Keywords_Analysis", "Match_Analysis"
+    }
+
+def test_parse_analysis_reads_the_recorded_response(response_text):
+    analysis = parse_analysis(response_text)
+    assert analysis.jd_match == 72.0
+    assert analysis.missing_sections == ()
+    assert "Kafka" in [kw.keyword for kw in analysis.keywords.high_priority_missing]
+
+def test_typed_parse_builds_no_default_response(response_text):
+    parsed = parse_gemini_response(response_text[:response_text.index('"Interview_Prep"')] + "}", typed=True)
+    assert isinstance(parsed.analysis, Analysis)
+    assert "Interview_Prep" in parsed.analysis.missing_sections
+    assert parsed.warnings and not parsed.errors
+
+    failed = parse_gemini_response("", typed=True)
+    assert failed.analysis == Analysis()
+    assert failed.errors
+
+def test_bytes_round_trip(response_text):
+    analysis = parse_analysis(response_text)
+    data = analysis.to_bytes()
+    assert isinstance(data, bytes)
+    assert len(data) < len(analysis.to_json().encode("utf-8"))
+    assert Analysis.from_bytes(data) == analysis
+    assert Analysis.from_json(analysis.to_json()) == analysis
+    # The dumped schema reads back to the same model
+    assert Analysis.from_dict(analysis.to_dict()) == analysis
+
+def test_cache_stores_analyses_as_bytes(tmp_path, response_text):
+    path = str(tmp_path / "cache.sqlite3")
+    analysis = parse_analysis(response_text)
+    cache = AnalysisCache(path)
+    cache.set("analysis", analysis)
+    cache.set("section", {"JD_Match": "72%"})
+
+    payload = cache._conn.execute("SELECT payload FROM analyses WHERE key = 'analysis'").fetchone()[0]
+    assert payload == analysis.to_bytes()
+    fresh = AnalysisCache(path)
+    assert fresh.get("analysis") == analysis
+    assert fresh.get("section") == {"JD_Match": "72%"}
+
+def test_candidate_index_stores_analyses_as_bytes(tmp_path, response_text):
+    analysis = parse_analysis(response_text)
+    index = CandidateIndex(str(tmp_path / "candidates.sqlite3"))
+    candidate_id = index.add("ana", "resume text", analysis)
+    # A response-schema dict is indexed the same way
+    other_id = index.add("ben", "other resume", analysis.to_dict())
+
+    assert index.get_analysis(candidate_id) == analysis
+    assert index.get_analysis(other_id) == analysis
+    assert index.summaries([candidate_id])[0]["jd_match"] == 72.0
+    assert index.search("python") == {candidate_id, other_id}
@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+def start(fn):
+    """Run ``fn`` on a thread; returns a dict that gets its "result" or "error"."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    outcome["thread"] = thread
+    return outcome
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn(cancelled):
+        calls.append(1)
+        release.wait(5)
+        return {"score": 80}
+
+    waiters = [start(lambda: flights.do("key", fn)) for _ in range(3)]
+    while flights.stats()["deduplicated"] < 2:
+        time.sleep(0.01)
+    release.set()
+    for waiter in waiters:
+        waiter["thread"].join(5)
+
+    assert len(calls) == 1
+    assert [waiter["result"] for waiter in waiters] == [{"score": 80}] * 3
+    assert flights.stats() == {"executed": 1, "deduplicated": 2, "abandoned": 0, "in_flight": 0}
+
+def test_error_reaches_every_waiter_and_is_not_kept():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail(cancelled):
+        release.wait(5)
+        raise RuntimeError("model down")
+
+    waiters = [start(lambda: flights.do("key", fail)) for _ in range(2)]
+    while flights.stats()["deduplicated"] < 1:
+        time.sleep(0.01)
+    release.set()
+    for waiter in waiters:
+        waiter["thread"].join(5)
+
+    assert all(isinstance(waiter["error"], RuntimeError) for waiter in waiters)
+    # The failed flight has landed, so the next caller runs afresh
+    assert flights.do("key", lambda cancelled: "ok") == "ok"
+    assert flights.stats()["executed"] == 2
+
+def test_timeout_leaves_other_waiters_waiting():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def slow(cancelled):
+        release.wait(5)
+        return "done"
+
+    patient = start(lambda: flights.do("key", slow))
+    while flights.stats()["in_flight"] < 1:
+        time.sleep(0.01)
+    with pytest.raises(TimeoutError):
+        flights.do("key", slow, timeout=0.05)
+    release.set()
+    patient["thread"].join(5)
+
+    assert patient["result"] == "done"
+    assert flights.stats()["abandoned"] == 0
+
+def test_cancel_event_stops_waiting():
+    flights = SingleFlight()
+    release = threading.Event()
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        flights.do("key", lambda cancelled: release.wait(5), cancel_event=cancel)
+    release.set()
+
+def test_last_waiter_giving_up_cancels_the_call():
+    flights = SingleFlight()
+    seen = {}
+
+    def fn(cancelled):
+        seen["cancelled"] = cancelled
+        cancelled.wait(5)
+        return "late"
+
+    with pytest.raises(TimeoutError):
+        flights.do("key", fn, timeout=0.05)
+
+    assert seen["cancelled"].is_set()
+    assert flights.stats() == {"executed": 1, "deduplicated": 0, "abandoned": 1, "in_flight": 0}
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from utils.fake_model import FakeModel, split_into_chunks
+from utils.gemini_client import GeminiClient
+from utils.response_parser import REQUIRED_KEYS, parse_response_sections
+from utils.stream_parser import IncrementalSectionParser
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+@pytest.fixture
+def response_text():
+    with open(RECORDING, encoding="utf-8") as f:
+        return "".join(json.load(f)["chunks"])
+
+def replay(chunks):
+    """Stream ``chunks`` through FakeModel and the client, feeding the parser as they arrive."""
+    parser = IncrementalSectionParser()
+    seen = []
+    for chunk in GeminiClient(model=FakeModel(chunks)).stream("analyze this"):
+        seen.extend(key for key, _ in parser.feed(chunk))
+    return parser, seen
+
+def test_recorded_stream_yields_every_section_in_order(response_text):
+    with open(RECORDING, encoding="utf-8") as f:
+        parser, seen = replay(json.load(f)["chunks"])
+    assert seen == REQUIRED_KEYS
+    assert parser.complete
+    assert parser.sections == parse_response_sections(response_text)
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_any_chunking_gives_the_same_sections(response_text, chunk_size):
+    parser, seen = replay(split_into_chunks(response_text, chunk_size))
+    assert seen == REQUIRED_KEYS
+    assert parser.sections == parse_response_sections(response_text)
+
+@pytest.mark.parametrize("prose", [
+    "[result] Here is the analysis:\n",
+    "Scores are in [0, 100]; see below.\n",
+    "Notes (draft] ] [[\n",
+    "Sure!\n"
+])
+def test_prose_before_the_object_is_skipped(response_text, prose):
+    parser, seen = replay(split_into_chunks(prose + response_text, 5))
+    assert seen == REQUIRED_KEYS
+    assert parser.complete
+
+def test_sections_arrive_before_the_stream_ends(response_text):
+    parser = IncrementalSectionParser()
+    cut = response_text.index('"Keywords_Analysis"')
+    first = [key for key, _ in parser.feed(response_text[:cut])]
+    assert first == ["Industry_Context", "JD_Match", "Match_Analysis"]
+    assert not parser.complete
+    rest = [key for key, _ in parser.feed(response_text[cut:])]
+    assert first + rest == REQUIRED_KEYS
+
+def test_text_after_the_object_is_ignored(response_text):
+    parser = IncrementalSectionParser()
+    parser.feed(response_text + '\nAlso {"JD_Match": "0%"}')
+    assert parser.sections["JD_Match"] == parse_response_sections(response_text)["JD_Match"]
+
+def test_malformed_section_is_left_out():
+    parser = IncrementalSectionParser()
+    completed = parser.feed('{"JD_Match": "80%", "Profile_Summary": oops, "Role_Analysis": {"Required_Skills": ["Python",]}}')
+    assert [key for key, _ in completed] == ["JD_Match", "Role_Analysis"]
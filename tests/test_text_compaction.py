@@ -0,0 +1,69 @@
+from utils.prompt_templates import estimate_tokens
+from utils.text_compaction import compact_inputs, compact_text, normalize_whitespace, split_sections
+
+JD = "Data engineer. Must have Python, Spark, Kafka, Airflow and Terraform on AWS."
+
+SKILLS = ["Python", "Spark", "Kafka", "Airflow", "Terraform", "AWS"]
+
+def long_resume():
+    filler = "\n".join(f"Wrote article number {i} about birdwatching and sourdough baking." for i in range(120))
+    hobbies = "\n".join(f"Hobby {i}: pottery, chess, hiking and amateur astronomy." for i in range(80))
+    return "\n".join([
+        "JANE DOE",
+        "jane@example.com | Data Engineer",
+        "",
+        "PUBLICATIONS",
+        filler,
+        "",
+        "SKILLS",
+        ", ".join(SKILLS),
+        "",
+        "EXPERIENCE",
+        "Acme Corp: built Airflow and Spark pipelines on AWS, streaming with Kafka, infrastructure in Terraform.",
+        "",
+        "INTERESTS",
+        hobbies
+    ])
+
+def test_over_budget_resume_keeps_skills_and_relevant_sections():
+    resume, jd = compact_inputs(long_resume(), JD, resume_budget=400)
+
+    assert resume.tokens_before > 400
+    assert resume.tokens_after <= 400
+    assert resume.tokens_after == estimate_tokens(resume.text)
+    for skill in SKILLS:
+        assert skill in resume.text
+    # The header and the relevant sections are kept whole, in their original
+    # order; the least relevant section that still fits in part is cut short
+    headings = [heading for heading, _ in split_sections(resume.text)]
+    assert headings == ["JANE DOE", "PUBLICATIONS", "SKILLS", "EXPERIENCE"]
+    assert resume.text.startswith("JANE DOE\njane@example.com")
+    assert resume.dropped_sections == ["INTERESTS"]
+    assert jd.text == JD
+
+def test_within_budget_resume_only_cleaned():
+    text = "JANE DOE\n\n\n\nSKILLS\nPython,   Spark\t and Kafka\n"
+    resume, _ = compact_inputs(text, JD)
+    assert resume.text == "JANE DOE\n\nSKILLS\nPython, Spark and Kafka"
+    assert resume.dropped_sections == []
+
+def test_over_budget_jd_is_cut_at_a_line():
+    jd = "\n".join(f"Requirement {i}: Python and Spark." for i in range(400))
+    _, result = compact_inputs("JANE DOE", jd, jd_budget=100)
+    assert result.tokens_after <= 100
+    assert jd.startswith(result.text)
+
+def test_compact_text_drops_page_furniture_and_rejoins_hyphens():
+    pages = [
+        "Jane Doe - Resume\nBuilt stream-\nprocessing jobs in Kafka\nPage 1 of 2",
+        "Jane Doe - Resume\nMaintained Airflow DAGs\nPage 2 of 2"
+    ]
+    text = compact_text("\f".join(pages))
+    assert text.count("Jane Doe - Resume") == 1
+    assert "stream-processing jobs in Kafka" in text
+    assert "Page" not in text
+    assert "Maintained Airflow DAGs" in text
+
+def test_only_soft_hyphen_breaks_drop_the_hyphen():
+    text = normalize_whitespace("Built stream-\nprocessing and data\u00ad\nbases; co\u00adordinated teams")
+    assert text == "Built stream-processing and databases; coordinated teams"
@@ -0,0 +1,119 @@
+import json
+import types
+
+import pytest
+
+from utils import tracing
+from utils.tracing import PhaseMetrics, Trace
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(tracing, "time", types.SimpleNamespace(perf_counter=lambda: clock.now, time=lambda: clock.now))
+    return clock
+
+def record_analysis(trace, clock):
+    """extract 0.5s, then a 1.75s model call holding a 0.25s parse, then a failing 0.5s parse."""
+    with trace.span("extract", pages=2):
+        clock.advance(0.5)
+    with trace.span("model_call"):
+        clock.advance(1.0)
+        with trace.span("parse", response_bytes=100, repaired=True):
+            clock.advance(0.25)
+        clock.advance(0.5)
+    with pytest.raises(ValueError):
+        with trace.span("parse") as attributes:
+            attributes["response_bytes"] = 50
+            clock.advance(0.5)
+            raise ValueError("bad JSON")
+    trace.count("cache_hits")
+    trace.count("cache_hits")
+
+EXPECTED_PROMETHEUS = """\
+# HELP jobfitai_phase_seconds Time spent in each analysis phase.
+# TYPE jobfitai_phase_seconds summary
+jobfitai_phase_seconds_sum{phase="extract"} 0.500000
+jobfitai_phase_seconds_count{phase="extract"} 1
+jobfitai_phase_seconds_sum{phase="model_call"} 1.750000
+jobfitai_phase_seconds_count{phase="model_call"} 1
+jobfitai_phase_seconds_sum{phase="parse"} 0.750000
+jobfitai_phase_seconds_count{phase="parse"} 2
+# TYPE jobfitai_phase_errors_total counter
+jobfitai_phase_errors_total{phase="extract"} 0
+jobfitai_phase_errors_total{phase="model_call"} 0
+jobfitai_phase_errors_total{phase="parse"} 1
+# TYPE jobfitai_pages_total counter
+jobfitai_pages_total{phase="extract"} 2
+# TYPE jobfitai_response_bytes_total counter
+jobfitai_response_bytes_total{phase="parse"} 150
+# TYPE jobfitai_cache_hits_total counter
+jobfitai_cache_hits_total 2
+"""
+
+def test_nested_spans_count_toward_their_own_phase(clock):
+    trace = Trace(sinks=[])
+    record_analysis(trace, clock)
+
+    # The outer span includes the nested one; each name's spans are summed
+    assert trace.phase_totals() == {"extract": 0.5, "model_call": 1.75, "parse": 0.75}
+    # Inner spans finish first
+    assert [record["span"] for record in trace.spans] == ["extract", "parse", "model_call", "parse"]
+    assert trace.spans[-1]["error"] == "ValueError"
+    assert trace.spans[-1]["attributes"] == {"response_bytes": 50}
+
+def test_phase_totals_follow_pipeline_order(clock):
+    trace = Trace(sinks=[])
+    for name in ["escalation", "render", "parse", "extract"]:
+        with trace.span(name):
+            clock.advance(0.25)
+    assert list(trace.phase_totals()) == ["extract", "parse", "render", "escalation"]
+
+def test_prometheus_export(clock):
+    trace = Trace(sinks=[])
+    record_analysis(trace, clock)
+    assert trace.to_prometheus() == EXPECTED_PROMETHEUS
+    assert trace.to_prometheus(prefix="screening").startswith("# HELP screening_phase_seconds ")
+
+def test_phase_metrics_sink_aggregates_across_traces(clock):
+    metrics = PhaseMetrics()
+    for _ in range(2):
+        record_analysis(Trace(sinks=[metrics]), clock)
+    text = metrics.to_prometheus()
+
+    assert 'jobfitai_phase_seconds_sum{phase="parse"} 1.500000' in text
+    assert 'jobfitai_phase_seconds_count{phase="parse"} 4' in text
+    assert 'jobfitai_phase_errors_total{phase="parse"} 2' in text
+    assert "jobfitai_cache_hits_total 4" in text
+    # Booleans are flags, not amounts
+    assert "repaired" not in text
+
+def test_module_helpers_record_into_the_active_trace(clock):
+    with tracing.span("parse") as attributes:
+        attributes["ignored"] = 1
+    tracing.count("cache_hits")
+
+    trace = Trace(sinks=[])
+    with trace.activate():
+        with tracing.span("parse", response_bytes=10):
+            clock.advance(0.25)
+        tracing.count("cache_hits", 3)
+    with tracing.span("render"):
+        pass
+
+    assert [record["span"] for record in trace.spans] == ["parse"]
+    assert trace.counters == {"cache_hits": 3}
+
+def test_jsonl_export_ends_with_the_counters(clock):
+    trace = Trace(name="batch", sinks=[])
+    record_analysis(trace, clock)
+    lines = [json.loads(line) for line in trace.to_jsonl().splitlines()]
+
+    assert [line.get("span") for line in lines] == ["extract", "parse", "model_call", "parse", None]
+    assert lines[-1] == {"trace_id": trace.trace_id, "trace": "batch", "counters": {"cache_hits": 2}}
@@ -0,0 +1,38 @@
+import json
+import os
+
+import pytest
+
+from utils.response_parser import parse_response_sections
+from utils.visualizations import FIGURE_NAMES, create_match_gauge, get_insight_figures
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "recordings", "analysis_response.json")
+
+@pytest.fixture
+def analysis():
+    with open(RECORDING, encoding="utf-8") as f:
+        return parse_response_sections("".join(json.load(f)["chunks"]))
+
+def test_match_gauge_parses_the_score():
+    assert create_match_gauge("72%").data[0].value == 72
+    assert create_match_gauge("n/a").data[0].value == 0
+
+def test_insight_figures_are_memoized_by_content(analysis):
+    figures = get_insight_figures(analysis)
+    assert get_insight_figures(dict(analysis)) is figures
+    assert all(figures.get(name) is not None for name in FIGURE_NAMES)
+
+def test_json_is_serialized_once(analysis):
+    figures = get_insight_figures(analysis)
+    gauge = figures.to_json("match_gauge")
+    assert json.loads(gauge)["data"][0]["value"] == 72
+    assert figures.to_json("match_gauge") is gauge
+
+def test_svg_export_needs_no_plotly_js(analysis):
+    figures = get_insight_figures(analysis)
+    for name in FIGURE_NAMES:
+        svg = figures.to_image(name)
+        assert svg.startswith(b"<svg") and b"plotly" not in svg
+        # Produced once
+        assert figures.to_image(name) is svg
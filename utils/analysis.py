@@ -0,0 +1,101 @@
+import copy
+import threading
+
+from utils import tracing
+from utils.analysis_cache import make_cache_key
+from utils.gemini_client import GENERATION_CONFIG, generate_response
+from utils.jd_profile import analyze_with_jd_profile
+from utils.model_routing import make_router
+from utils.prompt_templates import create_analysis_prompt, PROMPT_VERSION
+from utils.response_parser import parse_analysis
+from utils.result_model import Analysis
+from utils.section_planner import plan_sections, run_section_plan
+from utils.single_flight import SingleFlight
+from utils.text_compaction import DEFAULT_RESUME_TOKEN_BUDGET, compact_inputs
+
+# "full": one generation for the whole schema
+# "sectioned": concurrent, individually cached section calls
+# "jd_profile": JD analyzed once and reused; per resume only a short generation
+# "tiered": a fast model first, the full model only for ambiguous matches
+ANALYSIS_MODES = ["full", "sectioned", "jd_profile", "tiered"]
+
+# Concurrent analyses of the same resume, JD and mode through the shared client
+# share one run and its parsed result
+_analysis_flights = SingleFlight("analysis")
+
+def analysis_flight_stats():
+    return _analysis_flights.stats()
+
+def make_model_caller(rate_limiter=None, max_retries=5):
+    """Return ``call_model(prompt)`` that honours the rate limit and retries transient errors."""
+    def call_model(prompt):
+        return generate_response(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+
+    return call_model
+
+def analyze_resume_text(text, jd, cache=None, rate_limiter=None, max_retries=5, mode="full", jd_profile=None,
+                        token_budget=DEFAULT_RESUME_TOKEN_BUDGET, call_model=None, router=None):
+    """Run one resume/JD analysis end to end without touching the UI.
+
+    The resume and JD are first compacted (see ``utils.text_compaction``),
+    with the resume fitted into ``token_budget`` tokens; a precomputed
+    ``jd_profile`` should come from the compacted JD. Cached results are
+    returned directly. Otherwise the model is called with
+    retries on rate-limit and transient errors, and the result is validated
+    into an ``Analysis`` once and stored back in ``cache`` in that compact
+    form; callers get its response-schema dict. ``mode`` is one of ``ANALYSIS_MODES``; in
+    ``jd_profile`` mode a precomputed ``jd_profile`` may be passed to skip the
+    profile lookup. ``call_model(prompt)`` replaces the shared Gemini client
+    (``rate_limiter`` and ``max_retries`` are then the caller's business).
+    In ``tiered`` mode ``router`` (default: ``make_router`` around
+    ``call_model`` as the full tier) picks the model; sections it leaves
+    pending keep their defaults. Only calls through the shared client are
+    coalesced with identical concurrent ones. Raises on model or parse
+    failure.
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode: {mode}")
+    shared = call_model is None and router is None
+    if call_model is None:
+        call_model = make_model_caller(rate_limiter, max_retries)
+    resume, jd_result = compact_inputs(text, jd, resume_budget=token_budget)
+    text, jd = resume.text, jd_result.text
+
+    if mode == "sectioned":
+        # Sections are cached individually by the planner
+        analysis, errors = run_section_plan(text, jd, call_model, cache=cache)
+        if len(errors) == len(plan_sections()):
+            raise ValueError("All analysis sections failed: " + "; ".join(errors.values()))
+        return analysis
+
+    prompt_version = PROMPT_VERSION if mode == "full" else f"{PROMPT_VERSION}:{mode}"
+    cache_key = make_cache_key(text, jd, prompt_version, GENERATION_CONFIG)
+    if cache is not None:
+        analysis = cache.get(cache_key)
+        if analysis is not None:
+            return Analysis.from_dict(analysis).to_dict()
+
+    def run(cancelled):
+        if mode == "jd_profile":
+            analysis = analyze_with_jd_profile(text, jd, call_model, cache=cache, profile=jd_profile)
+        elif mode == "tiered":
+            analysis = (router or make_router(call_model, rate_limiter, max_retries)).analyze(text, jd).analysis
+        else:
+            with tracing.span("prompt_build") as attributes:
+                prompt = create_analysis_prompt(text, jd)
+                attributes["prompt_chars"] = len(prompt)
+            analysis = parse_analysis(call_model(prompt))
+        analysis = Analysis.from_dict(analysis)
+        if cache is not None:
+            cache.set(cache_key, analysis)
+        return analysis.to_dict()
+
+    if not shared:
+        # A caller's own model or router may record or fail differently, so its
+        # result can't stand in for anyone else's
+        return run(threading.Event())
+    # Waiters must also agree on the rate limit, retries and JD profile; their
+    # objects are alive for the whole flight, so their ids can't be reused
+    flight_key = f"{cache_key}:{id(rate_limiter):x}:{max_retries}:{id(jd_profile):x}"
+    # Every waiter gets its own copy of the shared result
+    return copy.deepcopy(_analysis_flights.do(flight_key, run))
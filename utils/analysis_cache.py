@@ -0,0 +1,148 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils import tracing
+from utils.result_model import Analysis
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "analysis_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+def normalize_text(text):
+    """Collapse whitespace so re-extractions of the same document hash identically."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def make_cache_key(resume_text, jd, prompt_version, generation_config):
+    """Content-address an analysis by everything that can change the model output."""
+    payload = json.dumps(
+        [normalize_text(resume_text), normalize_text(jd), prompt_version, generation_config],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _dump_payload(value):
+    if isinstance(value, Analysis):
+        return value.to_bytes()
+    return json.dumps(value, ensure_ascii=False)
+
+def _load_payload(payload):
+    # SQLite hands BLOBs back as bytes, so the payload type says how it was stored
+    if isinstance(payload, bytes):
+        return Analysis.from_bytes(payload)
+    return json.loads(payload)
+
+class AnalysisCache:
+    """Two-tier cache of parsed analyses: an in-memory LRU in front of SQLite.
+
+    Entries expire after ``ttl_seconds``. The memory tier holds at most
+    ``max_memory_entries`` items and the disk tier is trimmed, least recently
+    used first, once its payloads exceed ``max_disk_bytes``. A full
+    ``Analysis`` is stored in its compact ``to_bytes`` form; anything else
+    (section results, JD profiles) as JSON.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_entries=128,
+                 max_disk_bytes=256 * 1024 * 1024, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON analyses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    tracing.count("cache_hits")
+                    return copy.deepcopy(value)
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                tracing.count("cache_misses")
+                return None
+
+            self._conn.execute("UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            value = _load_payload(row[0])
+            self._remember(key, row[1], value)
+            self.hits += 1
+            tracing.count("cache_hits")
+            return copy.deepcopy(value)
+
+    def set(self, key, value):
+        now = time.time()
+        payload = _dump_payload(value)
+        with self._lock:
+            self._remember(key, now, copy.deepcopy(value))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            self._evict_disk(now)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM analyses")
+            self._conn.commit()
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM analyses ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            self._conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
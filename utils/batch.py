@@ -0,0 +1,136 @@
+import contextvars
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import tracing
+from utils.file_processors import read_file_text
+from utils.prescorer import PreScorer, should_escalate, to_provisional_analysis
+from utils.result_model import Analysis
+
+RESULT_COLUMNS = [
+    "rank",
+    "name",
+    "jd_match",
+    "prescore",
+    "present_keywords",
+    "missing_keywords",
+    "missing_high_priority",
+    "top_missing",
+    "status",
+    "error",
+    "seconds"
+]
+
+# Ranking order of row statuses: full analyses, then pre-screened out, then failures
+STATUS_ORDER = {"ok": 0, "below_threshold": 1, "error": 2}
+
+def summarize_analysis(name, analysis, elapsed, prescore=None, status="ok", text=None):
+    """Flatten an analysis into one ranked-table row from JD_Match and Keywords_Analysis.
+
+    The row keeps ``analysis`` as given (a response-schema dict for the
+    index and API); the numbers come from its validated ``Analysis``.
+    """
+    model = Analysis.from_dict(analysis)
+    keywords = model.keywords
+    high_priority = keywords.high_priority_missing
+    return {
+        "name": name,
+        "jd_match": model.jd_match,
+        "prescore": prescore,
+        "present_keywords": len(keywords.present),
+        "missing_keywords": len(keywords.missing),
+        "missing_high_priority": len(high_priority),
+        "top_missing": ", ".join(kw.keyword for kw in (high_priority or keywords.missing)[:5]),
+        "status": status,
+        "error": "",
+        "seconds": round(elapsed, 2),
+        "analysis": analysis,
+        "text": text
+    }
+
+def _failed_row(name, error, elapsed):
+    return {
+        "name": name,
+        "jd_match": 0.0,
+        "prescore": None,
+        "present_keywords": 0,
+        "missing_keywords": 0,
+        "missing_high_priority": 0,
+        "top_missing": "",
+        "status": "error",
+        "error": str(error),
+        "seconds": round(elapsed, 2),
+        "analysis": None,
+        "text": None
+    }
+
+def _screen_one(name, source, jd, analyze_fn, extract_fn, scorer, prescore_threshold):
+    started = time.perf_counter()
+    try:
+        with tracing.span("extract", resume=name):
+            text = extract_fn(source)
+        prescore = None
+        if scorer is not None:
+            result = scorer.score(text)
+            prescore = result["score"]
+            if not should_escalate(result, prescore_threshold):
+                # Skip the model call; the offline estimate fills the row instead
+                analysis = to_provisional_analysis(result, scorer, text)
+                return summarize_analysis(name, analysis, time.perf_counter() - started,
+                                          prescore=prescore, status="below_threshold", text=text)
+        analysis = analyze_fn(text, jd)
+        return summarize_analysis(name, analysis, time.perf_counter() - started, prescore=prescore, text=text)
+    except Exception as e:
+        return _failed_row(name, e, time.perf_counter() - started)
+
+def screen_resumes(resumes, jd, analyze_fn, max_workers=4, on_progress=None, extract_fn=read_file_text,
+                   prescore_threshold=None):
+    """Screen many resumes against one JD on a bounded thread pool.
+
+    ``resumes`` is a list of ``(name, source)`` pairs; ``extract_fn(source)``
+    turns each source into text (by default ``read_file_text`` on a file, or
+    the identity when sources are pre-extracted corpus texts).
+    ``analyze_fn(text, jd)`` returns a parsed
+    analysis and should handle its own rate limiting and retries.
+    ``on_progress(done, total, row)`` is called from the calling thread as each
+    item finishes, so it may safely update UI elements. With a
+    ``prescore_threshold``, resumes whose offline keyword score falls below it
+    skip the model call and are ranked from the provisional score. Returns
+    ranked rows.
+    """
+    rows = []
+    total = len(resumes)
+    scorer = PreScorer(jd) if prescore_threshold is not None else None
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, _screen_one, name, source, jd, analyze_fn,
+                            extract_fn, scorer, prescore_threshold)
+            for name, source in resumes
+        ]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            if on_progress:
+                on_progress(len(rows), total, row)
+    return rank_results(rows)
+
+def rank_results(rows):
+    """Order rows best-first: match score, then fewer high-priority gaps, then more hits."""
+    ranked = sorted(
+        rows,
+        key=lambda row: (
+            STATUS_ORDER.get(row["status"], len(STATUS_ORDER)),
+            -row["jd_match"],
+            row["missing_high_priority"],
+            -row["present_keywords"]
+        )
+    )
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+    return ranked
+
+def write_results_csv(rows, output):
+    writer = csv.DictWriter(output, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.result_model import Analysis
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "candidates.sqlite3")
+
+# Common spellings folded onto one canonical skill
+SKILL_ALIASES = {
+    "k8s": "kubernetes",
+    "certified kubernetes administrator": "cka",
+    "certified kubernetes application developer": "ckad",
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "postgres": "postgresql",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "ci cd": "ci/cd",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "react.js": "react",
+    "reactjs": "react"
+}
+
+QUERY_OPERATORS = {"AND", "OR", "NOT", "(", ")"}
+
+def normalize_skill(skill):
+    """Canonical form of a skill: lowercase, no qualifiers in brackets, aliases folded."""
+    skill = re.sub(r"\(.*?\)|\[.*?\]", " ", str(skill).lower())
+    skill = skill.split(" - ")[0].split(":")[0]
+    skill = re.sub(r"[^a-z0-9+#./ ]+", " ", skill)
+    skill = " ".join(skill.split()).strip(" ./")
+    return SKILL_ALIASES.get(skill, skill)
+
+def extract_skills(analysis, text=""):
+    """Skills a candidate demonstrably has, from their analysis and resume text.
+
+    Present keywords and present skills are indexed as-is. Certifications in
+    the analysis are recommendations for the role, so they are indexed only
+    when the resume text actually mentions them.
+    """
+    analysis = Analysis.from_dict(analysis)
+    skills = {normalize_skill(kw.keyword) for kw in analysis.keywords.present if kw.keyword}
+    skills.update(normalize_skill(skill) for skill in analysis.role_analysis.present_skills)
+    lowered_text = (text or "").lower()
+    for cert in analysis.industry_metrics.certifications:
+        name = normalize_skill(cert)
+        if name and name in lowered_text:
+            skills.add(name)
+        acronym = re.search(r"\(([A-Za-z0-9-]{2,10})\)", cert)
+        if acronym and re.search(rf"\b{re.escape(acronym.group(1).lower())}\b", lowered_text):
+            skills.add(normalize_skill(acronym.group(1)))
+    skills.discard("")
+    return skills
+
+def _tokenize_query(query):
+    return re.findall(r'"[^"]+"|\(|\)|[^\s()]+', query)
+
+class _QueryParser:
+    """Recursive-descent parser for boolean skill queries.
+
+    Grammar: ``expr := term (OR term)*``, ``term := factor ([AND] factor)*``,
+    ``factor := NOT factor | ( expr ) | skill``. A skill is a quoted phrase or
+    a run of words that are not operators, so ``machine learning AND aws``
+    works without quotes.
+    """
+
+    def __init__(self, query, lookup, universe):
+        self.tokens = _tokenize_query(query)
+        self.position = 0
+        self.lookup = lookup
+        self.universe = universe
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            return set()
+        result = self._expr()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()}' in query")
+        return result
+
+    def _expr(self):
+        result = self._term()
+        while self._peek() == "OR":
+            self._next()
+            result = result | self._term()
+        return result
+
+    def _term(self):
+        result = self._factor()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+            result = result & self._factor()
+        return result
+
+    def _factor(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ended unexpectedly")
+        if token == "NOT":
+            self._next()
+            return self.universe() - self._factor()
+        if token == "(":
+            self._next()
+            result = self._expr()
+            if self._next() != ")":
+                raise ValueError("Missing closing parenthesis")
+            return result
+        if token in (")", "AND", "OR"):
+            raise ValueError(f"Unexpected '{token}' in query")
+        if token.startswith('"'):
+            self._next()
+            return self.lookup(token.strip('"'))
+        words = []
+        while self._peek() is not None and self._peek() not in QUERY_OPERATORS and not self._peek().startswith('"'):
+            words.append(self._next())
+        return self.lookup(" ".join(words))
+
+class CandidateIndex:
+    """Persistent store of analyzed candidates with an in-memory inverted skill index.
+
+    Analyses live in SQLite in their compact ``Analysis.to_bytes`` form.
+    Posting lists (skill -> set of candidate ids) are rebuilt from it on
+    startup and updated incrementally by ``add``.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                jd_hash TEXT NOT NULL,
+                jd_match REAL NOT NULL,
+                skills TEXT NOT NULL,
+                text TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (content_hash, jd_hash)
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._skills = {}
+        self._summaries = {}
+        for row in self._conn.execute("SELECT id, name, jd_match, skills, created_at FROM candidates"):
+            self._index(row[0], row[1], row[2], set(json.loads(row[3])), row[4])
+
+    def __len__(self):
+        return len(self._skills)
+
+    def _index(self, candidate_id, name, jd_match, skills, created_at):
+        for skill in self._skills.get(candidate_id, ()):
+            self._postings[skill].discard(candidate_id)
+        self._skills[candidate_id] = skills
+        self._summaries[candidate_id] = {"id": candidate_id, "name": name, "jd_match": jd_match, "indexed_at": created_at}
+        for skill in skills:
+            self._postings.setdefault(skill, set()).add(candidate_id)
+
+    def add(self, name, text, analysis, jd=""):
+        """Store (or refresh) a candidate's analysis (an ``Analysis`` or schema dict) for a JD and index its skills."""
+        analysis = Analysis.from_dict(analysis)
+        content_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        jd_hash = hashlib.sha256((jd or "").encode("utf-8")).hexdigest()
+        skills = extract_skills(analysis, text)
+        jd_match = analysis.jd_match
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO candidates (name, content_hash, jd_hash, jd_match, skills, text, analysis, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (content_hash, jd_hash) DO UPDATE SET
+                    name = excluded.name, jd_match = excluded.jd_match, skills = excluded.skills,
+                    analysis = excluded.analysis, created_at = excluded.created_at
+                """,
+                (name, content_hash, jd_hash, jd_match, json.dumps(sorted(skills)), text,
+                 analysis.to_bytes(), now)
+            )
+            self._conn.commit()
+            candidate_id = self._conn.execute(
+                "SELECT id FROM candidates WHERE content_hash = ? AND jd_hash = ?", (content_hash, jd_hash)
+            ).fetchone()[0]
+            self._index(candidate_id, name, jd_match, skills, now)
+        return candidate_id
+
+    def search(self, query):
+        """Candidate ids matching a boolean query such as ``kubernetes AND (cka OR ckad) NOT java``."""
+        with self._lock:
+            return _QueryParser(query, self._lookup, lambda: set(self._skills)).parse()
+
+    def _lookup(self, phrase):
+        skill = normalize_skill(phrase)
+        if skill in self._postings or " " not in skill:
+            return set(self._postings.get(skill, ()))
+        # Unknown multi-word phrases such as "kubernetes cka" mean every word
+        result = None
+        for word in skill.split():
+            postings = self._postings.get(SKILL_ALIASES.get(word, word), set())
+            result = set(postings) if result is None else result & postings
+        return result
+
+    def rank(self, skills, limit=50):
+        """Rank candidates by IDF-weighted overlap with the wanted skills, best first.
+
+        Returns ``(candidate_id, score, matched_skills)`` tuples; ties are
+        broken by the candidate's JD match score.
+        """
+        wanted = {normalize_skill(skill) for skill in skills if normalize_skill(skill)}
+        total = max(1, len(self._skills))
+        scores = {}
+        matched = {}
+        with self._lock:
+            for skill in wanted:
+                postings = self._postings.get(skill, ())
+                if not postings:
+                    continue
+                idf = math.log(1 + total / len(postings))
+                for candidate_id in postings:
+                    scores[candidate_id] = scores.get(candidate_id, 0.0) + idf
+                    matched.setdefault(candidate_id, []).append(skill)
+            ranked = sorted(
+                scores,
+                key=lambda candidate_id: (-scores[candidate_id], -self._summaries[candidate_id]["jd_match"])
+            )
+        return [(candidate_id, round(scores[candidate_id], 3), sorted(matched[candidate_id]))
+                for candidate_id in ranked[:limit]]
+
+    def summaries(self, candidate_ids):
+        with self._lock:
+            return [dict(self._summaries[candidate_id], skills=sorted(self._skills[candidate_id]))
+                    for candidate_id in candidate_ids if candidate_id in self._summaries]
+
+    def get_analysis(self, candidate_id):
+        """The stored ``Analysis`` of a candidate, or None."""
+        row = self._conn.execute("SELECT analysis FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        if row is None:
+            return None
+        # Rows written before analyses were stored compactly hold JSON text
+        return Analysis.from_bytes(row[0]) if isinstance(row[0], bytes) else Analysis.from_json(row[0])
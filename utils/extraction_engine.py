@@ -0,0 +1,205 @@
+import json
+import os
+import signal
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.file_processors import extract_document
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+DEFAULT_TIMEOUT_SECONDS = 30
+
+# How long past its timeout a document may run before the pool is recycled;
+# only a worker the in-process timer cannot interrupt (stuck in native code,
+# or on a platform without SIGALRM) gets that far
+TIMEOUT_GRACE_SECONDS = 5
+
+def iter_sources(paths):
+    """Yield ``(doc_id, source)`` for every resume in the given files, folders and zips.
+
+    ``source`` is either ``("file", path)`` or ``("zip", zip_path, member)`` so
+    workers can open documents themselves instead of receiving pickled bytes.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for filename in sorted(files):
+                    full_path = os.path.join(root, filename)
+                    if filename.lower().endswith('.zip'):
+                        yield from iter_sources([full_path])
+                    elif filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.relpath(full_path, path), ("file", full_path)
+        elif path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    if member.lower().endswith(SUPPORTED_EXTENSIONS) and not member.startswith('__MACOSX/'):
+                        yield f"{os.path.basename(path)}:{member}", ("zip", path, member)
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            yield os.path.basename(path), ("file", path)
+
+def _read_source(source):
+    if source[0] == "zip":
+        with zipfile.ZipFile(source[1]) as archive:
+            return source[2], archive.read(source[2])
+    with open(source[1], "rb") as f:
+        return source[1], f.read()
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Extraction timed out")
+
+def _extract_worker(doc_id, source, timeout):
+    # SIGALRM interrupts pathological pure-Python parses inside the worker
+    # itself, so one bad PDF cannot pin a pool process forever. setitimer,
+    # unlike alarm(), keeps fractions of a second.
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        name, data = _read_source(source)
+        result = extract_document(name, data=data)
+        return {
+            "id": doc_id,
+            "hash": result.content_hash,
+            "text": result.text,
+            "metadata": {
+                "name": os.path.basename(name),
+                "bytes": len(data),
+                "page_count": result.page_count,
+                "chars": len(result.text),
+                "truncated": result.truncated,
+                "extraction_time": round(result.extraction_time, 4)
+            }
+        }
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def iter_corpus(corpus_path):
+    """Stream records from a JSONL corpus without loading it all into memory."""
+    if not os.path.exists(corpus_path):
+        return
+    with open(corpus_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _stop_pool(executor):
+    """Shut a pool down without waiting for hung workers, which are killed."""
+    # Python 3.14 can do this itself; earlier versions only expose the processes
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+    else:
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+def ingest_documents(paths, corpus_path, errors_path=None, max_workers=None,
+                     timeout=DEFAULT_TIMEOUT_SECONDS, on_progress=None):
+    """Extract many resumes across a process pool into an append-only JSONL corpus.
+
+    Documents already present in the corpus (by id) are skipped, and documents
+    whose content hash is already stored are recorded as duplicates rather
+    than written twice. Failures and timeouts are appended to ``errors_path``
+    (default: ``<corpus>.errors.jsonl``). A document still running
+    ``TIMEOUT_GRACE_SECONDS`` after its timeout fails with a timeout, and the
+    pool is replaced so its worker is freed; the documents running beside it
+    are retried. Returns a summary report.
+    """
+    errors_path = errors_path or os.path.splitext(corpus_path)[0] + ".errors.jsonl"
+    directory = os.path.dirname(corpus_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    known_ids = set()
+    known_hashes = set()
+    for record in iter_corpus(corpus_path):
+        known_ids.add(record["id"])
+        known_hashes.add(record["hash"])
+
+    all_sources = list(iter_sources(paths))
+    sources = [(doc_id, source) for doc_id, source in all_sources if doc_id not in known_ids]
+    report = {
+        "queued": len(sources),
+        "written": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "skipped_existing": len(all_sources) - len(sources),
+        "errors": [],
+        "seconds": 0.0
+    }
+    started = time.perf_counter()
+
+    # Only as many documents as there are workers are submitted at a time, so
+    # each one starts running about when it is submitted
+    workers = max_workers or os.cpu_count() or 1
+    queue = deque(sources)
+    running = {}
+    done = 0
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        with open(corpus_path, "a", encoding="utf-8") as corpus, \
+                open(errors_path, "a", encoding="utf-8") as errors:
+
+            def fail(doc_id, e):
+                error = {"id": doc_id, "error": type(e).__name__, "message": str(e)}
+                errors.write(json.dumps(error, ensure_ascii=False) + "\n")
+                report["errors"].append(error)
+                report["failed"] += 1
+
+            def progress(doc_id):
+                nonlocal done
+                done += 1
+                if on_progress:
+                    on_progress(done, len(sources), doc_id)
+
+            while queue or running:
+                while queue and len(running) < workers:
+                    doc_id, source = queue.popleft()
+                    future = executor.submit(_extract_worker, doc_id, source, timeout)
+                    running[future] = (doc_id, source, time.monotonic())
+
+                wait_seconds = None
+                if timeout:
+                    oldest = min(submitted for _, _, submitted in running.values())
+                    wait_seconds = max(0, oldest + timeout + TIMEOUT_GRACE_SECONDS - time.monotonic())
+                finished, _ = wait(running, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    doc_id, _, _ = running.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        fail(doc_id, e)
+                    else:
+                        if record["hash"] in known_hashes:
+                            report["duplicates"] += 1
+                        else:
+                            known_hashes.add(record["hash"])
+                            corpus.write(json.dumps(record, ensure_ascii=False) + "\n")
+                            report["written"] += 1
+                    progress(doc_id)
+
+                now = time.monotonic()
+                hung = [future for future, (_, _, submitted) in running.items()
+                        if timeout and now - submitted >= timeout + TIMEOUT_GRACE_SECONDS]
+                if hung:
+                    for future in hung:
+                        doc_id, _, _ = running.pop(future)
+                        fail(doc_id, TimeoutError("Extraction timed out"))
+                        progress(doc_id)
+                    # Killing the hung workers breaks the pool; the others start over in a new one
+                    queue.extendleft(reversed([(doc_id, source) for doc_id, source, _ in running.values()]))
+                    running.clear()
+                    _stop_pool(executor)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        if running:
+            _stop_pool(executor)
+        else:
+            executor.shutdown(wait=True)
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
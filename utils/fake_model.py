@@ -0,0 +1,70 @@
+import json
+import random
+import threading
+import time
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+class FakeResponse:
+    """Mimics a google.generativeai response: iterable chunks plus ``.text``."""
+
+    def __init__(self, chunks, chunk_delay=0.0, first_chunk_delay=0.0):
+        self._chunks = chunks
+        self._chunk_delay = chunk_delay
+        self._first_chunk_delay = first_chunk_delay
+
+    def __iter__(self):
+        for i, chunk in enumerate(self._chunks):
+            time.sleep(self._first_chunk_delay if i == 0 else self._chunk_delay)
+            yield FakeChunk(chunk)
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+class FakeModel:
+    """Local stand-in for ``genai.GenerativeModel`` that replays a recorded response.
+
+    Recordings are JSON files of the form ``{"chunks": ["...", ...]}`` holding
+    the streamed text chunks of one real response, optionally with
+    ``chunk_delay`` / ``first_chunk_delay`` seconds to replay realistic timing.
+    With ``jitter`` each response's delays are scaled by a random factor in
+    ``1 ± jitter``, drawn from a generator seeded with ``seed``.
+    """
+
+    def __init__(self, chunks, chunk_delay=0.0, first_chunk_delay=0.0, jitter=0.0, seed=0):
+        self.chunks = list(chunks)
+        self.chunk_delay = chunk_delay
+        self.first_chunk_delay = first_chunk_delay
+        self.jitter = jitter
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_recording(cls, path, **overrides):
+        with open(path, encoding="utf-8") as f:
+            recording = json.load(f)
+        options = {
+            "chunk_delay": recording.get("chunk_delay", 0.0),
+            "first_chunk_delay": recording.get("first_chunk_delay", 0.0)
+        }
+        options.update(overrides)
+        return cls(recording["chunks"], **options)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        with self._lock:
+            self.calls += 1
+            scale = 1 + self._random.uniform(-self.jitter, self.jitter) if self.jitter else 1
+        response = FakeResponse(self.chunks, self.chunk_delay * scale, self.first_chunk_delay * scale)
+        if not stream:
+            # A blocking call costs the whole generation time up front
+            for _ in response:
+                pass
+        return response
+
+def split_into_chunks(text, chunk_size=120):
+    """Split a full response into fixed-size chunks to build a recording."""
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
@@ -1,26 +1,139 @@
-import PyPDF2 as pdf
-import docx
+import hashlib
 import io
+import time
+from collections import namedtuple
+from itertools import islice
 
-def input_pdf_text(uploaded_file):
+from utils import tracing
+
+# Oversized uploads (scanned portfolios, 100+ page CVs) are cut off here
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 100_000
+
+# PDF pages are joined with a form feed so later stages can find page boundaries
+PAGE_SEPARATOR = "\n\f\n"
+
+# PyPDF2 and python-docx are imported on first use, so importing this module
+# (e.g. for the web app's first page) does not pay for both parsers
+
+# page_count is None for Word documents, which have no fixed pagination
+ExtractionResult = namedtuple(
+    "ExtractionResult",
+    ["text", "page_count", "extraction_time", "content_hash", "truncated"]
+)
+
+def iter_pdf_pages(uploaded_file, max_pages=None):
+    """Yield the text of each PDF page lazily, stopping after ``max_pages``."""
+    import PyPDF2 as pdf
     reader = pdf.PdfReader(uploaded_file)
-    text = ""
-    for page in range(len(reader.pages)):
-        page = reader.pages[page]
-        text += str(page.extract_text())
-    return text
+    for page in islice(reader.pages, max_pages):
+        yield page.extract_text() or ""
+
+def _iter_table_rows(table):
+    for row in table.rows:
+        cells = []
+        for cell in row.cells:
+            # Merged cells are repeated by python-docx; keep each text once per row
+            text = cell.text.strip()
+            if text and text not in cells:
+                cells.append(text)
+        if cells:
+            yield " | ".join(cells)
+
+def _iter_block_items(container):
+    """Yield paragraph and table text from a document body or header in order."""
+    from docx.table import Table
+    for block in container.iter_inner_content():
+        if isinstance(block, Table):
+            yield from _iter_table_rows(block)
+        else:
+            yield block.text
+
+def _iter_header_footer_text(doc, attribute):
+    seen = set()
+    for section in doc.sections:
+        part = getattr(section, attribute)
+        if part.is_linked_to_previous:
+            continue
+        for text in _iter_block_items(part):
+            if text.strip() and text not in seen:
+                seen.add(text)
+                yield text
 
-def input_word_text(uploaded_file):
+def iter_docx_blocks(uploaded_file):
+    """Yield headers, body paragraphs/tables and footers of a Word document in reading order."""
+    import docx
     doc = docx.Document(uploaded_file)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+    yield from _iter_header_footer_text(doc, "header")
+    yield from _iter_block_items(doc)
+    yield from _iter_header_footer_text(doc, "footer")
+
+def collect_text(chunks, separator="\n", max_chars=None):
+    """Join chunks once, stopping early when ``max_chars`` is reached.
+
+    Returns ``(text, truncated)``.
+    """
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if max_chars is not None and size + len(chunk) > max_chars:
+            parts.append(chunk[:max(0, max_chars - size)])
+            return separator.join(parts), True
+        parts.append(chunk)
+        size += len(chunk) + len(separator)
+    return separator.join(parts), False
+
+def input_pdf_text(uploaded_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    return collect_text(iter_pdf_pages(uploaded_file, max_pages), separator=PAGE_SEPARATOR, max_chars=max_chars)[0]
+
+def input_word_text(uploaded_file, max_chars=DEFAULT_MAX_CHARS):
+    return collect_text(iter_docx_blocks(uploaded_file), max_chars=max_chars)[0]
+
+def _file_name(uploaded_file):
+    # Accept Streamlit uploads as well as plain filesystem paths (batch CLI)
+    return str(getattr(uploaded_file, "name", uploaded_file)).lower()
+
+def read_file_bytes(uploaded_file):
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    if hasattr(uploaded_file, "read"):
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        uploaded_file.seek(0)
+        return data
+    with open(uploaded_file, "rb") as f:
+        return f.read()
+
+def hash_file_bytes(data):
+    return hashlib.sha256(data).hexdigest()
 
 def read_file_text(uploaded_file):
-    if uploaded_file.name.endswith('.pdf'):
+    name = _file_name(uploaded_file)
+    if name.endswith('.pdf'):
         return input_pdf_text(uploaded_file)
-    elif uploaded_file.name.endswith(('.docx', '.doc')):
+    elif name.endswith(('.docx', '.doc')):
         return input_word_text(uploaded_file)
     else:
         raise ValueError("Unsupported file format. Please upload PDF or Word documents.")
+
+def extract_document(uploaded_file, data=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    """Extract text once and return it with page count, timing and content hash."""
+    if data is None:
+        data = read_file_bytes(uploaded_file)
+    name = _file_name(uploaded_file)
+    started = time.perf_counter()
+    with tracing.span("extract", file_bytes=len(data)) as attributes:
+        if name.endswith('.pdf'):
+            import PyPDF2 as pdf
+            reader = pdf.PdfReader(io.BytesIO(data))
+            page_count = len(reader.pages)
+            pages = (page.extract_text() or "" for page in islice(reader.pages, max_pages))
+            text, truncated = collect_text(pages, separator=PAGE_SEPARATOR, max_chars=max_chars)
+            truncated = truncated or (max_pages is not None and page_count > max_pages)
+        elif name.endswith(('.docx', '.doc')):
+            page_count = None
+            text, truncated = collect_text(iter_docx_blocks(io.BytesIO(data)), max_chars=max_chars)
+        else:
+            raise ValueError("Unsupported file format. Please upload PDF or Word documents.")
+        attributes["text_chars"] = len(text)
+    return ExtractionResult(text, page_count, time.perf_counter() - started, hash_file_bytes(data), truncated)
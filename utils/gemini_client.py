@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from utils import tracing
+from utils.fake_model import FakeModel
+from utils.prompt_templates import estimate_tokens
+from utils.retry import backoff_delay, call_with_backoff, is_retryable_error
+from utils.single_flight import SingleFlight
+
+MODEL_NAME = "gemini-pro"
+
+# Cheaper, faster model answering the first pass of tiered routing (see
+# utils/model_routing.py); "local" uses the offline pre-scorer instead
+FAST_MODEL_ENV = "JOBFITAI_FAST_MODEL"
+DEFAULT_FAST_MODEL_NAME = "gemini-1.5-flash"
+
+# Point at a recording (see utils/fake_model.py) to run without the Gemini API
+FAKE_MODEL_ENV = "JOBFITAI_FAKE_MODEL"
+# Point at another server speaking the Gemini REST API, e.g. benchmarks/stub_server.py
+API_ENDPOINT_ENV = "JOBFITAI_API_ENDPOINT"
+
+DEFAULT_MAX_RETRIES = 5
+
+GENERATION_CONFIG = {
+    "temperature": 0,
+    "top_p": 1,
+    "top_k": 1,
+    "max_output_tokens": 2048
+}
+
+# The first pass leaves out Interview_Prep and the industry metrics, about a
+# third of a full response
+FAST_GENERATION_CONFIG = dict(GENERATION_CONFIG, max_output_tokens=1536)
+
+# Add a safety prefix to ensure JSON-only response
+SAFETY_PREFIX = "Respond ONLY with valid JSON. No other text, explanations, or formatting."
+
+def _size_attributes(kind, text):
+    return {f"{kind}_bytes": len(text.encode("utf-8")), f"{kind}_tokens": estimate_tokens(text)}
+
+def _usage_attributes(response):
+    usage = getattr(response, "usage_metadata", None)
+    if not usage or not getattr(usage, "total_token_count", 0):
+        return {}
+    return {
+        "prompt_token_count": usage.prompt_token_count,
+        "response_token_count": usage.candidates_token_count
+    }
+
+class GeminiClient:
+    """One configured model shared by every caller in the process.
+
+    The model, its generation config and the underlying transport are built
+    once, so repeated calls reuse the same keep-alive connections (a gRPC
+    channel, or a pooled HTTP session with the REST transport) instead of
+    setting up a new client per request. With ``api_endpoint`` the client
+    talks REST to that server, which may be plain http for a local stub.
+    Calls retry rate-limit and transient server errors with jittered
+    exponential backoff, and concurrent calls with an identical prompt share
+    one request (see ``flights.stats()`` for how many were deduplicated).
+    ``generation_config`` defaults to ``GENERATION_CONFIG``.
+    """
+
+    def __init__(self, api_key=None, model_name=MODEL_NAME, api_endpoint=None, transport=None,
+                 max_retries=DEFAULT_MAX_RETRIES, model=None, generation_config=None):
+        self.max_retries = max_retries
+        self.api_endpoint = api_endpoint
+        self.model_name = model_name
+        self.config = dict(generation_config or GENERATION_CONFIG)
+        self.flights = SingleFlight("model_call")
+        if not isinstance(model, FakeModel):
+            # The SDK takes most of a second to import; headless callers with a fake model never need it
+            import google.generativeai as genai
+        if model is None:
+            client_options = {"api_key": api_key or os.getenv("GOOGLE_API_KEY")}
+            if api_endpoint:
+                client_options["api_endpoint"] = api_endpoint
+                transport = transport or "rest"
+            genai.configure(transport=transport, client_options=client_options)
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+        self.generation_config = (
+            None if isinstance(model, FakeModel) else genai.types.GenerationConfig(**self.config)
+        )
+
+    def prompt_key(self, full_prompt):
+        payload = f"{self.model_name}\n{sorted(self.config.items())}\n{full_prompt}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _generate(self, full_prompt, rate_limiter, cancelled):
+        if cancelled.is_set():
+            raise CancelledError("Every caller stopped waiting for this response")
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        return self.model.generate_content(full_prompt, generation_config=self.generation_config)
+
+    def generate(self, prompt, max_retries=None, rate_limiter=None, cancel_event=None, timeout=None):
+        """Return the stripped response text, raising on failure once retries run out.
+
+        ``rate_limiter.wait()`` is called before every attempt, retries
+        included. If the same prompt is already in flight, this waits for that
+        call instead of sending another. Setting ``cancel_event`` or passing
+        ``timeout`` stops this caller waiting; the request itself is abandoned
+        between retries once nobody is waiting for it.
+        """
+        full_prompt = SAFETY_PREFIX + "\n" + prompt
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        def call(cancelled):
+            return self._generate_with_retries(full_prompt, max_retries, rate_limiter, cancelled)
+
+        return self.flights.do(self.prompt_key(full_prompt), call, cancel_event=cancel_event, timeout=timeout)
+
+    def _generate_with_retries(self, full_prompt, max_retries, rate_limiter, cancelled):
+        with tracing.span("model_call", **_size_attributes("prompt", full_prompt)) as attributes:
+            response = call_with_backoff(self._generate, full_prompt, rate_limiter, cancelled,
+                                         max_retries=max_retries)
+
+            if not response.text:
+                raise ValueError("Empty response received from Gemini")
+
+            attributes.update(_size_attributes("response", response.text))
+            attributes.update(_usage_attributes(response))
+            return response.text.strip()
+
+    def stream(self, prompt, max_retries=None, rate_limiter=None):
+        """Yield response text chunks as they are generated.
+
+        Failures before the first chunk are retried like ``generate``; once
+        text has been yielded an error is raised to the caller.
+        """
+        full_prompt = SAFETY_PREFIX + "\n" + prompt
+        max_retries = self.max_retries if max_retries is None else max_retries
+        with tracing.span("model_call", stream=True, **_size_attributes("prompt", full_prompt)) as attributes:
+            started = time.perf_counter()
+            received = []
+            attempt = 0
+            while True:
+                try:
+                    if rate_limiter is not None:
+                        rate_limiter.wait()
+                    response = self.model.generate_content(
+                        full_prompt,
+                        generation_config=self.generation_config,
+                        stream=True
+                    )
+                    for chunk in response:
+                        if chunk.text:
+                            if not received:
+                                attributes["first_chunk_seconds"] = round(time.perf_counter() - started, 6)
+                            received.append(chunk.text)
+                            yield chunk.text
+                    break
+                except Exception as e:
+                    if received or attempt >= max_retries or not is_retryable_error(e):
+                        raise
+                    time.sleep(backoff_delay(attempt))
+                    attempt += 1
+            attributes["retries"] = attempt
+            attributes.update(_size_attributes("response", "".join(received)))
+
+    async def generate_async(self, prompt, max_retries=None, rate_limiter=None):
+        """Async ``generate`` for event-loop callers; shares the same pooled client.
+
+        The call runs on a worker thread, so it works with every transport
+        (including the REST stub) and never ties the client to one event loop.
+        """
+        return await asyncio.to_thread(self.generate, prompt, max_retries, rate_limiter)
+
+_client = None
+_fast_client = None
+_client_lock = threading.Lock()
+
+def create_client(api_key=None, **options):
+    """Build a client from the environment: a replayed recording, a custom endpoint, or Gemini."""
+    recording = os.getenv(FAKE_MODEL_ENV)
+    if recording:
+        return GeminiClient(model=FakeModel.from_recording(recording), **options)
+    return GeminiClient(api_key=api_key, api_endpoint=os.getenv(API_ENDPOINT_ENV) or None, **options)
+
+def configure_gemini(api_key=None, **options):
+    """Create the shared client, replacing any previous one, and return it."""
+    global _client
+    with _client_lock:
+        _client = create_client(api_key, **options)
+        return _client
+
+def get_client():
+    """The shared client, created from the environment on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+def get_fast_client():
+    """The shared first-pass client for tiered routing, created from the environment on first use."""
+    global _fast_client
+    if _fast_client is None:
+        with _client_lock:
+            if _fast_client is None:
+                _fast_client = create_client(model_name=os.getenv(FAST_MODEL_ENV) or DEFAULT_FAST_MODEL_NAME,
+                                             generation_config=FAST_GENERATION_CONFIG)
+    return _fast_client
+
+def generate_response(prompt, max_retries=None, rate_limiter=None):
+    """Call Gemini and return the stripped response text, raising on failure."""
+    return get_client().generate(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+
+def stream_response(prompt, max_retries=None, rate_limiter=None):
+    """Yield response text chunks as Gemini generates them."""
+    return get_client().stream(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+
+async def generate_response_async(prompt, max_retries=None, rate_limiter=None):
+    """Await the stripped response text without blocking the event loop."""
+    return await get_client().generate_async(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
@@ -0,0 +1,115 @@
+import re
+from collections import namedtuple
+
+from utils import tracing
+from utils.analysis_cache import normalize_text
+from utils.gemini_client import generate_response
+from utils.prompt_templates import create_section_prompt
+from utils.response_parser import REQUIRED_KEYS, ResponseParseError, parse_response_sections
+from utils.text_compaction import split_sections
+
+# The inputs an analysis was generated from, kept so an edited resume or JD
+# can be compared against them
+Snapshot = namedtuple("Snapshot", ["text", "jd", "analysis"])
+
+# sections: analysis sections to re-request, in schema order;
+# changed_resume_sections: headings of resume sections added, removed or edited
+ReanalysisPlan = namedtuple("ReanalysisPlan", ["sections", "changed_resume_sections", "jd_changed"])
+
+# Resume headings are matched against these fragments in order, so
+# "Technical Skills" is skills and "Volunteer Experience" is experience
+RESUME_SECTION_KINDS = [
+    ("skills", ("skill", "competenc", "technolog", "tools")),
+    ("experience", ("experience", "employment", "work history", "career history", "project", "leadership",
+                    "volunteer", "activities")),
+    ("education", ("education", "academic", "qualification", "certif", "licens", "training", "course")),
+    ("summary", ("summary", "profile", "objective", "about"))
+]
+
+# Analysis sections that read each kind of resume section. Interview_Prep and
+# the industry sections are driven by the job description, so a resume edit
+# never re-requests them.
+AFFECTED_SECTIONS = {
+    "skills": ("JD_Match", "Match_Analysis", "Keywords_Analysis", "Role_Analysis", "Resume_Enhancement"),
+    "experience": ("JD_Match", "Match_Analysis", "Keywords_Analysis", "Profile_Summary", "Role_Analysis",
+                   "Resume_Enhancement"),
+    "education": ("JD_Match", "Match_Analysis", "Keywords_Analysis", "Resume_Enhancement"),
+    "summary": ("Match_Analysis", "Profile_Summary", "Resume_Enhancement"),
+    "header": ("Profile_Summary",),
+    "other": ("JD_Match", "Match_Analysis", "Keywords_Analysis", "Profile_Summary", "Resume_Enhancement")
+}
+
+def _heading_key(heading):
+    return re.sub(r"\s+", " ", heading).strip().lower()
+
+def resume_section_kind(heading, structured=True):
+    """Classify a resume heading; text before the first heading is the header only if headings follow."""
+    if not heading:
+        return "header" if structured else "other"
+    name = _heading_key(heading)
+    for kind, fragments in RESUME_SECTION_KINDS:
+        if any(fragment in name for fragment in fragments):
+            return kind
+    return "other"
+
+def _section_map(text):
+    sections = {}
+    for i, (heading, body) in enumerate(split_sections(text or "")):
+        key = _heading_key(heading)
+        # A name in capitals reads as a heading; an unrecognised first section is the header
+        if i == 0 and resume_section_kind(key) == "other":
+            key = ""
+        sections[key] = f"{sections[key]} {normalize_text(body)}" if key in sections else normalize_text(body)
+    return sections
+
+def diff_resume_sections(old_text, new_text):
+    """Headings of the resume sections added, removed or edited between two versions."""
+    old = _section_map(old_text)
+    new = _section_map(new_text)
+    return [heading for heading in dict.fromkeys([*old, *new]) if old.get(heading) != new.get(heading)]
+
+def plan_reanalysis(previous, text, jd):
+    """Work out which analysis sections an edit to the resume or JD invalidates.
+
+    A changed job description invalidates everything; a resume edit only the
+    sections that read the kind of resume section that changed.
+    """
+    jd_changed = normalize_text(previous.jd) != normalize_text(jd)
+    changed = diff_resume_sections(previous.text, text)
+    if jd_changed:
+        return ReanalysisPlan(list(REQUIRED_KEYS), changed, True)
+
+    # Unstructured text has nothing but a "header", which stands for the whole resume
+    structured = len(_section_map(previous.text)) > 1 and len(_section_map(text)) > 1
+    affected = set()
+    for heading in changed:
+        affected.update(AFFECTED_SECTIONS[resume_section_kind(heading, structured)])
+    missing = [key for key in REQUIRED_KEYS if key not in previous.analysis]
+    return ReanalysisPlan([key for key in REQUIRED_KEYS if key in affected or key in missing], changed, False)
+
+def reanalyze(previous, text, jd, call_model=None, plan=None):
+    """Bring ``previous.analysis`` up to date with an edited resume or JD.
+
+    Only the sections in ``plan`` (default: ``plan_reanalysis``) are
+    re-requested, in one call for just those sections, and merged over the
+    previous analysis. Returns ``(analysis, plan)``; raises
+    ResponseParseError when the response is unusable or lacks a section.
+    """
+    if call_model is None:
+        call_model = generate_response
+    if plan is None:
+        plan = plan_reanalysis(previous, text, jd)
+
+    analysis = {key: previous.analysis[key] for key in REQUIRED_KEYS if key in previous.analysis}
+    if plan.sections:
+        with tracing.span("prompt_build", sections=len(plan.sections)):
+            prompt = create_section_prompt(plan.sections, text, jd)
+        parsed = parse_response_sections(call_model(prompt))
+        missing = [key for key in plan.sections if key not in parsed]
+        if missing:
+            raise ResponseParseError(f"Response is missing {', '.join(missing)}")
+        analysis.update((key, parsed[key]) for key in plan.sections)
+
+    tracing.count("sections_reused", len(REQUIRED_KEYS) - len(plan.sections))
+    tracing.count("sections_requested", len(plan.sections))
+    return {key: analysis[key] for key in REQUIRED_KEYS}, plan
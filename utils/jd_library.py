@@ -0,0 +1,215 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from utils.analysis_cache import normalize_text
+from utils.prescorer import tokenize
+
+DEFAULT_LIBRARY_PATH = os.path.join(".cache", "jd_library")
+
+# Hashed term buckets per vector; 1024 keeps collisions rare for JD-sized vocabularies
+EMBEDDING_DIM = 1024
+
+# Rows scored per matrix product, so memory stays bounded however large the library grows
+SEARCH_BLOCK_ROWS = 16384
+
+JDMatch = namedtuple("JDMatch", ["jd_id", "title", "similarity"])
+
+def embed_text(text, dim=EMBEDDING_DIM):
+    """Hashed unigram and bigram vector of ``text``, L2-normalized, as float32.
+
+    Terms use the pre-scorer's tokenizer and stopwords; counts are log-scaled
+    and bigrams weighted higher, as in the pre-scorer. Each term hashes to a
+    bucket and a sign, so no vocabulary has to be fitted or stored.
+    """
+    tokens = tokenize(text)
+    counts = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+    vector = np.zeros(dim, dtype=np.float32)
+    for term, count in counts.items():
+        digest = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+        weight = (1.0 + math.log(count)) * (1.5 if " " in term else 1.0)
+        vector[digest % dim] += weight if digest >> 63 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class JDLibrary:
+    """Stored job descriptions with local embeddings, for ranking many JDs against one resume.
+
+    Titles and texts live in SQLite. Vectors are rows of an append-only
+    float32 file read through ``np.memmap``, so opening the library reads no
+    vectors and a search pages in only what it scores. Search is exact
+    cosine similarity over blocks of ``SEARCH_BLOCK_ROWS`` rows, with the
+    query weighted by squared IDF: the same ranking as TF-IDF on both sides,
+    without re-embedding stored JDs as document frequencies change.
+    """
+
+    def __init__(self, path=DEFAULT_LIBRARY_PATH, dim=EMBEDDING_DIM):
+        os.makedirs(path, exist_ok=True)
+        self.dim = dim
+        self._vectors_path = os.path.join(path, f"vectors_{dim}.f32")
+        self._doc_freq_path = os.path.join(path, f"doc_freq_{dim}.npy")
+        self._conn = sqlite3.connect(os.path.join(path, "jds.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jds (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                content_hash TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._matrix = None
+        rows = self._conn.execute("SELECT id, title, active FROM jds ORDER BY id").fetchall()
+        self._titles = [title for _, title, _ in rows]
+        self._active = np.array([bool(active) for _, _, active in rows], dtype=bool)
+        self._repair_vectors()
+        self._doc_freq = self._load_doc_freq()
+
+    def __len__(self):
+        return int(self._active.sum())
+
+    def _repair_vectors(self):
+        """Match the vector file to the table after a crash between the two writes."""
+        expected = len(self._titles) * self.dim * 4
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        if size > expected:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(expected)
+        elif size < expected:
+            texts = [text for (text,) in self._conn.execute("SELECT text FROM jds ORDER BY id")]
+            with open(self._vectors_path, "wb") as f:
+                f.write(np.stack([embed_text(text, self.dim) for text in texts]).tobytes())
+
+    def _load_doc_freq(self):
+        """Stored JDs per hash bucket, rebuilt from the vectors if missing or stale."""
+        if os.path.exists(self._doc_freq_path):
+            doc_freq = np.load(self._doc_freq_path)
+            if doc_freq.shape == (self.dim + 1,) and doc_freq[-1] == len(self._titles):
+                return doc_freq
+        doc_freq = np.zeros(self.dim + 1, dtype=np.int64)
+        matrix = self._vectors()
+        for start in range(0, len(matrix), SEARCH_BLOCK_ROWS):
+            doc_freq[:-1] += (np.asarray(matrix[start:start + SEARCH_BLOCK_ROWS]) != 0).sum(axis=0)
+        doc_freq[-1] = len(matrix)
+        self._save_doc_freq(doc_freq)
+        return doc_freq
+
+    def _save_doc_freq(self, doc_freq):
+        temporary = f"{self._doc_freq_path}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, doc_freq)
+        os.replace(temporary, self._doc_freq_path)
+
+    def _vectors(self):
+        if not self._titles:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self._matrix is None or len(self._matrix) != len(self._titles):
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self._titles), self.dim))
+        return self._matrix
+
+    def add_many(self, jds):
+        """Store ``(title, text)`` pairs and return their ids.
+
+        A JD already in the library (same text, ignoring whitespace) keeps its
+        id and vector; it is re-activated and takes the new title.
+        """
+        ids = []
+        new = {}
+        now = time.time()
+        with self._lock:
+            next_id = len(self._titles)
+            for title, text in jds:
+                content_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+                if content_hash in new:
+                    jd_id = new[content_hash][0]
+                    new[content_hash] = (jd_id, title, content_hash, text, now)
+                    ids.append(jd_id)
+                    continue
+                row = self._conn.execute("SELECT id FROM jds WHERE content_hash = ?", (content_hash,)).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE jds SET title = ?, active = 1 WHERE id = ?", (title, row[0]))
+                    self._titles[row[0]] = title
+                    self._active[row[0]] = True
+                    ids.append(row[0])
+                    continue
+                new[content_hash] = (next_id + len(new), title, content_hash, text, now)
+                ids.append(new[content_hash][0])
+
+            if new:
+                new = list(new.values())
+                vectors = np.stack([embed_text(text, self.dim) for _, _, _, text, _ in new])
+                # Vectors first: a crash before the commit leaves extra rows that _repair_vectors trims
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                self._conn.executemany(
+                    "INSERT INTO jds (id, title, content_hash, text, active, created_at) VALUES (?, ?, ?, ?, 1, ?)",
+                    new
+                )
+                self._titles.extend(title for _, title, _, _, _ in new)
+                self._active = np.concatenate([self._active, np.ones(len(new), dtype=bool)])
+                # The last slot counts the JDs, so a stale file is detected on open
+                doc_freq = self._doc_freq.copy()
+                doc_freq[:-1] += (vectors != 0).sum(axis=0)
+                doc_freq[-1] += len(new)
+                self._save_doc_freq(doc_freq)
+                self._doc_freq = doc_freq
+            self._conn.commit()
+        return ids
+
+    def add(self, title, text):
+        return self.add_many([(title, text)])[0]
+
+    def remove(self, jd_id):
+        """Leave a JD out of searches (e.g. a closed requisition); adding its text again restores it."""
+        with self._lock:
+            self._conn.execute("UPDATE jds SET active = 0 WHERE id = ?", (jd_id,))
+            self._conn.commit()
+            if 0 <= jd_id < len(self._active):
+                self._active[jd_id] = False
+
+    def get(self, jd_id):
+        row = self._conn.execute("SELECT id, title, text, active FROM jds WHERE id = ?", (jd_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "title": row[1], "text": row[2], "active": bool(row[3])}
+
+    def search(self, text, top_k=10):
+        """The ``top_k`` active JDs most similar to ``text`` (e.g. a resume), best first, as ``JDMatch``."""
+        with self._lock:
+            matrix = self._vectors()
+            active = self._active.copy()
+            titles = list(self._titles)
+            doc_freq = self._doc_freq
+        if top_k <= 0 or not len(matrix):
+            return []
+
+        idf = np.log((1.0 + doc_freq[-1]) / (1.0 + doc_freq[:-1])) + 1.0
+        query = embed_text(text, self.dim) * (idf * idf).astype(np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query /= norm
+
+        best_ids = []
+        best_scores = []
+        for start in range(0, len(matrix), SEARCH_BLOCK_ROWS):
+            scores = np.asarray(matrix[start:start + SEARCH_BLOCK_ROWS]) @ query
+            scores[~active[start:start + len(scores)]] = -np.inf
+            top = np.argpartition(-scores, top_k - 1)[:top_k] if len(scores) > top_k else np.arange(len(scores))
+            best_ids.append(top + start)
+            best_scores.append(scores[top])
+        ids = np.concatenate(best_ids)
+        scores = np.concatenate(best_scores)
+        order = np.lexsort((ids, -scores))[:top_k]
+        return [JDMatch(int(ids[i]), titles[ids[i]], round(float(scores[i]), 4))
+                for i in order if np.isfinite(scores[i])]
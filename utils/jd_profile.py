@@ -0,0 +1,88 @@
+import copy
+import json
+
+from utils import tracing
+from utils.analysis_cache import make_cache_key
+from utils.gemini_client import GENERATION_CONFIG
+from utils.prompt_templates import (
+    PROMPT_VERSION,
+    JD_PROFILE_SECTIONS,
+    create_candidate_prompt,
+    create_jd_profile_prompt
+)
+from utils.response_parser import (
+    REQUIRED_KEYS,
+    ResponseParseError,
+    fill_missing_sections,
+    get_default_response,
+    parse_response_sections
+)
+from utils.single_flight import SingleFlight
+
+# Concurrent first-time computations of the same profile share one model call
+_profile_flights = SingleFlight("jd_profile")
+
+def jd_profile_key(jd):
+    return make_cache_key("", jd, f"{PROMPT_VERSION}:jd_profile", GENERATION_CONFIG)
+
+def get_jd_profile(jd, call_model, cache=None):
+    """Return the JD profile, computing it with one model call the first time a JD is seen."""
+    key = jd_profile_key(jd)
+    if cache is not None:
+        profile = cache.get(key)
+        if profile is not None:
+            return profile
+
+    def run(cancelled):
+        parsed = parse_response_sections(call_model(create_jd_profile_prompt(jd)))
+        missing = [name for name in JD_PROFILE_SECTIONS if name not in parsed]
+        if missing:
+            raise ResponseParseError(f"JD profile is missing sections: {', '.join(missing)}")
+        profile = {name: parsed[name] for name in JD_PROFILE_SECTIONS}
+        if cache is not None:
+            cache.set(key, profile)
+        return profile
+
+    # Every waiter gets its own copy of the shared profile
+    return copy.deepcopy(_profile_flights.do(key, run))
+
+def compact_jd_profile(profile):
+    """The subset of the profile a per-resume prompt needs, as compact JSON."""
+    context = profile.get("Industry_Context", {})
+    role = profile.get("Role_Analysis", {})
+    metrics = profile.get("Industry_Specific_Metrics", {})
+    compact = {
+        "Domain": context.get("Domain"),
+        "Role_Type": context.get("Role_Type"),
+        "Requirements": context.get("Industry_Specific_Requirements", []),
+        "Responsibilities": role.get("Core_Responsibilities", []),
+        "Required_Skills": role.get("Required_Skills", []),
+        "Certifications": metrics.get("Certifications", []),
+        "Tools": metrics.get("Tools_And_Software", [])
+    }
+    return json.dumps(compact, separators=(",", ":"), ensure_ascii=False)
+
+def merge_jd_profile(candidate, profile):
+    """Combine per-resume sections with the shared JD profile into the full analysis schema."""
+    analysis = dict(candidate)
+    for name in JD_PROFILE_SECTIONS:
+        if name != "Role_Analysis":
+            analysis[name] = profile[name]
+
+    role_analysis = dict(get_default_response()["Role_Analysis"])
+    role_analysis.update(profile.get("Role_Analysis", {}))
+    role_analysis.update(candidate.get("Role_Analysis", {}))
+    analysis["Role_Analysis"] = role_analysis
+
+    fill_missing_sections(analysis)
+    return {key: analysis[key] for key in REQUIRED_KEYS}
+
+def analyze_with_jd_profile(text, jd, call_model, cache=None, profile=None):
+    """Analyze one resume using the cached JD profile plus a smaller resume-only generation."""
+    if profile is None:
+        profile = get_jd_profile(jd, call_model, cache)
+    with tracing.span("prompt_build") as attributes:
+        prompt = create_candidate_prompt(text, compact_jd_profile(profile))
+        attributes["prompt_chars"] = len(prompt)
+    candidate = parse_response_sections(call_model(prompt))
+    return merge_jd_profile(candidate, profile)
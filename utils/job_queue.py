@@ -0,0 +1,252 @@
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+
+DEFAULT_QUEUE_PATH = os.path.join(".cache", "jobs.sqlite3")
+
+# A job moves queued -> running -> done | failed; "failed" means the worker
+# itself crashed, while analysis errors are part of a "done" result
+JOB_STATUSES = ["queued", "running", "done", "failed"]
+
+WEBHOOK_TIMEOUT_SECONDS = 10
+
+# Comma-separated hosts webhooks may go to; when set, no other host is allowed
+# (listed hosts may be internal). Unset, any host with a public address is allowed
+WEBHOOK_HOSTS_ENV = "JOBFITAI_WEBHOOK_HOSTS"
+
+class JobQueue:
+    """Durable FIFO of analysis jobs in SQLite, shared by the API and its workers.
+
+    Each job stores the uploaded resume bytes and the JD until a worker
+    claims it. Jobs left ``running`` by a crashed process are queued again
+    when the queue is reopened.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                name TEXT NOT NULL,
+                resume BLOB,
+                jd TEXT,
+                mode TEXT NOT NULL,
+                webhook_url TEXT,
+                webhook_status TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        self._conn.execute("UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'")
+        self._conn.commit()
+
+    def submit(self, name, data, jd, mode="full", webhook_url=None):
+        """Queue an analysis and return its job ID immediately."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, name, resume, jd, mode, webhook_url, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, name, sqlite3.Binary(data), jd, mode, webhook_url, time.time())
+            )
+            self._conn.commit()
+            self._available.notify()
+        return job_id
+
+    def claim(self, timeout=None):
+        """Take the oldest queued job as ``(id, name, data, jd, mode)``, waiting up to ``timeout``.
+
+        Returns None on timeout or once the queue is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while not self._closed:
+                row = self._conn.execute(
+                    "SELECT id, name, resume, jd, mode FROM jobs WHERE status = 'queued' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row[0])
+                    )
+                    self._conn.commit()
+                    return row[0], row[1], bytes(row[2]), row[3], row[4]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._available.wait(remaining)
+            return None
+
+    def finish(self, job_id, result=None, error=None):
+        """Store a job's result (or the worker's error) and drop its uploaded resume."""
+        status = "failed" if error is not None else "done"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, resume = NULL, jd = NULL, finished_at = ? "
+                "WHERE id = ?",
+                (status, None if result is None else json.dumps(result, ensure_ascii=False), error,
+                 time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def set_webhook_status(self, job_id, webhook_status):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (webhook_status, job_id))
+            self._conn.commit()
+
+    def get(self, job_id):
+        """The job's status, timings and (once finished) result, or None for an unknown ID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, name, mode, webhook_url, webhook_status, result, error, "
+                "created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(["id", "status", "name", "mode", "webhook_url", "webhook_status", "result", "error",
+                        "created_at", "started_at", "finished_at"], row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+    def close(self):
+        """Wake every waiting worker so it can exit; the database stays readable."""
+        with self._lock:
+            self._closed = True
+            self._available.notify_all()
+
+def webhook_hosts_from_env():
+    hosts = os.getenv(WEBHOOK_HOSTS_ENV, "")
+    return {host.strip().lower() for host in hosts.split(",") if host.strip()} or None
+
+def _is_public_address(address):
+    ip = ipaddress.ip_address(address.split("%")[0])
+    return ip.is_global and not ip.is_multicast
+
+def check_webhook_url(url, allowed_hosts=None):
+    """Raise ValueError unless ``url`` is an http(s) URL a webhook may be sent to.
+
+    With ``allowed_hosts`` the host must be one of them. Otherwise every
+    address the host resolves to must be public, so a client cannot make the
+    server call loopback, private-network or cloud metadata addresses.
+    """
+    if not isinstance(url, str):
+        raise ValueError("webhook_url must be a URL string")
+    parts = urllib.parse.urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.netloc or not parts.hostname:
+        raise ValueError("webhook_url must be an http or https URL with a host")
+    host = parts.hostname.lower()
+    if allowed_hosts is not None:
+        if host not in allowed_hosts:
+            raise ValueError(f"webhook_url host {host} is not allowed")
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parts.port or None, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, ValueError) as e:
+        raise ValueError(f"webhook_url host {host} cannot be resolved") from e
+    if not addresses or not all(_is_public_address(address) for address in addresses):
+        raise ValueError(f"webhook_url host {host} is not a public address")
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # A redirect could point the POST at a host that was never checked
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+_webhook_opener = urllib.request.build_opener(_NoRedirect)
+
+def post_webhook(url, payload, timeout=WEBHOOK_TIMEOUT_SECONDS, allowed_hosts=None):
+    """Check ``url`` (see ``check_webhook_url``), POST ``payload`` as JSON and return the HTTP status code.
+
+    Redirects are not followed.
+    """
+    check_webhook_url(url, allowed_hosts)
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with _webhook_opener.open(request, timeout=timeout) as response:
+        return response.status
+
+class JobWorkers:
+    """A pool of threads that run queued jobs through ``analyze_fn``.
+
+    ``analyze_fn(name, data, jd, mode)`` returns the JSON-ready result
+    stored for the job. When a job has a webhook URL, the finished job is
+    POSTed there once; delivery failures are recorded on the job, not retried.
+    ``webhook_hosts`` is passed to ``check_webhook_url`` before each delivery.
+    """
+
+    def __init__(self, queue, analyze_fn, workers=4, poll_seconds=1.0, webhook_hosts=None):
+        self.queue = queue
+        self.analyze_fn = analyze_fn
+        self.poll_seconds = poll_seconds
+        self.webhook_hosts = webhook_hosts
+        self._stopped = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self.queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _work(self):
+        while not self._stopped.is_set():
+            job = self.queue.claim(timeout=self.poll_seconds)
+            if job is None:
+                continue
+            job_id, name, data, jd, mode = job
+            try:
+                result = self.analyze_fn(name, data, jd, mode)
+            except Exception as e:
+                self.queue.finish(job_id, error=str(e))
+            else:
+                self.queue.finish(job_id, result=result)
+            self._notify(job_id)
+
+    def _notify(self, job_id):
+        job = self.queue.get(job_id)
+        if not job["webhook_url"]:
+            return
+        try:
+            status = post_webhook(job["webhook_url"], job, allowed_hosts=self.webhook_hosts)
+            self.queue.set_webhook_status(job_id, str(status))
+        except Exception as e:
+            self.queue.set_webhook_status(job_id, f"error: {e}")
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from utils import tracing
+from utils.gemini_client import FAST_MODEL_ENV, generate_response, get_fast_client
+from utils.prescorer import prescore_resume
+from utils.prompt_templates import create_analysis_prompt, create_section_prompt, estimate_tokens
+from utils.response_parser import (
+    REQUIRED_KEYS, ResponseParseError, fill_missing_sections, parse_match_score, parse_response_sections,
+    parse_response_text
+)
+
+# A model the router sends prompts to: call_model(prompt) returns the response
+# text, or is None for the offline pre-scorer. Costs are dollars per 1,000
+# prompt and response tokens, for the cost counters
+Tier = namedtuple("Tier", ["name", "call_model", "input_cost", "output_cost"])
+
+# List prices when this was written; pass your own Tier when they change
+FAST_TIER_COSTS = (0.000075, 0.0003)
+FULL_TIER_COSTS = (0.0005, 0.0015)
+
+# FAST_MODEL_ENV value that answers the first pass with the pre-scorer
+LOCAL_TIER = "local"
+
+# first_pass_sections: what the fast tier is asked for; the rest wait for the
+# full tier until someone asks for them, e.g. by opening their tab.
+# ambiguous_band: first-pass JD match scores (inclusive) too close to call,
+# which are re-analyzed in full by the full tier
+RoutingPolicy = namedtuple("RoutingPolicy", ["first_pass_sections", "ambiguous_band"])
+
+DEFAULT_POLICY = RoutingPolicy(
+    first_pass_sections=tuple(key for key in REQUIRED_KEYS if key not in ("Interview_Prep", "Industry_Specific_Metrics")),
+    ambiguous_band=(40.0, 75.0)
+)
+
+# analysis: the full schema, with defaults for the pending sections;
+# first_pass_score: the JD match the routing decision used (None if the fast
+# tier failed); tier: the tier that produced the match score;
+# pending: sections not generated yet, in schema order
+RoutedAnalysis = namedtuple("RoutedAnalysis", ["analysis", "first_pass_score", "tier", "pending"])
+
+TIER_COUNTERS = ["calls", "errors", "seconds", "input_tokens", "output_tokens", "cost"]
+
+class ModelRouter:
+    """Sends each analysis to a cheap tier first and to the expensive tier only when needed.
+
+    The fast tier (a smaller model, or the local pre-scorer) answers the
+    policy's first-pass sections. A JD match inside the ambiguous band, or a
+    failed first pass, escalates to one full analysis by the full tier;
+    otherwise the remaining sections stay pending until ``complete`` asks
+    the full tier for them. Calls are counted per tier (calls, errors,
+    seconds, tokens, cost) in ``stats()`` and in the active trace.
+    """
+
+    def __init__(self, fast, full, policy=DEFAULT_POLICY):
+        self.fast = fast
+        self.full = full
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._tiers = {}
+        self._routes = {}
+
+    def _record(self, tier, seconds, input_tokens=0, output_tokens=0, failed=False):
+        values = {
+            "calls": 1,
+            "errors": int(failed),
+            "seconds": round(seconds, 6),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": round((input_tokens * tier.input_cost + output_tokens * tier.output_cost) / 1000, 8)
+        }
+        with self._lock:
+            totals = self._tiers.setdefault(tier.name, dict.fromkeys(TIER_COUNTERS, 0))
+            for name, value in values.items():
+                totals[name] += value
+        for name, value in values.items():
+            tracing.count(f"tier_{tier.name}_{name}", value)
+
+    def _route(self, route):
+        with self._lock:
+            self._routes[route] = self._routes.get(route, 0) + 1
+        tracing.count(f"route_{route}")
+
+    def _call(self, tier, prompt, reason):
+        input_tokens = estimate_tokens(prompt)
+        started = time.perf_counter()
+        with tracing.span("model_route", tier=tier.name, reason=reason):
+            try:
+                response = tier.call_model(prompt)
+            except Exception:
+                self._record(tier, time.perf_counter() - started, input_tokens, failed=True)
+                raise
+        self._record(tier, time.perf_counter() - started, input_tokens, estimate_tokens(response or ""))
+        return response
+
+    def _first_pass(self, text, jd, policy):
+        if self.fast.call_model is None:
+            started = time.perf_counter()
+            _, provisional = prescore_resume(text, jd)
+            self._record(self.fast, time.perf_counter() - started)
+            return provisional
+        with tracing.span("prompt_build", tier=self.fast.name):
+            prompt = create_section_prompt(list(policy.first_pass_sections), text, jd)
+        parsed = parse_response_sections(self._call(self.fast, prompt, "first_pass"))
+        if "JD_Match" not in parsed:
+            raise ResponseParseError("First pass response has no JD_Match")
+        return {key: parsed[key] for key in policy.first_pass_sections if key in parsed}
+
+    def analyze(self, text, jd, policy=None):
+        """Route one resume/JD analysis; returns a ``RoutedAnalysis``, raising if the full tier fails."""
+        policy = policy or self.policy
+        try:
+            first_pass = self._first_pass(text, jd, policy)
+        except Exception:
+            first_pass = None
+            score = None
+            route = "fast_failed"
+        else:
+            score = parse_match_score(first_pass["JD_Match"])
+            low, high = policy.ambiguous_band
+            route = "ambiguous" if low <= score <= high else "fast_only"
+        self._route(route)
+
+        if first_pass is None or route == "ambiguous":
+            with tracing.span("prompt_build", tier=self.full.name):
+                prompt = create_analysis_prompt(text, jd)
+            analysis = parse_response_text(self._call(self.full, prompt, route))
+            return RoutedAnalysis(analysis, score, self.full.name, ())
+
+        pending = fill_missing_sections(first_pass)
+        return RoutedAnalysis({key: first_pass[key] for key in REQUIRED_KEYS}, score, self.fast.name,
+                              tuple(pending))
+
+    def complete(self, routed, text, jd, sections):
+        """Generate whichever of ``sections`` are still pending with the full tier.
+
+        Returns the updated ``RoutedAnalysis`` (``routed`` itself if there is
+        nothing to do); raises ResponseParseError if a section is missing
+        from the response.
+        """
+        wanted = [key for key in routed.pending if key in sections]
+        if not wanted:
+            return routed
+        self._route("on_demand")
+        with tracing.span("prompt_build", tier=self.full.name, sections=len(wanted)):
+            prompt = create_section_prompt(wanted, text, jd)
+        parsed = parse_response_sections(self._call(self.full, prompt, "on_demand"))
+        missing = [key for key in wanted if key not in parsed]
+        if missing:
+            raise ResponseParseError(f"Response is missing {', '.join(missing)}")
+        analysis = dict(routed.analysis)
+        analysis.update((key, parsed[key]) for key in wanted)
+        return routed._replace(analysis=analysis, pending=tuple(key for key in routed.pending if key not in wanted))
+
+    def stats(self):
+        """Per-tier totals (with mean seconds per call) and how many analyses took each route."""
+        with self._lock:
+            tiers = {name: dict(totals) for name, totals in self._tiers.items()}
+            routes = dict(self._routes)
+        for totals in tiers.values():
+            totals["mean_seconds"] = totals["seconds"] / totals["calls"] if totals["calls"] else 0.0
+        return {"tiers": tiers, "routes": routes}
+
+def default_tiers(full_call_model=None, rate_limiter=None, max_retries=5):
+    """``(fast, full)`` tiers from the environment.
+
+    The fast tier is ``FAST_MODEL_ENV`` (default: the shared fast client),
+    or the pre-scorer when that is ``"local"``; the full tier is
+    ``full_call_model(prompt)`` (default: the shared Gemini client).
+    """
+    if os.getenv(FAST_MODEL_ENV, "").strip().lower() == LOCAL_TIER:
+        fast = Tier(LOCAL_TIER, None, 0.0, 0.0)
+    else:
+        def call_fast(prompt):
+            return get_fast_client().generate(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+
+        fast = Tier("fast", call_fast, *FAST_TIER_COSTS)
+    if full_call_model is None:
+        def full_call_model(prompt):
+            return generate_response(prompt, max_retries=max_retries, rate_limiter=rate_limiter)
+    return fast, Tier("full", full_call_model, *FULL_TIER_COSTS)
+
+def make_router(full_call_model=None, rate_limiter=None, max_retries=5, policy=DEFAULT_POLICY):
+    return ModelRouter(*default_tiers(full_call_model, rate_limiter, max_retries), policy=policy)
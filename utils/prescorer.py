@@ -0,0 +1,137 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# Resumes scoring below this are not worth an LLM call by default
+DEFAULT_PRESCORE_THRESHOLD = 15.0
+DEFAULT_MAX_KEYWORDS = 40
+
+# Keeps tech tokens such as c++, c#, node.js and ci/cd intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could
+do does each either etc for from has have having he her his how i if in including into is it
+its may more most must of on or other our over per plus preferred required requirements
+responsibilities role she should such than that the their them they this those through to
+under up us using we well were what when where which while who will with within would you your
+ability able across candidate company experience familiarity good great job knowledge looking
+new strong team teams work working years year skills skill plus understanding excellent
+build building design designing develop developing own operate partner support ensure help
+""".split())
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOPWORDS and not token.rstrip("+").isdigit()
+    ]
+
+def _terms(tokens):
+    """Unigrams plus adjacent bigrams ("machine learning", "project management")."""
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+class PreScorer:
+    """Deterministic keyword-overlap scorer fitted once per job description.
+
+    JD terms (unigrams and bigrams) are weighted by log term frequency, with
+    bigrams weighted higher. A resume's score is the weighted share of JD
+    terms it contains, with BM25-style saturation so repeated mentions help
+    a little but never dominate.
+    """
+
+    def __init__(self, jd, max_keywords=DEFAULT_MAX_KEYWORDS):
+        counts = Counter(_terms(tokenize(jd)))
+        weights = {}
+        for term, count in counts.items():
+            if " " in term and count < 2:
+                # One-off bigrams are mostly sentence fragments, not skills
+                continue
+            weights[term] = (1.0 + math.log(count)) * (1.5 if " " in term else 1.0)
+        top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:max_keywords]
+        self.keywords = [term for term, _ in top]
+        self.weights = np.array([weight for _, weight in top], dtype=np.float64)
+        self._index = {term: i for i, term in enumerate(self.keywords)}
+
+    def term_counts(self, texts):
+        """Matrix of JD keyword counts, one row per text."""
+        counts = np.zeros((len(texts), len(self.keywords)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for term, count in Counter(_terms(tokenize(text))).items():
+                column = self._index.get(term)
+                if column is not None:
+                    counts[row, column] = count
+        return counts
+
+    def score_many(self, texts):
+        """Score many resumes at once; returns one result dict per text."""
+        if not self.keywords:
+            return [{"score": 0.0, "present": [], "missing": []} for _ in texts]
+        counts = self.term_counts(texts)
+        saturated = counts / (counts + 0.5)
+        scores = saturated @ self.weights / self.weights.sum() * 100.0
+        results = []
+        for row, score in zip(counts, scores):
+            present_mask = row > 0
+            results.append({
+                "score": round(float(score), 1),
+                "present": [self.keywords[i] for i in np.flatnonzero(present_mask)],
+                "missing": [self.keywords[i] for i in np.flatnonzero(~present_mask)]
+            })
+        return results
+
+    def score(self, text):
+        return self.score_many([text])[0]
+
+    def importance(self, keyword):
+        """Bucket a keyword's weight into high/medium/low terciles of the JD weights."""
+        weight = self.weights[self._index[keyword]]
+        high, low = np.percentile(self.weights, [66.7, 33.3])
+        if weight >= high:
+            return "high"
+        return "medium" if weight >= low else "low"
+
+def _match_context(keyword, text, width=40):
+    match = re.search(re.escape(keyword), text, re.IGNORECASE)
+    if not match:
+        return "Mentioned in resume"
+    start = max(0, match.start() - width)
+    snippet = " ".join(text[start:match.end() + width].split())
+    return f"...{snippet}..."
+
+def to_provisional_analysis(result, scorer, text):
+    """Shape a pre-score like the model's JD_Match and Keywords_Analysis sections."""
+    return {
+        "JD_Match": f"{result['score']:.0f}%",
+        "Keywords_Analysis": {
+            "Missing_Keywords": [
+                {
+                    "keyword": keyword,
+                    "category": "keyword",
+                    "importance": scorer.importance(keyword),
+                    "suggestion": "Add this job description term where it genuinely applies"
+                }
+                for keyword in result["missing"]
+            ],
+            "Present_Keywords": [
+                {
+                    "keyword": keyword,
+                    "category": "keyword",
+                    "match_context": _match_context(keyword, text),
+                    "alignment": "Exact term match"
+                }
+                for keyword in result["present"]
+            ]
+        }
+    }
+
+def prescore_resume(text, jd, scorer=None):
+    """Score one resume offline and return ``(result, provisional_analysis)``."""
+    scorer = scorer or PreScorer(jd)
+    result = scorer.score(text)
+    return result, to_provisional_analysis(result, scorer, text)
+
+def should_escalate(result, threshold=DEFAULT_PRESCORE_THRESHOLD):
+    """True when a resume scores high enough to deserve the full LLM analysis."""
+    return threshold is None or result["score"] >= threshold
@@ -1,30 +1,22 @@
-def create_analysis_prompt(text, jd):
-    return f"""
-    Act as an advanced ATS (Applicant Tracking System) with comprehensive expertise across all professional domains. 
-    Analyze the resume against the job description while considering current market trends and industry-specific requirements.
-    
-    Resume: {text}
-    Job Description: {jd}
-    
-    First, carefully identify and analyze:
-    1. Essential keywords from the job description (including skills, qualifications, tools, and technologies)
-    2. Industry-specific terminology and requirements
-    3. Required certifications, qualifications, and experience
-    4. Key responsibilities and performance indicators
-    5. Current market trends and industry standards
-    
-    You MUST respond ONLY with a valid JSON object in the exact format shown below. Do not include any other text or explanation:
+# Bump whenever the prompt wording or schema changes so cached analyses are invalidated.
+PROMPT_VERSION = "1"
 
-    {{
-        "Industry_Context": {{
+# Expected JSON shape of each top-level section, in the order the model is asked to emit them.
+SECTION_SCHEMAS = {
+    "Industry_Context": """
+        "Industry_Context": {
             "Domain": "Primary industry domain",
             "Role_Type": "Role category",
             "Industry_Specific_Requirements": [
                 "Clear, specific requirements from JD"
             ]
-        }},
-        "JD_Match": "XX%",
-        "Match_Analysis": {{
+        }
+""",
+    "JD_Match": """
+        "JD_Match": "XX%"
+""",
+    "Match_Analysis": """
+        "Match_Analysis": {
             "Score": "XX%",
             "Reasoning": "Clear explanation of match score based on industry standards",
             "Strength_Areas": [
@@ -33,27 +25,33 @@ def create_analysis_prompt(text, jd):
             "Improvement_Areas": [
                 "Specific area needing improvement"
             ]
-        }},
-        "Keywords_Analysis": {{
+        }
+""",
+    "Keywords_Analysis": """
+        "Keywords_Analysis": {
             "Missing_Keywords": [
-                {{
+                {
                     "keyword": "Specific missing keyword",
                     "category": "skill|tool|qualification|certification",
                     "importance": "high|medium|low",
                     "suggestion": "How and where to add this keyword"
-                }}
+                }
             ],
             "Present_Keywords": [
-                {{
+                {
                     "keyword": "Specific present keyword",
                     "category": "skill|tool|qualification|certification",
                     "match_context": "How it appears in resume",
                     "alignment": "How well it aligns with JD requirements"
-                }}
+                }
             ]
-        }},
-        "Profile_Summary": "Detailed profile summary highlighting industry-relevant experience and qualifications",
-        "Resume_Enhancement": {{
+        }
+""",
+    "Profile_Summary": """
+        "Profile_Summary": "Detailed profile summary highlighting industry-relevant experience and qualifications"
+""",
+    "Resume_Enhancement": """
+        "Resume_Enhancement": {
             "Industry_Alignment": [
                 "Specific alignment suggestion with industry standards"
             ],
@@ -66,8 +64,10 @@ def create_analysis_prompt(text, jd):
             "Format_Suggestions": [
                 "Industry-standard format improvement with examples"
             ]
-        }},
-        "Interview_Prep": {{
+        }
+""",
+    "Interview_Prep": """
+        "Interview_Prep": {
             "Industry_Knowledge": [
                 "Specific industry topic with current trends"
             ],
@@ -83,8 +83,10 @@ def create_analysis_prompt(text, jd):
             "Practice_Tips": [
                 "Specific practice tip with implementation steps"
             ]
-        }},
-        "Role_Analysis": {{
+        }
+""",
+    "Role_Analysis": """
+        "Role_Analysis": {
             "Core_Responsibilities": [
                 "Specific responsibility with success metrics"
             ],
@@ -103,8 +105,10 @@ def create_analysis_prompt(text, jd):
             "Career_Growth": [
                 "Specific growth path with timeline and milestones"
             ]
-        }},
-        "Industry_Specific_Metrics": {{
+        }
+""",
+    "Industry_Specific_Metrics": """
+        "Industry_Specific_Metrics": {
             "Key_Performance_Indicators": [
                 "Specific KPI with measurement criteria"
             ],
@@ -114,8 +118,70 @@ def create_analysis_prompt(text, jd):
             "Tools_And_Software": [
                 "Specific tool with proficiency requirement"
             ]
-        }}
-    }}
+        }
+"""
+}
+
+# Role_Analysis split into the JD-only half (JD profile) and the resume-dependent half
+ROLE_REQUIREMENTS_SCHEMA = """
+        "Role_Analysis": {
+            "Core_Responsibilities": [
+                "Specific responsibility with success metrics"
+            ],
+            "Required_Skills": [
+                "Specific required skill with proficiency level"
+            ],
+            "Industry_Insights": [
+                "Specific industry insight with market context"
+            ],
+            "Career_Growth": [
+                "Specific growth path with timeline and milestones"
+            ]
+        }
+"""
+
+CANDIDATE_ROLE_SCHEMA = """
+        "Role_Analysis": {
+            "Present_Skills": [
+                "Specific skill found in resume with evidence"
+            ],
+            "Learning_Path": [
+                "Specific learning suggestion with resources"
+            ]
+        }
+"""
+
+JD_PROFILE_SECTIONS = ["Industry_Context", "Role_Analysis", "Interview_Prep", "Industry_Specific_Metrics"]
+CANDIDATE_SECTIONS = ["JD_Match", "Match_Analysis", "Keywords_Analysis", "Profile_Summary", "Resume_Enhancement"]
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token) for budgeting and benchmarks."""
+    return (len(text or "") + 3) // 4
+
+def _json_block(members):
+    return "{\n" + ",\n".join(member.strip("\n") for member in members) + "\n    }"
+
+def _schema_block(sections):
+    return _json_block(SECTION_SCHEMAS[name] for name in sections)
+
+def create_analysis_prompt(text, jd):
+    return f"""
+    Act as an advanced ATS (Applicant Tracking System) with comprehensive expertise across all professional domains. 
+    Analyze the resume against the job description while considering current market trends and industry-specific requirements.
+    
+    Resume: {text}
+    Job Description: {jd}
+    
+    First, carefully identify and analyze:
+    1. Essential keywords from the job description (including skills, qualifications, tools, and technologies)
+    2. Industry-specific terminology and requirements
+    3. Required certifications, qualifications, and experience
+    4. Key responsibilities and performance indicators
+    5. Current market trends and industry standards
+    
+    You MUST respond ONLY with a valid JSON object in the exact format shown below. Do not include any other text or explanation:
+
+    {_schema_block(SECTION_SCHEMAS)}
     
     Ensure to provide:
     1. Specific, actionable insights with clear implementation steps
@@ -124,3 +190,64 @@ def create_analysis_prompt(text, jd):
     4. Clear prioritization of missing keywords and improvements
     5. Practical, achievable enhancement recommendations
     """
+
+def create_section_prompt(sections, text, jd):
+    """Prompt for a subset of the analysis sections, for smaller parallel generations.
+
+    Pass ``text=None`` for sections that depend only on the job description so
+    the result can be shared by every resume screened against it.
+    """
+    if text is None:
+        subject = "Analyze the job description below while considering current market trends and industry-specific requirements."
+        documents = f"Job Description: {jd}"
+    else:
+        subject = "Analyze the resume against the job description while considering current market trends and industry-specific requirements."
+        documents = f"Resume: {text}\n    Job Description: {jd}"
+    return f"""
+    Act as an advanced ATS (Applicant Tracking System) with comprehensive expertise across all professional domains. 
+    {subject}
+    
+    {documents}
+    
+    You MUST respond ONLY with a valid JSON object in the exact format shown below. Do not include any other text or explanation:
+
+    {_schema_block(sections)}
+    
+    Ensure to provide specific, actionable, evidence-based insights with industry-specific context.
+    """
+
+def create_jd_profile_prompt(jd):
+    """Prompt for everything that depends only on the job description, computed once per JD."""
+    schema = _json_block(
+        ROLE_REQUIREMENTS_SCHEMA if name == "Role_Analysis" else SECTION_SCHEMAS[name]
+        for name in JD_PROFILE_SECTIONS
+    )
+    return f"""
+    Act as an advanced ATS (Applicant Tracking System) with comprehensive expertise across all professional domains. 
+    Build a reusable profile of the job description below while considering current market trends and industry-specific requirements.
+    
+    Job Description: {jd}
+    
+    You MUST respond ONLY with a valid JSON object in the exact format shown below. Do not include any other text or explanation:
+
+    {schema}
+    
+    Ensure to provide specific, actionable insights with industry-specific context for all suggestions.
+    """
+
+def create_candidate_prompt(text, jd_profile):
+    """Prompt for the resume-dependent sections, given a compact JD profile instead of the full JD."""
+    schema = _json_block([SECTION_SCHEMAS[name] for name in CANDIDATE_SECTIONS] + [CANDIDATE_ROLE_SCHEMA])
+    return f"""
+    Act as an advanced ATS (Applicant Tracking System) with comprehensive expertise across all professional domains. 
+    Analyze the resume against the job profile, which was extracted from the job description.
+    
+    Resume: {text}
+    Job Profile: {jd_profile}
+    
+    You MUST respond ONLY with a valid JSON object in the exact format shown below. Do not include any other text or explanation:
+
+    {schema}
+    
+    Ensure to provide evidence-based analysis referencing the resume, with clear prioritization of missing keywords and improvements.
+    """
@@ -1,6 +1,17 @@
 import json
-import streamlit as st
 import re
+from collections import namedtuple
+
+from utils import tracing
+from utils.result_model import Analysis
+from utils.stream_parser import IncrementalSectionParser
+
+class ResponseParseError(ValueError):
+    """The model's response could not be turned into an analysis."""
+
+# errors and warnings are messages for the caller to show; cleaned is the
+# repaired response text, only filled in when parsing with debug=True
+ParsedResponse = namedtuple("ParsedResponse", ["analysis", "errors", "warnings", "cleaned"])
 
 def get_default_response():
     """Return a default response structure when parsing fails."""
@@ -56,80 +67,249 @@ def get_default_response():
         }
     }
 
+# Runs of characters that need no attention inside / outside a JSON string
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]+')
+_BARE_RUN = re.compile(r'[^"{}\[\],:\s]+|\s+')
+_WHITESPACE = re.compile(r'\s*')
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_CLOSERS = {'{': '}', '[': ']'}
+
+def repair_json(text):
+    """Extract and repair the JSON object in a model response in a single scan.
+
+    Skips code fences and prose around the object, drops trailing commas,
+    escapes raw control characters and stray quotes inside strings, and keeps
+    valid escape sequences intact. If the response is truncated, everything
+    after the last complete value is dropped and the open containers are
+    closed, so earlier sections survive; with no complete value at all the
+    result is ``{}``. Raises ValueError if there is no object at all.
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No valid JSON object found in response")
+
+    # The root object is always kept, so a truncation before its first
+    # complete value still leaves a closed (empty) object
+    out = ['{']
+    stack = ['{']
+    expect_key = [True]
+    pending_comma = None
+    safe_length, safe_stack = 1, ('{',)
+    in_string = False
+    string_is_key = False
+    position = start + 1
+    length = len(text)
+
+    while position < length:
+        char = text[position]
+        if in_string:
+            run = _STRING_RUN.match(text, position)
+            if run:
+                out.append(run.group())
+                position = run.end()
+                continue
+            if char == '\\':
+                following = text[position + 1:position + 2]
+                if following and following in _VALID_ESCAPES:
+                    out.append(text[position:position + 2])
+                    position += 2
+                else:
+                    out.append('\\\\')
+                    position += 1
+                continue
+            if char == '"':
+                after = _WHITESPACE.match(text, position + 1).end()
+                if after < length and text[after] not in ',:}]':
+                    # A quote in the middle of prose, not the end of the string
+                    out.append('\\"')
+                    position += 1
+                    continue
+                out.append('"')
+                in_string = False
+                position += 1
+                if not string_is_key:
+                    safe_length, safe_stack = len(out), tuple(stack)
+                continue
+            out.append(_CONTROL_ESCAPES.get(char, '\\u%04x' % ord(char)))
+            position += 1
+            continue
+
+        if char in '{[':
+            pending_comma = None
+            out.append(char)
+            stack.append(char)
+            expect_key.append(char == '{')
+        elif char in '}]':
+            if pending_comma is not None:
+                # Trailing comma before a closer
+                del out[pending_comma]
+                pending_comma = None
+            if not stack:
+                break
+            out.append(_CLOSERS[stack.pop()])
+            expect_key.pop()
+            safe_length, safe_stack = len(out), tuple(stack)
+            if not stack:
+                break
+        elif char == ',':
+            if stack and pending_comma is None:
+                safe_length, safe_stack = len(out), tuple(stack)
+                pending_comma = len(out)
+                out.append(char)
+                expect_key[-1] = stack[-1] == '{'
+        elif char == ':':
+            out.append(char)
+            if expect_key:
+                expect_key[-1] = False
+        elif char == '"':
+            pending_comma = None
+            out.append(char)
+            in_string = True
+            string_is_key = bool(expect_key) and expect_key[-1]
+        else:
+            run = _BARE_RUN.match(text, position)
+            token = run.group()
+            if not token.isspace():
+                pending_comma = None
+            out.append(token)
+            position = run.end()
+            continue
+        position += 1
+
+    if stack:
+        # Truncated: roll back to the last complete value and close what is open
+        del out[safe_length:]
+        out.extend(_CLOSERS[opener] for opener in reversed(safe_stack))
+    return "".join(out)
+
+def recover_sections(json_str):
+    """Parse each top-level section on its own, keeping the ones that are valid."""
+    parser = IncrementalSectionParser()
+    parser.feed(json_str)
+    return parser.sections
+
 def clean_json_string(json_str):
     """Clean and format the JSON string for parsing."""
+    return repair_json(json_str)
+
+REQUIRED_KEYS = [
+    "Industry_Context",
+    "JD_Match",
+    "Match_Analysis",
+    "Keywords_Analysis",
+    "Profile_Summary",
+    "Resume_Enhancement",
+    "Interview_Prep",
+    "Role_Analysis",
+    "Industry_Specific_Metrics"
+]
+
+def fill_missing_sections(parsed_response):
+    """Patch missing top-level sections with defaults and return their names."""
+    missing_keys = [key for key in REQUIRED_KEYS if key not in parsed_response]
+    if missing_keys:
+        default_response = get_default_response()
+        for key in missing_keys:
+            parsed_response[key] = default_response[key]
+    return missing_keys
+
+def load_repaired_json(cleaned_response):
+    """json.loads, falling back to keeping whichever top-level sections are individually valid."""
     try:
-        # Find the first { and last }
-        start_idx = json_str.find('{')
-        end_idx = json_str.rindex('}') + 1
-        
-        if start_idx == -1 or end_idx == -1:
-            raise ValueError("No valid JSON object found in response")
-            
-        json_str = json_str[start_idx:end_idx]
-        
-        # Remove any escaped characters
-        json_str = json_str.replace('\\"', '"')
-        json_str = json_str.replace('\\n', ' ')
-        
-        # Remove trailing commas
-        json_str = re.sub(r',\s*}', '}', json_str)
-        json_str = re.sub(r',\s*]', ']', json_str)
-        
-        return json_str
-    except Exception as e:
-        st.error(f"Error cleaning JSON string: {str(e)}")
-        raise
+        return json.loads(cleaned_response)
+    except json.JSONDecodeError:
+        recovered = recover_sections(cleaned_response)
+        if not recovered:
+            raise
+        return recovered
 
-def parse_gemini_response(response):
+def load_response_json(response):
+    """Parse the JSON object in a model response, repairing it only if it is malformed."""
+    start = response.find('{')
+    end = response.rfind('}') + 1
+    if start != -1 and end > start:
+        try:
+            # Well-formed responses never pay for the repair scan
+            return json.loads(response[start:end])
+        except json.JSONDecodeError:
+            pass
+    return load_repaired_json(repair_json(response))
+
+def parse_response_sections(response):
+    """Parse whatever top-level sections a raw response contains, without filling defaults."""
     if not response:
-        st.error("No response received from the model")
-        return get_default_response()
-    
-    try:
-        # Add debug information
-        with st.expander("Debug Information"):
-            st.text("Raw Response:")
-            st.code(response, language='json')
-        
-        # Clean the response
-        cleaned_response = clean_json_string(response)
-        
-        # Add cleaned response to debug
-        with st.expander("Cleaned Response"):
-            st.code(cleaned_response, language='json')
-        
-        # Parse JSON
+        raise ResponseParseError("No response received from the model")
+    with tracing.span("parse", response_bytes=len(response.encode("utf-8"))):
         try:
-            parsed_response = json.loads(cleaned_response)
-        except json.JSONDecodeError as je:
-            st.error(f"JSON Parse Error at position {je.pos}: {je.msg}")
-            st.error("Problematic character: " + cleaned_response[je.pos-10:je.pos+10])
-            raise
-        
-        # Verify structure
-        required_keys = [
-            "Industry_Context",
-            "JD_Match",
-            "Match_Analysis",
-            "Keywords_Analysis",
-            "Profile_Summary",
-            "Resume_Enhancement",
-            "Interview_Prep",
-            "Role_Analysis",
-            "Industry_Specific_Metrics"
-        ]
-        
-        missing_keys = [key for key in required_keys if key not in parsed_response]
-        
-        if missing_keys:
-            st.warning(f"Missing keys in response: {', '.join(missing_keys)}")
-            default_response = get_default_response()
-            for key in missing_keys:
-                parsed_response[key] = default_response[key]
-        
-        return parsed_response
-        
+            parsed_response = load_response_json(response)
+        except ValueError as e:
+            raise ResponseParseError(str(e)) from e
+    if not isinstance(parsed_response, dict):
+        raise ResponseParseError("Model response is not a JSON object")
+    return parsed_response
+
+def parse_response_text(response):
+    """Parse a raw model response and fill in missing sections; raises ResponseParseError on failure."""
+    parsed_response = parse_response_sections(response)
+    fill_missing_sections(parsed_response)
+    return parsed_response
+
+def parse_analysis(response):
+    """Parse a raw model response into a validated ``Analysis`` in one pass; raises ResponseParseError.
+
+    Missing sections get empty defaults and are listed in
+    ``missing_sections``; no default response is built.
+    """
+    return Analysis.from_dict(parse_response_sections(response))
+
+def parse_match_score(match_percentage):
+    """Convert a "78%"-style match string into a float, defaulting to 0."""
+    try:
+        return float(str(match_percentage).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_gemini_response(response, debug=False, typed=False):
+    """Parse a model response for display, never raising.
+
+    Returns a ``ParsedResponse``. When parsing fails the analysis is the
+    default structure and ``errors`` says why; sections missing from the
+    response are filled with defaults and listed in ``warnings``. With
+    ``debug`` the slower repair path is always taken so ``cleaned`` holds the
+    repaired text. With ``typed`` the analysis is a validated ``Analysis``
+    whose empty defaults stand in for missing sections, so no default
+    response is built.
+    """
+    default = Analysis if typed else get_default_response
+    if not response:
+        return ParsedResponse(default(), ["No response received from the model"], [], None)
+
+    cleaned_response = None
+    try:
+        with tracing.span("parse", response_bytes=len(response.encode("utf-8"))):
+            if debug:
+                # The slower repair path, so the cleaned text can be shown
+                cleaned_response = clean_json_string(response)
+                try:
+                    parsed_response = load_repaired_json(cleaned_response)
+                except json.JSONDecodeError as je:
+                    raise ResponseParseError(
+                        f"JSON Parse Error at position {je.pos}: {je.msg} "
+                        f"(near {cleaned_response[max(je.pos - 10, 0):je.pos + 10]!r})"
+                    ) from je
+            else:
+                parsed_response = load_response_json(response)
+            if not isinstance(parsed_response, dict):
+                raise ValueError("Model response is not a JSON object")
     except Exception as e:
-        st.error(f"Error parsing response: {str(e)}")
-        return get_default_response()
+        return ParsedResponse(default(), [f"Error parsing response: {str(e)}"], [], cleaned_response)
+
+    # Verify structure
+    if typed:
+        parsed_response = Analysis.from_dict(parsed_response)
+        missing_keys = parsed_response.missing_sections
+    else:
+        missing_keys = fill_missing_sections(parsed_response)
+    warnings = [f"Missing keys in response: {', '.join(missing_keys)}"] if missing_keys else []
+    return ParsedResponse(parsed_response, [], warnings, cleaned_response)
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import ClassVar
+
+class Importance(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+    @classmethod
+    def coerce(cls, value):
+        """Map whatever the model wrote ("High", " critical ", None) onto a level, medium by default."""
+        text = str(value or "").strip().lower()
+        if text in ("high", "critical", "essential", "required", "must have"):
+            return cls.HIGH
+        if text in ("low", "optional", "nice to have", "bonus"):
+            return cls.LOW
+        return cls.MEDIUM
+
+def _text(value):
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+def _texts(value):
+    if not value:
+        return ()
+    if isinstance(value, (str, dict)):
+        value = [value]
+    return tuple(text for text in (_text(item) for item in value) if text)
+
+def _percent(value):
+    try:
+        return max(0.0, min(100.0, float(str(value).strip().rstrip('%'))))
+    except (TypeError, ValueError):
+        return 0.0
+
+def _format_percent(value):
+    return f"{value:g}%"
+
+def _plain(value):
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, _Model):
+        return value.to_dict()
+    return value
+
+class _Model:
+    """Schema-driven loading and dumping for the slotted result classes.
+
+    ``SCHEMA`` lists ``(schema_key, attribute, coerce)``; keys missing from
+    the input keep the dataclass default, and ``to_dict`` writes the
+    response schema back out with the same keys.
+    """
+    __slots__ = ()
+    SCHEMA = ()
+    DUMP = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls()
+        return cls(**{attribute: coerce(data[key]) for key, attribute, coerce in cls.SCHEMA if key in data})
+
+    def to_dict(self):
+        return {
+            key: self.DUMP.get(attribute, _plain)(getattr(self, attribute))
+            for key, attribute, _ in self.SCHEMA
+        }
+
+def _models(cls):
+    def load(value):
+        if isinstance(value, dict):
+            value = [value]
+        return tuple(cls.from_dict(item) for item in value or () if isinstance(item, dict))
+    return load
+
+@dataclass(slots=True)
+class MissingKeyword(_Model):
+    keyword: str = ""
+    category: str = ""
+    importance: Importance = Importance.MEDIUM
+    suggestion: str = ""
+    SCHEMA: ClassVar = (
+        ("keyword", "keyword", _text),
+        ("category", "category", _text),
+        ("importance", "importance", Importance.coerce),
+        ("suggestion", "suggestion", _text)
+    )
+
+@dataclass(slots=True)
+class PresentKeyword(_Model):
+    keyword: str = ""
+    category: str = ""
+    match_context: str = ""
+    alignment: str = ""
+    SCHEMA: ClassVar = (
+        ("keyword", "keyword", _text),
+        ("category", "category", _text),
+        ("match_context", "match_context", _text),
+        ("alignment", "alignment", _text)
+    )
+
+@dataclass(slots=True)
+class IndustryContext(_Model):
+    domain: str = "Unknown"
+    role_type: str = "Unknown"
+    requirements: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Domain", "domain", _text),
+        ("Role_Type", "role_type", _text),
+        ("Industry_Specific_Requirements", "requirements", _texts)
+    )
+
+@dataclass(slots=True)
+class MatchAnalysis(_Model):
+    score: float = 0.0
+    reasoning: str = ""
+    strength_areas: tuple = ()
+    improvement_areas: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Score", "score", _percent),
+        ("Reasoning", "reasoning", _text),
+        ("Strength_Areas", "strength_areas", _texts),
+        ("Improvement_Areas", "improvement_areas", _texts)
+    )
+    DUMP: ClassVar = {"score": _format_percent}
+
+@dataclass(slots=True)
+class KeywordsAnalysis(_Model):
+    missing: tuple = ()
+    present: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Missing_Keywords", "missing", _models(MissingKeyword)),
+        ("Present_Keywords", "present", _models(PresentKeyword))
+    )
+
+    @property
+    def high_priority_missing(self):
+        return [kw for kw in self.missing if kw.importance is Importance.HIGH]
+
+@dataclass(slots=True)
+class ResumeEnhancement(_Model):
+    industry_alignment: tuple = ()
+    strategic_tips: tuple = ()
+    keyword_placement: tuple = ()
+    format_suggestions: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Industry_Alignment", "industry_alignment", _texts),
+        ("Strategic_Tips", "strategic_tips", _texts),
+        ("Keyword_Placement", "keyword_placement", _texts),
+        ("Format_Suggestions", "format_suggestions", _texts)
+    )
+
+@dataclass(slots=True)
+class InterviewPrep(_Model):
+    industry_knowledge: tuple = ()
+    technical_topics: tuple = ()
+    common_questions: tuple = ()
+    study_resources: tuple = ()
+    practice_tips: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Industry_Knowledge", "industry_knowledge", _texts),
+        ("Technical_Topics", "technical_topics", _texts),
+        ("Common_Questions", "common_questions", _texts),
+        ("Study_Resources", "study_resources", _texts),
+        ("Practice_Tips", "practice_tips", _texts)
+    )
+
+@dataclass(slots=True)
+class RoleAnalysis(_Model):
+    core_responsibilities: tuple = ()
+    required_skills: tuple = ()
+    present_skills: tuple = ()
+    learning_path: tuple = ()
+    industry_insights: tuple = ()
+    career_growth: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Core_Responsibilities", "core_responsibilities", _texts),
+        ("Required_Skills", "required_skills", _texts),
+        ("Present_Skills", "present_skills", _texts),
+        ("Learning_Path", "learning_path", _texts),
+        ("Industry_Insights", "industry_insights", _texts),
+        ("Career_Growth", "career_growth", _texts)
+    )
+
+@dataclass(slots=True)
+class IndustryMetrics(_Model):
+    kpis: tuple = ()
+    certifications: tuple = ()
+    tools: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Key_Performance_Indicators", "kpis", _texts),
+        ("Certifications", "certifications", _texts),
+        ("Tools_And_Software", "tools", _texts)
+    )
+
+@dataclass(slots=True)
+class Analysis(_Model):
+    """A validated analysis: every section present, typed and coerced once.
+
+    Built from the response schema with ``from_dict`` (missing sections
+    get empty defaults and are listed in ``missing_sections``) and written
+    back out with ``to_dict``. ``to_json``/``to_bytes`` are compact forms
+    for caching and storage.
+    """
+    industry_context: IndustryContext = field(default_factory=IndustryContext)
+    jd_match: float = 0.0
+    match_analysis: MatchAnalysis = field(default_factory=MatchAnalysis)
+    keywords: KeywordsAnalysis = field(default_factory=KeywordsAnalysis)
+    profile_summary: str = ""
+    resume_enhancement: ResumeEnhancement = field(default_factory=ResumeEnhancement)
+    interview_prep: InterviewPrep = field(default_factory=InterviewPrep)
+    role_analysis: RoleAnalysis = field(default_factory=RoleAnalysis)
+    industry_metrics: IndustryMetrics = field(default_factory=IndustryMetrics)
+    missing_sections: tuple = ()
+    SCHEMA: ClassVar = (
+        ("Industry_Context", "industry_context", IndustryContext.from_dict),
+        ("JD_Match", "jd_match", _percent),
+        ("Match_Analysis", "match_analysis", MatchAnalysis.from_dict),
+        ("Keywords_Analysis", "keywords", KeywordsAnalysis.from_dict),
+        ("Profile_Summary", "profile_summary", _text),
+        ("Resume_Enhancement", "resume_enhancement", ResumeEnhancement.from_dict),
+        ("Interview_Prep", "interview_prep", InterviewPrep.from_dict),
+        ("Role_Analysis", "role_analysis", RoleAnalysis.from_dict),
+        ("Industry_Specific_Metrics", "industry_metrics", IndustryMetrics.from_dict)
+    )
+    DUMP: ClassVar = {"jd_match": _format_percent}
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, Analysis):
+            return data
+        analysis = super(Analysis, cls).from_dict(data)
+        data = data if isinstance(data, dict) else {}
+        analysis.missing_sections = tuple(key for key, _, _ in cls.SCHEMA if key not in data)
+        return analysis
+
+    def section(self, key):
+        """The typed value of a top-level schema section, e.g. ``section("JD_Match")``."""
+        return getattr(self, SECTION_ATTRIBUTES[key])
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def to_bytes(self):
+        return zlib.compress(self.to_json().encode("utf-8"), 6)
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls.from_json(zlib.decompress(data).decode("utf-8"))
+
+    def fingerprint(self):
+        """Stable content hash, e.g. to key memoized charts."""
+        return hashlib.sha256(self.to_json().encode("utf-8")).hexdigest()[:16]
+
+SECTION_ATTRIBUTES = {key: attribute for key, attribute, _ in Analysis.SCHEMA}
+_SECTION_LOADERS = {key: coerce for key, _, coerce in Analysis.SCHEMA}
+
+def load_section(key, value):
+    """Validate one raw top-level section on its own, as it arrives from a stream."""
+    return _SECTION_LOADERS[key](value)
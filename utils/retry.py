@@ -0,0 +1,58 @@
+import random
+import threading
+import time
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_MARKERS = ("429", "resource exhausted", "resourceexhausted", "toomanyrequests", "rate limit",
+                     "quota", "unavailable", "deadline exceeded", "deadlineexceeded",
+                     "internalservererror")
+
+def is_retryable_error(exc):
+    """Return True for rate-limit and transient server errors worth retrying."""
+    code = getattr(exc, "code", None)
+    if callable(code):
+        try:
+            code = code()
+        except Exception:
+            code = None
+    code = getattr(code, "value", code)
+    if isinstance(code, tuple):
+        code = code[0]
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    message = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=30.0):
+    """Full-jitter exponential backoff delay for the given zero-based attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+def call_with_backoff(fn, *args, max_retries=5, base_delay=1.0, max_delay=30.0, **kwargs):
+    """Call ``fn``, retrying retryable errors with jittered exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
+
+class RateLimiter:
+    """Spaces calls evenly so that at most ``requests_per_minute`` start per minute."""
+
+    def __init__(self, requests_per_minute=None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,100 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import tracing
+from utils.analysis_cache import make_cache_key
+from utils.gemini_client import GENERATION_CONFIG, generate_response
+from utils.prompt_templates import PROMPT_VERSION, create_section_prompt
+from utils.response_parser import REQUIRED_KEYS, fill_missing_sections, parse_response_sections
+
+# Independently generated and cached slices of the analysis schema. Phase 1
+# groups are submitted first so the core match lands before the extras;
+# groups with uses_resume=False depend only on the JD and are cached per JD.
+SECTION_GROUPS = [
+    {
+        "name": "core_match",
+        "phase": 1,
+        "uses_resume": True,
+        "sections": ["JD_Match", "Match_Analysis", "Keywords_Analysis", "Profile_Summary"]
+    },
+    {
+        "name": "role_fit",
+        "phase": 2,
+        "uses_resume": True,
+        "sections": ["Role_Analysis", "Resume_Enhancement"]
+    },
+    {
+        "name": "interview_prep",
+        "phase": 2,
+        "uses_resume": True,
+        "sections": ["Interview_Prep"]
+    },
+    {
+        "name": "industry",
+        "phase": 2,
+        "uses_resume": False,
+        "sections": ["Industry_Context", "Industry_Specific_Metrics"]
+    }
+]
+
+def plan_sections(sections=None):
+    """Return the groups needed to produce ``sections`` (default: all), phase 1 first."""
+    wanted = set(sections or REQUIRED_KEYS)
+    groups = [group for group in SECTION_GROUPS if wanted.intersection(group["sections"])]
+    return sorted(groups, key=lambda group: group["phase"])
+
+def section_cache_key(group, text, jd):
+    resume_text = text if group["uses_resume"] else ""
+    return make_cache_key(resume_text, jd, f"{PROMPT_VERSION}:{group['name']}", GENERATION_CONFIG)
+
+def _run_group(group, text, jd, call_model, cache):
+    cache_key = section_cache_key(group, text, jd)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    with tracing.span("prompt_build", group=group["name"]):
+        prompt = create_section_prompt(group["sections"], text if group["uses_resume"] else None, jd)
+    parsed = parse_response_sections(call_model(prompt))
+    result = {key: parsed[key] for key in group["sections"] if key in parsed}
+    if cache is not None and len(result) == len(group["sections"]):
+        cache.set(cache_key, result)
+    return result
+
+def run_section_plan(text, jd, call_model=None, cache=None, sections=None, max_workers=4, on_group=None):
+    """Generate the analysis as concurrent per-group calls and merge them into the full schema.
+
+    ``call_model(prompt)`` returns raw response text (default: the shared
+    Gemini client, which retries with backoff). ``on_group(group, result, error)`` is called from the calling
+    thread as each group finishes. A failed or truncated group only loses its
+    own sections, which fall back to defaults, and its error is returned in
+    ``errors``. Returns ``(analysis, errors)``.
+    """
+    if call_model is None:
+        call_model = generate_response
+
+    analysis = {}
+    errors = {}
+    groups = plan_sections(sections)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            # Each group runs in the caller's context so it records into the active trace
+            executor.submit(contextvars.copy_context().run, _run_group, group, text, jd, call_model, cache): group
+            for group in groups
+        }
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                result = future.result()
+                error = None
+            except Exception as e:
+                result = {}
+                error = e
+                errors[group["name"]] = str(e)
+            analysis.update(result)
+            if on_group:
+                on_group(group, result, error)
+
+    fill_missing_sections(analysis)
+    return {key: analysis[key] for key in REQUIRED_KEYS}, errors
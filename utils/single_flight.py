@@ -0,0 +1,117 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from utils import tracing
+
+# How often a waiter with a cancel event checks it
+CANCEL_POLL_SECONDS = 0.1
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+        self.cancelled = threading.Event()
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one execution.
+
+    The first caller for a key starts ``fn`` on its own thread; everyone who
+    asks for the same key while it is running waits on that one call and
+    receives the same result or the same exception. A waiter can stop
+    waiting through ``cancel_event`` or ``timeout`` without affecting the
+    others. Once every waiter has given up, the flight is dropped, so later
+    callers start afresh, and the event passed to ``fn(cancelled)`` is set so
+    it can stop early. Results are not kept once a flight lands; that is the
+    analysis cache's job.
+    """
+
+    def __init__(self, name="flight"):
+        self.name = name
+        self.executed = 0
+        self.deduplicated = 0
+        self.abandoned = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "deduplicated": self.deduplicated,
+                "abandoned": self.abandoned,
+                "in_flight": len(self._flights)
+            }
+
+    def do(self, key, fn, cancel_event=None, timeout=None):
+        """Return ``fn(cancelled)`` for ``key``, sharing any identical call already running."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+            flight.waiters += 1
+
+        if leader:
+            # The call runs in the leader's context so it records into the leader's trace
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run,
+                args=(self._run, key, flight, fn),
+                name=f"{self.name}-{key[:8]}",
+                daemon=True
+            ).start()
+        else:
+            tracing.count("coalesced_calls")
+        return self._wait(key, flight, cancel_event, timeout)
+
+    def _land(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _run(self, key, flight, fn):
+        try:
+            result = fn(flight.cancelled)
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+        else:
+            self._land(key, flight)
+            flight.future.set_result(result)
+
+    def _wait(self, key, flight, cancel_event, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                wait = None
+                if cancel_event is not None:
+                    if cancel_event.is_set():
+                        raise CancelledError(f"Stopped waiting for {self.name} {key[:8]}")
+                    wait = CANCEL_POLL_SECONDS
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timed out waiting for {self.name} {key[:8]}")
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    return flight.future.result(timeout=wait)
+                except FutureTimeoutError:
+                    if flight.future.done():
+                        raise
+                    continue
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                if flight.waiters == 0 and not flight.future.done():
+                    # Nobody is left to receive the result
+                    flight.cancelled.set()
+                    self.abandoned += 1
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
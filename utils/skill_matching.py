@@ -0,0 +1,38 @@
+import difflib
+
+from utils.candidate_index import normalize_skill
+
+# Minimum difflib similarity for two normalized skills to count as the same
+FUZZY_CUTOFF = 0.85
+
+def match_skills(required_skills, present_skills, cutoff=FUZZY_CUTOFF):
+    """Map each required skill to the present skill that covers it, or None.
+
+    Skills are compared after ``normalize_skill`` (case, bracketed
+    qualifiers, aliases), so "Python (advanced)" matches "python" with a set
+    lookup. Remaining required skills match a present skill containing all
+    of their words ("Python" in "Python programming"), and finally a close
+    spelling ("Postgre SQL" ~ "PostgreSQL").
+    """
+    present = {}
+    for skill in present_skills or []:
+        normalized = normalize_skill(skill)
+        if normalized:
+            present.setdefault(normalized, skill)
+
+    matches = {}
+    for skill in required_skills or []:
+        normalized = normalize_skill(skill)
+        match = present.get(normalized)
+        if match is None and normalized:
+            words = set(normalized.split())
+            for candidate, original in present.items():
+                candidate_words = set(candidate.split())
+                if words <= candidate_words or (len(candidate_words) > 1 and candidate_words <= words):
+                    match = original
+                    break
+        if match is None and normalized:
+            close = difflib.get_close_matches(normalized, present.keys(), n=1, cutoff=cutoff)
+            match = present[close[0]] if close else None
+        matches[skill] = match
+    return matches
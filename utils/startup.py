@@ -0,0 +1,61 @@
+import importlib
+import os
+import threading
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+# Modules the first upload and analysis need but the first page does not;
+# warm_up loads them in the background once the page is on screen. The model
+# SDK is left to the client, which imports it only when it is the real one.
+# pandas is not warmed up: Plotly looks it up in sys.modules and would find it
+# half-imported while charts are drawn
+DEFERRED_MODULES = ["PyPDF2", "docx"]
+
+_lock = threading.Lock()
+_initialized = False
+_warm_up_thread = None
+
+def initialize():
+    """Process-wide setup (environment from .env), done once however many reruns call it."""
+    global _initialized
+    if _initialized:
+        return
+    with _lock:
+        if not _initialized:
+            load_dotenv()
+            _initialized = True
+
+@lru_cache(maxsize=None)
+def read_asset(path):
+    """A static text asset, read from disk once per process; "" if it is missing."""
+    if not os.path.exists(path):
+        return ""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def _import_all(modules, then):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # A missing optional module fails again, with a real error, where it is used
+            pass
+    if then is not None:
+        try:
+            then()
+        except Exception:
+            pass
+
+def warm_up(modules=DEFERRED_MODULES, then=None):
+    """Import ``modules`` (then call ``then``) on a background thread, once per process.
+
+    Returns the thread, which callers can ``join`` to wait for the warm-up.
+    """
+    global _warm_up_thread
+    with _lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_import_all, args=(list(modules), then),
+                                               name="jobfitai-warm-up", daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
@@ -0,0 +1,74 @@
+import json
+import re
+
+TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+class IncrementalSectionParser:
+    """Incrementally parse a streamed JSON object one top-level section at a time.
+
+    Feed raw text chunks as they arrive; ``feed`` returns the ``(key, value)``
+    pairs whose values became complete in that chunk. Scanning is linear in
+    the total response size and tolerates prose or code fences before the
+    opening brace; nothing is tracked until the first ``{``.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections = {}
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+
+    def feed(self, chunk):
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if self.complete:
+                break
+            if char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif char in '{[':
+                if self._depth == 0 and char == '[':
+                    # Prose before the object, such as "[result]", is not the root
+                    continue
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif char in '}]':
+                if self._depth == 1:
+                    completed.extend(self._close_member(text[self._member_start:i]))
+                    self.complete = True
+                self._depth = max(0, self._depth - 1)
+            elif char == ',' and self._depth == 1:
+                completed.extend(self._close_member(text[self._member_start:i]))
+                self._member_start = i + 1
+        self._pos = len(text)
+        return completed
+
+    def _close_member(self, member):
+        if not member.strip():
+            return []
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            try:
+                parsed = json.loads("{" + TRAILING_COMMA.sub(r'\1', member) + "}")
+            except json.JSONDecodeError:
+                # Leave malformed sections to the full-response parser
+                return []
+        self.sections.update(parsed)
+        return list(parsed.items())
@@ -0,0 +1,187 @@
+import re
+from collections import Counter, namedtuple
+
+from utils import tracing
+from utils.prescorer import PreScorer
+from utils.prompt_templates import estimate_tokens
+
+# Roughly two dense pages of resume and one page of job description
+DEFAULT_RESUME_TOKEN_BUDGET = 3000
+DEFAULT_JD_TOKEN_BUDGET = 1500
+
+# Lines this close to a page's top or bottom, recurring on at least half the
+# pages, are running headers/footers
+PAGE_EDGE_LINES = 3
+
+SECTION_HEADINGS = frozenset("""
+summary|professional summary|profile|professional profile|objective|career objective|about me|
+experience|work experience|professional experience|employment|employment history|work history|career history|
+education|academic background|qualifications|skills|technical skills|core skills|key skills|core competencies|
+competencies|technologies|tools|projects|key projects|personal projects|certifications|certificates|licenses|
+awards|honors|achievements|accomplishments|publications|languages|interests|hobbies|volunteering|
+volunteer experience|leadership|activities|training|courses|references
+""".replace("\n", "").split("|"))
+
+# dropped_sections holds the headings of sections removed to fit the budget
+CompactionResult = namedtuple("CompactionResult", ["text", "tokens_before", "tokens_after", "dropped_sections"])
+
+# A hyphen at a line end may be part of the word ("stream-processing"), so the
+# lines are joined with it kept; only soft hyphens (U+00AD) mark a pure break
+_HYPHEN_BREAK = re.compile(r"([a-z])-\n([a-z])")
+_SOFT_HYPHEN = re.compile(r"\u00ad\n?")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0\f\v]+")
+_DIGITS = re.compile(r"\d+")
+_PAGE_NUMBER = re.compile(r"^(page\s*)?[-–(]?\s*#\s*[-–)]?(\s*(of|/)\s*#)?$")
+
+def normalize_whitespace(text):
+    """Rejoin words broken across lines at a hyphen, collapse spaces and runs of blank lines."""
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _SOFT_HYPHEN.sub("", text)
+    text = _HYPHEN_BREAK.sub(r"\1-\2", text)
+    lines = []
+    for line in text.split("\n"):
+        line = _INLINE_SPACE.sub(" ", line).strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+def _signature(line):
+    return _DIGITS.sub("#", line.lower())
+
+def _line_key(line):
+    """Lines mentioning a page match with digits ignored ("Page 2 of 5" ~ "Page 3 of 5")."""
+    lowered = line.lower()
+    return _signature(line) if "page" in lowered else lowered
+
+def _page_furniture(pages):
+    """Keys of lines repeated at the top or bottom of at least half the pages."""
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        content = [line for line in lines if line]
+        counts.update({_line_key(line) for line in content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:]})
+    threshold = max(2, len(pages) // 2)
+    return {key for key, count in counts.items() if count >= threshold}
+
+def dedupe_lines(pages):
+    """Flatten pages of lines, dropping page numbers, repeated headers/footers and duplicate lines.
+
+    The first copy of a running header is kept, since it usually carries the
+    candidate's name; later copies and exact duplicate lines are dropped.
+    """
+    furniture = _page_furniture(pages)
+    seen = set()
+    kept = []
+    for lines in pages:
+        for line in lines:
+            if not line:
+                if kept and kept[-1]:
+                    kept.append(line)
+                continue
+            if _PAGE_NUMBER.match(_signature(line)):
+                continue
+            key = _line_key(line)
+            if key not in furniture:
+                key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(line)
+        if kept and kept[-1]:
+            kept.append("")
+    return kept
+
+def compact_text(text):
+    """Whitespace, header/footer and duplicate-line cleanup, without dropping content.
+
+    Pages are expected to be separated by form feeds, as ``extract_document``
+    does for PDFs.
+    """
+    pages = [normalize_whitespace(page).split("\n") for page in (text or "").split("\f")]
+    return "\n".join(dedupe_lines(pages)).strip()
+
+def _is_heading(line):
+    name = re.sub(r"[^a-z& ]+", "", line.lower()).strip()
+    if name in SECTION_HEADINGS:
+        return True
+    letters = re.sub(r"[^A-Za-z]+", "", line)
+    return len(line) <= 40 and len(line.split()) <= 4 and len(letters) >= 3 and letters.isupper()
+
+def split_sections(text):
+    """Split resume text at section headings into ``(heading, text)`` pairs.
+
+    Whatever precedes the first heading (name, contact details, headline)
+    comes first with an empty heading.
+    """
+    sections = [("", [])]
+    for line in text.split("\n"):
+        if line and _is_heading(line):
+            sections.append((line, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, "\n".join(lines).strip()) for heading, lines in sections if "\n".join(lines).strip()]
+
+def _truncate_to_budget(text, token_budget):
+    kept = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line + "\n")
+        if used + cost > token_budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept).strip()
+
+def compact_resume(text, jd="", token_budget=DEFAULT_RESUME_TOKEN_BUDGET, scorer=None):
+    """Clean a resume and fit it into ``token_budget`` tokens.
+
+    When the cleaned text is still over budget, sections are kept in order of
+    relevance to the JD (by the offline keyword scorer) while they fit; the
+    first one that does not fit is cut at a line boundary to fill the rest of
+    the budget and the others are dropped. The opening contact/headline block
+    is always kept and the original section order is preserved.
+    """
+    tokens_before = estimate_tokens(text)
+    with tracing.span("compact", document="resume", tokens_before=tokens_before) as attributes:
+        compacted = compact_text(text)
+        dropped = []
+        if token_budget and estimate_tokens(compacted) > token_budget:
+            sections = split_sections(compacted)
+            scorer = scorer or PreScorer(jd or "")
+            relevance = [result["score"] for result in scorer.score_many([body for _, body in sections])]
+            bodies = {0: sections[0][1]}
+            remaining = token_budget - estimate_tokens(sections[0][1] + "\n\n")
+            for i in sorted(range(1, len(sections)), key=lambda i: (-relevance[i], i)):
+                cost = estimate_tokens(sections[i][1] + "\n\n")
+                if cost <= remaining:
+                    bodies[i] = sections[i][1]
+                    remaining -= cost
+                    continue
+                partial = _truncate_to_budget(sections[i][1], remaining) if remaining > 0 else ""
+                if partial and partial != sections[i][0]:
+                    bodies[i] = partial
+                    remaining = 0
+                else:
+                    dropped.append(sections[i][0])
+            compacted = "\n\n".join(bodies[i] for i in sorted(bodies))
+            if estimate_tokens(compacted) > token_budget:
+                compacted = _truncate_to_budget(compacted, token_budget)
+        attributes["tokens_after"] = estimate_tokens(compacted)
+        attributes["dropped_sections"] = len(dropped)
+    return CompactionResult(compacted, tokens_before, estimate_tokens(compacted), dropped)
+
+def compact_jd(jd, token_budget=DEFAULT_JD_TOKEN_BUDGET):
+    """Clean a job description and cut it at ``token_budget`` tokens."""
+    tokens_before = estimate_tokens(jd)
+    with tracing.span("compact", document="jd", tokens_before=tokens_before) as attributes:
+        compacted = compact_text(jd)
+        if token_budget and estimate_tokens(compacted) > token_budget:
+            compacted = _truncate_to_budget(compacted, token_budget)
+        attributes["tokens_after"] = estimate_tokens(compacted)
+    return CompactionResult(compacted, tokens_before, estimate_tokens(compacted), [])
+
+def compact_inputs(text, jd, resume_budget=DEFAULT_RESUME_TOKEN_BUDGET, jd_budget=DEFAULT_JD_TOKEN_BUDGET):
+    """Compact a resume and JD for prompting; returns ``(resume_result, jd_result)``."""
+    jd_result = compact_jd(jd, jd_budget)
+    return compact_resume(text, jd_result.text, resume_budget), jd_result
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Set to 1 to show raw model responses and the trace of each analysis in the UI
+DEBUG_ENV = "JOBFITAI_DEBUG"
+# Append every finished span to this JSON lines file
+TRACE_FILE_ENV = "JOBFITAI_TRACE_FILE"
+
+# Phases of one analysis, in pipeline order
+PHASES = ["extract", "prompt_build", "model_call", "parse", "chart_build", "render"]
+
+_active_trace = ContextVar("jobfitai_trace", default=None)
+
+def debug_enabled():
+    return os.getenv(DEBUG_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+class JsonlSink:
+    """Appends each finished span to a JSON lines file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+class PhaseMetrics:
+    """Aggregates spans and counters into Prometheus text exposition format.
+
+    Use it directly as a trace sink to collect metrics across many traces.
+    """
+
+    def __init__(self, prefix="jobfitai"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._counters = {}
+
+    def __call__(self, record):
+        with self._lock:
+            phase = self._phases.setdefault(record["span"], {"count": 0, "seconds": 0.0, "errors": 0, "values": {}})
+            phase["count"] += 1
+            phase["seconds"] += record["seconds"]
+            phase["errors"] += 1 if "error" in record else 0
+            for name, value in record.get("attributes", {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    phase["values"][name] = phase["values"].get(name, 0) + value
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def to_prometheus(self):
+        lines = [
+            f"# HELP {self.prefix}_phase_seconds Time spent in each analysis phase.",
+            f"# TYPE {self.prefix}_phase_seconds summary"
+        ]
+        with self._lock:
+            phases = sorted(self._phases.items())
+            counters = sorted(self._counters.items())
+            for phase, stats in phases:
+                lines.append(f'{self.prefix}_phase_seconds_sum{{phase="{phase}"}} {stats["seconds"]:.6f}')
+                lines.append(f'{self.prefix}_phase_seconds_count{{phase="{phase}"}} {stats["count"]}')
+            lines.append(f"# TYPE {self.prefix}_phase_errors_total counter")
+            for phase, stats in phases:
+                lines.append(f'{self.prefix}_phase_errors_total{{phase="{phase}"}} {stats["errors"]}')
+            for name in sorted({name for _, stats in phases for name in stats["values"]}):
+                lines.append(f"# TYPE {self.prefix}_{name}_total counter")
+                for phase, stats in phases:
+                    if name in stats["values"]:
+                        lines.append(f'{self.prefix}_{name}_total{{phase="{phase}"}} {stats["values"][name]}')
+            for name, value in counters:
+                lines.append(f"# TYPE {self.prefix}_{name}_total counter")
+                lines.append(f"{self.prefix}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+def default_sinks():
+    path = os.getenv(TRACE_FILE_ENV)
+    return [JsonlSink(path)] if path else []
+
+class Trace:
+    """Named spans and counters for one unit of work, such as one analysis.
+
+    Library code records into whichever trace is active via the module-level
+    ``span`` and ``count``, so nothing has to be threaded through call
+    signatures. Each finished span is also passed to every sink.
+    """
+
+    def __init__(self, name="analysis", sinks=None):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.spans = []
+        self.counters = {}
+        self.sinks = default_sinks() if sinks is None else list(sinks)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        token = _active_trace.set(self)
+        try:
+            yield self
+        finally:
+            _active_trace.reset(token)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time a block; attributes may be added to the yielded dict while it runs."""
+        started = time.perf_counter()
+        record = {
+            "trace_id": self.trace_id,
+            "trace": self.name,
+            "span": name,
+            "start": time.time(),
+            "attributes": attributes
+        }
+        try:
+            yield attributes
+        except BaseException as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 6)
+            self._finish(record)
+
+    def _finish(self, record):
+        with self._lock:
+            self.spans.append(record)
+        for sink in self.sinks:
+            sink(record)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        for sink in self.sinks:
+            if hasattr(sink, "count"):
+                sink.count(name, value)
+
+    def phase_totals(self):
+        """Total seconds per span name, in pipeline order first."""
+        totals = {}
+        for record in self.spans:
+            totals[record["span"]] = totals.get(record["span"], 0.0) + record["seconds"]
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def to_jsonl(self):
+        lines = [json.dumps(record, ensure_ascii=False, default=str) for record in self.spans]
+        if self.counters:
+            lines.append(json.dumps({"trace_id": self.trace_id, "trace": self.name, "counters": self.counters}))
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self, prefix="jobfitai"):
+        metrics = PhaseMetrics(prefix)
+        for record in self.spans:
+            metrics(record)
+        for name, value in self.counters.items():
+            metrics.count(name, value)
+        return metrics.to_prometheus()
+
+@contextmanager
+def span(name, **attributes):
+    """Record a span in the active trace; a no-op outside of one."""
+    trace = _active_trace.get()
+    if trace is None:
+        yield attributes
+        return
+    with trace.span(name, **attributes) as recorded:
+        yield recorded
+
+def count(name, value=1):
+    trace = _active_trace.get()
+    if trace is not None:
+        trace.count(name, value)
@@ -1,12 +1,26 @@
-import plotly.graph_objects as go
-import plotly.express as px
+import importlib.util
+import math
+import threading
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+from utils.result_model import Analysis
+from utils.skill_matching import match_skills
+
+# Plotly is imported by the chart builders on first use, so pages and CLIs
+# that draw no chart never load it
+
+# Analyses whose figures are kept in memory; tab switches and reruns reuse them
+FIGURE_CACHE_SIZE = 64
+FIGURE_NAMES = ["match_gauge", "skills_pie", "improvement_radar"]
 
 def create_match_gauge(match_percentage):
     try:
-        value = float(match_percentage.strip('%'))
+        value = float(str(match_percentage).strip().strip('%'))
     except:
         value = 0
         
+    import plotly.graph_objects as go
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
         value=value,
@@ -35,18 +49,21 @@ def create_match_gauge(match_percentage):
     )
     return fig
 
-def create_skills_pie(required_skills, present_skills):
+def create_skills_pie(required_skills, present_skills, matches=None):
     if not required_skills or not present_skills:
         return None
     
     # Create data for pie chart
-    present_count = len([skill for skill in required_skills if skill in present_skills])
+    if matches is None:
+        matches = match_skills(required_skills, present_skills)
+    present_count = sum(1 for skill in required_skills if matches.get(skill))
     missing_count = len(required_skills) - present_count
     
     labels = ['Present Skills', 'Missing Skills']
     values = [present_count, missing_count]
     colors = ['teal', '#FFE5E5']
     
+    import plotly.graph_objects as go
     fig = go.Figure(data=[go.Pie(
         labels=labels,
         values=values,
@@ -76,20 +93,6 @@ def create_skills_pie(required_skills, present_skills):
         )
     )
     
-    # Add percentage annotations
-    total = sum(values)
-    percentages = [f"{(val/total)*100:.1f}%" for val in values]
-    
-    annotations = []
-    for i, percent in enumerate(percentages):
-        annotations.append(dict(
-            text=percent,
-            x=0.5,
-            y=0.5,
-            font=dict(size=20, color='white' if i == 0 else 'black'),
-            showarrow=False
-        ))
-    
     fig.update_traces(textposition='inside', textinfo='label+percent')
     return fig
 
@@ -106,6 +109,7 @@ def create_improvement_radar(improvement_areas):
         score = 100 - (i * (100 / (len(improvement_areas) or 1)))
         scores.append(score)
     
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     fig.add_trace(go.Scatterpolar(
@@ -147,4 +151,152 @@ def create_improvement_radar(improvement_areas):
             'font': {'color': '#FF4B4B', 'size': 20}
         }
     )
-    return fig
\ No newline at end of file
+    return fig
+
+class InsightFigures:
+    """Every chart of one analysis, built once; JSON and images are produced once on demand.
+
+    Figures are shared between reruns and sessions, so treat them as
+    read-only. ``skill_matches`` maps each required skill to the present
+    skill that covers it (or None). ``analysis`` is an ``Analysis`` or a
+    dict in the response schema.
+    """
+
+    def __init__(self, analysis):
+        analysis = Analysis.from_dict(analysis)
+        self.match_value = analysis.jd_match
+        self.required_skills = list(analysis.role_analysis.required_skills)
+        self.present_skills = list(analysis.role_analysis.present_skills)
+        self.improvement_areas = list(analysis.match_analysis.improvement_areas)
+        self.skill_matches = match_skills(self.required_skills, self.present_skills)
+        self.figures = {
+            "match_gauge": create_match_gauge(analysis.jd_match),
+            "skills_pie": create_skills_pie(self.required_skills, self.present_skills, self.skill_matches),
+            "improvement_radar": create_improvement_radar(self.improvement_areas)
+        }
+        self._lock = threading.Lock()
+        self._serialized = {}
+
+    def get(self, name):
+        return self.figures.get(name)
+
+    def _serialize(self, key, build):
+        with self._lock:
+            if key not in self._serialized:
+                self._serialized[key] = build()
+            return self._serialized[key]
+
+    def to_json(self, name):
+        """Plotly JSON of one figure (None if the analysis has no data for it)."""
+        figure = self.figures.get(name)
+        if figure is None:
+            return None
+        return self._serialize(("json", name), figure.to_json)
+
+    def to_image(self, name, format="svg"):
+        """Static image bytes for reports, with no Plotly JS.
+
+        SVG is drawn directly and needs nothing extra; other formats (png,
+        jpeg, pdf) go through Plotly's image export and need ``kaleido``.
+        """
+        if self.figures.get(name) is None:
+            return None
+        if format == "svg":
+            return self._serialize(("svg", name), lambda: render_svg(name, self).encode("utf-8"))
+        if importlib.util.find_spec("kaleido") is None:
+            raise RuntimeError(f"Exporting {format} charts needs the optional kaleido package: pip install kaleido")
+        return self._serialize((format, name), lambda: self.figures[name].to_image(format=format))
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+def get_insight_figures(analysis):
+    """Memoized ``InsightFigures`` for an analysis, keyed by its content."""
+    analysis = Analysis.from_dict(analysis)
+    key = analysis.fingerprint()
+    with _figure_cache_lock:
+        figures = _figure_cache.get(key)
+        if figures is not None:
+            _figure_cache.move_to_end(key)
+            return figures
+    figures = InsightFigures(analysis)
+    with _figure_cache_lock:
+        _figure_cache[key] = figures
+        while len(_figure_cache) > FIGURE_CACHE_SIZE:
+            _figure_cache.popitem(last=False)
+    return figures
+
+def _svg(width, height, body):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif">{body}</svg>')
+
+def _arc_path(cx, cy, radius, start_degrees, end_degrees):
+    start = math.radians(start_degrees)
+    end = math.radians(end_degrees)
+    x1, y1 = cx + radius * math.cos(start), cy - radius * math.sin(start)
+    x2, y2 = cx + radius * math.cos(end), cy - radius * math.sin(end)
+    large_arc = 1 if abs(end_degrees - start_degrees) > 180 else 0
+    sweep = 1 if end_degrees < start_degrees else 0
+    return f"M {x1:.1f} {y1:.1f} A {radius} {radius} 0 {large_arc} {sweep} {x2:.1f} {y2:.1f}"
+
+def svg_match_gauge(value):
+    cx, cy, radius = 150, 150, 110
+    bands = [(0, 30, "#FFE5E5"), (30, 70, "#E6E6FA"), (70, 100, "#E6F3EF")]
+    body = "".join(
+        f'<path d="{_arc_path(cx, cy, radius, 180 - low * 1.8, 180 - high * 1.8)}" '
+        f'stroke="{color}" stroke-width="40" fill="none"/>'
+        for low, high, color in bands
+    )
+    if value > 0:
+        body += (f'<path d="{_arc_path(cx, cy, radius, 180, 180 - value * 1.8)}" '
+                 f'stroke="teal" stroke-width="16" fill="none"/>')
+    body += f'<text x="{cx}" y="30" text-anchor="middle" fill="teal" font-size="20">JD Match</text>'
+    body += f'<text x="{cx}" y="{cy - 10}" text-anchor="middle" fill="teal" font-size="36">{value:.0f}</text>'
+    return _svg(300, 170, body)
+
+def svg_skills_donut(present_count, missing_count):
+    cx, cy, radius = 150, 140, 80
+    total = present_count + missing_count
+    body = '<text x="150" y="28" text-anchor="middle" fill="teal" font-size="20">Skills Match Analysis</text>'
+    share = present_count / total if total else 0.0
+    if share >= 1.0 or share <= 0.0:
+        color = "teal" if share >= 1.0 else "#FFE5E5"
+        body += f'<circle cx="{cx}" cy="{cy}" r="{radius}" stroke="{color}" stroke-width="50" fill="none"/>'
+    else:
+        split = 90 - share * 360
+        body += f'<path d="{_arc_path(cx, cy, radius, 90, split)}" stroke="teal" stroke-width="50" fill="none"/>'
+        body += f'<path d="{_arc_path(cx, cy, radius, split, -270)}" stroke="#FFE5E5" stroke-width="50" fill="none"/>'
+    body += f'<text x="{cx}" y="{cy + 7}" text-anchor="middle" font-size="20">{share:.0%}</text>'
+    body += (f'<text x="150" y="265" text-anchor="middle" font-size="12">'
+             f'Present {present_count} · Missing {missing_count}</text>')
+    return _svg(300, 280, body)
+
+def svg_improvement_radar(areas):
+    cx, cy, radius = 200, 200, 120
+    count = len(areas)
+    points = []
+    labels = ""
+    for i, area in enumerate(areas):
+        angle = math.pi / 2 - 2 * math.pi * i / count
+        score = 100 - i * (100 / count)
+        points.append(f"{cx + radius * score / 100 * math.cos(angle):.1f},{cy - radius * score / 100 * math.sin(angle):.1f}")
+        lx, ly = cx + (radius + 14) * math.cos(angle), cy - (radius + 14) * math.sin(angle)
+        anchor = "middle" if abs(math.cos(angle)) < 0.3 else ("start" if math.cos(angle) > 0 else "end")
+        label = escape(area if len(area) <= 30 else area[:29] + "…")
+        labels += f'<text x="{lx:.1f}" y="{ly:.1f}" text-anchor="{anchor}" font-size="10">{label}</text>'
+    body = '<text x="200" y="24" text-anchor="middle" fill="#FF4B4B" font-size="20">Areas for Improvement</text>'
+    body += f'<circle cx="{cx}" cy="{cy}" r="{radius}" stroke="rgba(255, 75, 75, 0.2)" fill="none"/>'
+    body += (f'<polygon points="{" ".join(points)}" fill="rgba(255, 75, 75, 0.3)" '
+             f'stroke="#FF4B4B" stroke-width="2"/>')
+    return _svg(400, 400, body + labels)
+
+def render_svg(name, figures):
+    """Standalone SVG of one of ``FIGURE_NAMES`` for an ``InsightFigures``."""
+    if name == "match_gauge":
+        return svg_match_gauge(figures.match_value)
+    if name == "skills_pie":
+        present_count = sum(1 for skill in figures.required_skills if figures.skill_matches.get(skill))
+        return svg_skills_donut(present_count, len(figures.required_skills) - present_count)
+    if name == "improvement_radar":
+        return svg_improvement_radar(figures.improvement_areas)
+    raise ValueError(f"Unknown chart: {name}")